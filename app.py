@@ -1,9 +1,13 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from src.utils import initialize_session_state, load_custom_css
+from src.utils import initialize_session_state, load_custom_css, load_models_into_session, load_latest_artifacts
+from src.artifact_store import ArtifactStore
 from src.data_preprocessor import DataPreprocessor
 from src.model_trainer import ModelTrainer
+from src.hyperparameter_search import tune_hyperparameters
+from src.distillation import DISTILLED_MODEL_NAME
+from src.dataset_schema import read_heart_csv
 import os
 
 # Page configuration
@@ -17,6 +21,9 @@ st.set_page_config(
 # Initialize session state
 initialize_session_state()
 
+# Serve the latest trained version straight away instead of retraining
+load_models_into_session()
+
 # Main app
 def main():
     st.title("❤️ Heart Disease Risk Prediction & Health Support")
@@ -62,8 +69,8 @@ def main():
     st.subheader("🎯 Application Features")
     
     features = [
-        "**Multi-Model ML Pipeline**: CNN, LSTM, CNN-LSTM, and Deep Neural Networks",
-        "**Model Interpretability**: LIME-powered feature importance analysis",
+        "**Multi-Model ML Pipeline**: CNN, LSTM, CNN-LSTM, Deep Neural Networks and classical baselines",
+        "**Model Interpretability**: Integrated gradients and LIME feature importance analysis",
         "**Comprehensive Health Tools**: Risk prediction, symptom checking, and health forecasting",
         "**Personalized Recommendations**: AI-driven lifestyle and health suggestions",
         "**Educational Resources**: Curated content for heart health awareness",
@@ -80,6 +87,16 @@ def main():
     # Model training section
     st.subheader("🤖 Model Training Status")
     
+    parallel_training = st.checkbox(
+        "Train models in parallel", value=(os.cpu_count() or 1) > 4,
+        help="Train each architecture in its own process; fastest on multi-core machines")
+    distill_ensemble = st.checkbox(
+        "Distill the ensemble into a fast student model", value=True,
+        help="Adds an 'Ensemble-Distilled' model with near-ensemble accuracy at single-model latency")
+    tune_first = st.checkbox(
+        "Tune hyperparameters before training", value=False,
+        help="Run a successive-halving search per architecture and train with the winning settings")
+    
     if st.button("Initialize/Train Models", key="train_models"):
         with st.spinner("Training models... This may take a few minutes."):
             try:
@@ -92,15 +109,35 @@ def main():
                 # Initialize model trainer
                 trainer = ModelTrainer()
                 
+                # Search hyperparameters on a validation split of the training data,
+                # taken before SMOTE so no synthetic row leaks validation patients
+                hyperparameters = None
+                if tune_first:
+                    X_tune, _, y_tune, _ = preprocessor.load_original_split()
+                    hyperparameters, _ = tune_hyperparameters(X_tune, y_tune)
+                
                 # Train models
-                models, results = trainer.train_all_models(X_train, y_train, X_test, y_test)
+                models, results = trainer.train_all_models(
+                    X_train, y_train, X_test, y_test, parallel=parallel_training,
+                    hyperparameters=hyperparameters)
+                
+                # Compress the ensemble into one model that serves at single-model cost
+                if distill_ensemble:
+                    _, results[DISTILLED_MODEL_NAME] = trainer.distill_ensemble(X_train, X_test, y_test)
+                
+                # Publish a new artifact version for future processes
+                model_version = ArtifactStore().save_version(
+                    models, preprocessor, results, run_log=trainer.run_log,
+                    extra={'hyperparameters': hyperparameters} if hyperparameters else None)
+                load_latest_artifacts.clear()
                 
                 # Store in session state
                 st.session_state.models = models
                 st.session_state.model_results = results
                 st.session_state.preprocessor = preprocessor
+                st.session_state.model_version = model_version
                 
-                st.success("✅ All models trained successfully!")
+                st.success(f"✅ All models trained successfully! Saved as version {model_version}")
                 
                 # Display results
                 st.subheader("Model Performance")
@@ -115,6 +152,53 @@ def main():
                 st.error(f"❌ Error during model training: {str(e)}")
                 st.error("Please ensure you have the required data files and dependencies installed.")
     
+    # Less noisy metrics than the single train/test split
+    with st.expander("Cross-validate models"):
+        n_splits = st.slider("Number of folds", min_value=3, max_value=10, value=5, key="cv_folds")
+        
+        if st.button("Run Cross-Validation", key="cross_validate"):
+            with st.spinner("Cross-validating models..."):
+                try:
+                    folds = DataPreprocessor().build_cv_folds(n_splits=n_splits)
+                    cv_means, cv_stds = ModelTrainer().cross_validate_models(folds)
+                    
+                    cv_df = pd.DataFrame(cv_means).T.round(3).astype(str) + " ± " + pd.DataFrame(cv_stds).T.round(3).astype(str)
+                    st.dataframe(cv_df, use_container_width=True)
+                    
+                except Exception as e:
+                    st.error(f"❌ Error during cross-validation: {str(e)}")
+    
+    # Warm-start the published models on newly confirmed diagnoses
+    with st.expander("Fine-tune on new labeled records"):
+        new_records = st.file_uploader(
+            "CSV with the dataset columns, including target", type="csv", key="fine_tune_upload")
+        
+        if new_records is not None and st.button("Fine-tune Models", key="fine_tune_models"):
+            with st.spinner("Fine-tuning models on the new records..."):
+                try:
+                    trainer = ModelTrainer()
+                    models, results, model_version = trainer.fine_tune_models(read_heart_csv(new_records))
+                    
+                    if model_version:
+                        load_latest_artifacts.clear()
+                        st.session_state.models = models
+                        st.session_state.model_results = results
+                        st.session_state.model_version = model_version
+                        st.success(f"✅ Fine-tuned models saved as version {model_version}")
+                    else:
+                        st.warning("⚠️ Validation AUC dropped for every model, so no new version was published.")
+                    
+                except Exception as e:
+                    st.error(f"❌ Error during fine-tuning: {str(e)}")
+    
+    # Training cost of every published version, to catch regressions
+    with st.expander("Training cost history"):
+        training_costs = ArtifactStore().get_training_costs()
+        if training_costs.empty:
+            st.info("No run logs yet. Train the models to record one.")
+        else:
+            st.dataframe(training_costs, use_container_width=True)
+    
     # Display current model status
     if hasattr(st.session_state, 'models') and st.session_state.models:
         st.success("🎉 Models are ready for prediction!")
@@ -0,0 +1,36 @@
+"""Per-call inference latency of model.predict versus the compiled small-batch path.
+
+Run from the repository root:
+
+    python -m benchmarks.inference_latency
+"""
+import pandas as pd
+from src.model_trainer import ModelTrainer
+from src.inference_backend import benchmark_inference_latency
+
+N_FEATURES = 13
+
+
+def main():
+    trainer = ModelTrainer()
+    builders = {
+        'CNN': trainer.create_cnn_model,
+        'LSTM': trainer.create_lstm_model,
+        'CNN-LSTM': trainer.create_cnn_lstm_model,
+        'DNN': trainer.create_dnn_model
+    }
+
+    # Latency does not depend on the learned weights, so untrained models suffice
+    models = {
+        model_name: trainer.compile_model(builder((N_FEATURES,)))
+        for model_name, builder in builders.items()
+    }
+
+    report = benchmark_inference_latency(models, N_FEATURES)
+
+    with pd.option_context('display.float_format', '{:.3f}'.format, 'display.width', 120):
+        print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Accuracy, latency and size of each trained model next to its TFLite conversion.
+
+Run from the repository root:
+
+    python -m benchmarks.tflite_report [none|dynamic|int8]
+"""
+import sys
+import pandas as pd
+from src.data_preprocessor import DataPreprocessor
+from src.model_trainer import ModelTrainer
+
+
+def main():
+    quantization = sys.argv[1] if len(sys.argv) > 1 else 'dynamic'
+    quantization = None if quantization == 'none' else quantization
+
+    preprocessor = DataPreprocessor()
+    X_train, X_test, y_train, y_test = preprocessor.load_and_preprocess_data()
+
+    trainer = ModelTrainer()
+    trainer.train_all_models(X_train, y_train, X_test, y_test)
+
+    results = trainer.evaluate_tflite_models(
+        X_test, y_test, quantization=quantization, calibration_data=X_train
+    )
+
+    with pd.option_context('display.float_format', '{:.3f}'.format, 'display.width', 200,
+                           'display.max_columns', None):
+        print(pd.DataFrame(results).T)
+
+
+if __name__ == "__main__":
+    main()
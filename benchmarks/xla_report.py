@@ -0,0 +1,29 @@
+"""Training throughput and predict latency of each architecture with and without XLA.
+
+Run from the repository root:
+
+    python -m benchmarks.xla_report
+"""
+import pandas as pd
+from src.data_preprocessor import DataPreprocessor
+from src.model_trainer import ModelTrainer
+
+
+def main():
+    preprocessor = DataPreprocessor()
+    X_train, X_test, y_train, y_test = preprocessor.load_and_preprocess_data()
+
+    report = ModelTrainer().benchmark_jit_compile(X_train, y_train)
+
+    # One row per architecture, so the speedups can be read off directly
+    summary = report.pivot(index='Model', columns='XLA')
+    summary.columns = [f"{metric} ({'XLA' if xla else 'default'})" for metric, xla in summary.columns]
+    summary['Train speedup'] = summary['Train steps/sec (XLA)'] / summary['Train steps/sec (default)']
+    summary['Predict speedup'] = summary['Predict latency (ms) (default)'] / summary['Predict latency (ms) (XLA)']
+
+    with pd.option_context('display.float_format', '{:.3f}'.format, 'display.width', 200):
+        print(summary.to_string())
+
+
+if __name__ == "__main__":
+    main()
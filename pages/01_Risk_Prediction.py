@@ -7,7 +7,7 @@ from src.predictor import HeartDiseasePredictor
 from src.report_generator import ReportGenerator
 from src.utils import (
     create_risk_gauge, create_feature_importance_plot, create_model_comparison_plot,
-    format_input_data, validate_input_data, add_prediction_to_history
+    format_input_data, validate_input_data, add_prediction_to_history, load_models_into_session
 )
 
 st.set_page_config(page_title="Risk Prediction", page_icon="🔍", layout="wide")
@@ -16,6 +16,9 @@ st.title("🔍 Heart Disease Risk Prediction")
 st.markdown(
     "Get an accurate assessment of your heart disease risk using advanced AI models.")
 
+# Load the latest trained version if this session has no models yet
+load_models_into_session()
+
 # Check if models are loaded
 if not hasattr(st.session_state, 'models') or st.session_state.models is None:
     st.error(
@@ -26,7 +29,8 @@ if not hasattr(st.session_state, 'models') or st.session_state.models is None:
 
 # Initialize predictor
 predictor = HeartDiseasePredictor(
-    st.session_state.models, st.session_state.preprocessor)
+    st.session_state.models, st.session_state.preprocessor,
+    model_version=st.session_state.get('model_version'))
 report_generator = ReportGenerator()
 
 st.markdown("---")
@@ -86,7 +90,13 @@ with st.form("risk_prediction_form"):
                                   help="Select which model to use for prediction")
 
     show_explanation = st.checkbox("Show Feature Importance Analysis", value=True,
-                                   help="Generate LIME explanation for the prediction")
+                                   help="Explain which features drove the prediction")
+    explanation_method = st.selectbox("Explanation Method", options=["gradient", "shap", "lime"],
+                                      format_func=lambda x: {
+                                          "gradient": "Integrated Gradients (fast)",
+                                          "shap": "Kernel SHAP (additive, supports Ensemble)",
+                                          "lime": "LIME (sampling-based)"}[x],
+                                      help="Integrated gradients needs a single gradient pass; SHAP and LIME query the model in large batches")
     show_comparison = st.checkbox("Compare All Models", value=False,
                                   help="Show predictions from all available models")
 
@@ -156,8 +166,13 @@ if submitted:
                     st.subheader("🔍 Feature Importance Analysis")
 
                     with st.spinner("Generating explanation..."):
+                        # Only SHAP can explain the ensemble itself; other methods explain the DNN
+                        explained_model = selected_model
+                        if selected_model == "Ensemble" and explanation_method != "shap":
+                            explained_model = "DNN"
+
                         explanation = predictor.explain_prediction(
-                            input_data, selected_model if selected_model != "Ensemble" else "DNN")
+                            input_data, explained_model, method=explanation_method)
 
                         if explanation:
                             importance_df = predictor.get_feature_importance(
@@ -188,7 +203,9 @@ if submitted:
                     st.markdown("---")
                     st.subheader("🤖 Model Comparison")
 
-                    comparison_df = predictor.get_model_comparison(input_data)
+                    # Ensemble results already hold every model's prediction
+                    comparison_df = predictor.get_model_comparison(
+                        input_data, prediction_result.get('individual_predictions'))
 
                     if comparison_df is not None:
                         col1, col2 = st.columns(2)
@@ -285,7 +302,9 @@ with st.sidebar:
     - **LSTM**: Long Short-Term Memory
     - **CNN-LSTM**: Hybrid model
     - **DNN**: Deep Neural Network
-    - **Ensemble**: Average of all models
+    - **HistGradientBoosting / LogisticRegression / RandomForest**: Fast classical baselines
+    - **Ensemble**: Average of the four neural networks (CNN, LSTM, CNN-LSTM, DNN)
+    - **Ensemble-Distilled**: Small network trained to match the Ensemble at single-model speed
     """)
 
     if hasattr(st.session_state, 'prediction_history') and st.session_state.prediction_history:
@@ -8,6 +8,9 @@ import tensorflow as tf
 from tensorflow import keras
 from sklearn.preprocessing import MinMaxScaler
 import random
+import time
+from src.inference_backend import predict_fast, CompiledPredictor, median_latency_ms
+from src.utils import load_models_into_session
 
 st.set_page_config(page_title="Event Forecasting", page_icon="🔮", layout="wide")
 
@@ -16,6 +19,9 @@ st.markdown("Use time-aware deep learning models to forecast your heart health r
 
 st.markdown("---")
 
+# Load the latest trained version if this session has no models yet
+load_models_into_session()
+
 # Check if models are loaded
 if not hasattr(st.session_state, 'models') or st.session_state.models is None:
     st.error("⚠️ Models not loaded! Please go to the main page and train the models first.")
@@ -31,9 +37,11 @@ if 'forecast_results' not in st.session_state:
     st.session_state.forecast_results = {}
 
 class HealthForecaster:
-    def __init__(self):
+    def __init__(self, jit_compile=False):
         self.scaler = MinMaxScaler()
         self.sequence_length = 30  # Use 30 days of data for prediction
+        self.jit_compile = jit_compile  # XLA-compile the train and predict steps
+        self.training_batch = None  # (X, y) sequences of the last forecast, reused for benchmarking
         
     def create_lstm_forecasting_model(self, input_shape):
         """Create LSTM model specifically for time series forecasting"""
@@ -52,7 +60,8 @@ class HealthForecaster:
         model.compile(
             optimizer='adam',
             loss='mse',
-            metrics=['mae']
+            metrics=['mae'],
+            jit_compile=True if self.jit_compile else 'auto'
         )
         
         return model
@@ -171,6 +180,7 @@ class HealthForecaster:
         
         if len(X) == 0:
             return None, None
+        self.training_batch = (X, y)
         
         # Create and train forecasting model
         model = self.create_lstm_forecasting_model((self.sequence_length, len(features)))
@@ -191,7 +201,7 @@ class HealthForecaster:
         for i in range(forecast_days):
             # Predict next risk score
             sequence_input = current_sequence.reshape(1, self.sequence_length, len(features))
-            predicted_risk = model.predict(sequence_input, verbose=0)[0][0]
+            predicted_risk = predict_fast(model, sequence_input)[0][0]
             forecasted_risks.append(predicted_risk)
             
             # Simulate next day's metrics (simplified approach)
@@ -230,6 +240,31 @@ class HealthForecaster:
         forecast_df = pd.DataFrame(forecasted_metrics)
         return forecast_df, model
 
+    def benchmark_jit_compile(self, X, y, epochs=3, batch_size=8, n_calls=20):
+        """Train steps/sec and single-sequence predict latency with and without XLA on the same batch"""
+        steps_per_epoch = int(np.ceil(len(X) / batch_size))
+        rows = []
+
+        for jit_compile in (False, True):
+            model = HealthForecaster(jit_compile=jit_compile).create_lstm_forecasting_model(X.shape[1:])
+
+            # The first epoch pays for tracing and XLA compilation, so it is not timed
+            model.fit(X, y, epochs=1, batch_size=batch_size, verbose=0)
+            start = time.perf_counter()
+            model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=0)
+            elapsed = time.perf_counter() - start
+
+            predictor = CompiledPredictor(model, jit_compile=jit_compile)
+            predictor.warmup()
+
+            rows.append({
+                'XLA': jit_compile,
+                'Train steps/sec': epochs * steps_per_epoch / elapsed,
+                'Predict latency (ms)': median_latency_ms(predictor.predict, X[-1:].astype(np.float32), n_calls)
+            })
+
+        return pd.DataFrame(rows).set_index('XLA')
+
 # Input section
 st.subheader("📊 Current Health Profile")
 
@@ -268,6 +303,10 @@ with col1:
 with col2:
     confidence_intervals = st.checkbox("Show Confidence Intervals", value=True)
     detailed_breakdown = st.checkbox("Show Detailed Metric Forecasts", value=True)
+    xla_forecaster = st.checkbox("XLA-compile the forecaster", value=False,
+                                 help="Compile training and prediction with XLA; see benchmarks/xla_report.py")
+    compare_xla = st.checkbox("Time the forecaster with and without XLA", value=True,
+                              help="Trains both variants on the forecast's own sequences and compares their speed")
 
 # Intervention planning (if enabled)
 if include_interventions:
@@ -309,7 +348,7 @@ if st.button("🚀 Generate Forecast", type="primary"):
         }
         
         # Initialize forecaster
-        forecaster = HealthForecaster()
+        forecaster = HealthForecaster(jit_compile=xla_forecaster)
         
         # Generate historical data
         historical_data = forecaster.generate_historical_data(base_metrics, days=90)
@@ -329,6 +368,27 @@ if st.button("🚀 Generate Forecast", type="primary"):
             # Display results
             st.markdown("---")
             st.subheader("📈 Forecast Results")
+
+            if compare_xla:
+                with st.spinner("Timing the forecaster with and without XLA..."):
+                    timings = forecaster.benchmark_jit_compile(*forecaster.training_batch)
+                without_xla, with_xla = timings.loc[False], timings.loc[True]
+
+                st.markdown("#### ⚡ Forecaster Speed on This Batch")
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.markdown("**Without XLA**")
+                    st.metric("Train Steps/sec", f"{without_xla['Train steps/sec']:.1f}")
+                    st.metric("Predict Latency", f"{without_xla['Predict latency (ms)']:.2f} ms")
+
+                with col2:
+                    st.markdown("**With XLA**")
+                    st.metric("Train Steps/sec", f"{with_xla['Train steps/sec']:.1f}",
+                              f"{with_xla['Train steps/sec'] / without_xla['Train steps/sec']:.2f}x")
+                    st.metric("Predict Latency", f"{with_xla['Predict latency (ms)']:.2f} ms",
+                              f"{with_xla['Predict latency (ms)'] - without_xla['Predict latency (ms)']:+.2f} ms",
+                              delta_color="inverse")
             
             # Key forecast metrics
             current_risk = historical_data['risk_score'].iloc[-1]
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import pandas as pd
+from src.model_registry import (
+    LazyModels, get_model_spec, get_serializer, load_model_file, resolve_serializer, serializer_for_model
+)
+
+# Bump when the manifest layout changes
+MANIFEST_FORMAT_VERSION = 2
+
+DEFAULT_ARTIFACT_DIR = Path(__file__).resolve().parent.parent / 'artifacts'
+MANIFEST_FILENAME = 'manifest.json'
+RUN_LOG_FILENAME = 'run_log.json'
+
+
+def compute_file_hash(filepath):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _version_timestamp(version):
+    """Creation time encoded in a version id, to microseconds (whole seconds for older ids)"""
+    stamp = version.split('-')[0]
+    try:
+        created_at = datetime.strptime(stamp, '%Y%m%dT%H%M%S%f' if len(stamp) > 15 else '%Y%m%dT%H%M%S')
+    except ValueError:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    return created_at.replace(tzinfo=timezone.utc)
+
+
+def _model_slug(model_name):
+    return model_name.lower().replace('-', '_')
+
+
+class ArtifactStore:
+    """Versioned directory of trained models, preprocessor state and a manifest per training run
+
+    Each version lives in its own directory and is written under a temporary
+    name first, so a crash mid-save never leaves a half-written version behind.
+    """
+
+    def __init__(self, root_dir=DEFAULT_ARTIFACT_DIR):
+        self.root_dir = Path(root_dir)
+
+    def list_versions(self):
+        """Return version ids with a manifest, oldest first"""
+        if not self.root_dir.exists():
+            return []
+        return sorted(
+            (path.name for path in self.root_dir.iterdir()
+             if path.is_dir() and not path.name.startswith('.') and (path / MANIFEST_FILENAME).exists()),
+            key=lambda version: (_version_timestamp(version), version)
+        )
+
+    def version_dir(self, version):
+        return self.root_dir / version
+
+    def load_manifest(self, version):
+        with open(self.version_dir(version) / MANIFEST_FILENAME) as f:
+            return json.load(f)
+
+    def save_version(self, models, preprocessor, results, extra=None, run_log=None):
+        """Write a new artifact version and return its id"""
+        created_at = datetime.now(timezone.utc)
+        versions = self.list_versions()
+        if versions and created_at <= _version_timestamp(versions[-1]):
+            # Ids must sort in save order even within one clock tick or after the clock steps back
+            created_at = _version_timestamp(versions[-1]) + timedelta(microseconds=1)
+
+        dataset_hash = getattr(preprocessor, 'dataset_hash', None)
+        version = f"{created_at.strftime('%Y%m%dT%H%M%S%f')}-{(dataset_hash or 'nodata')[:8]}"
+
+        staging_dir = self.root_dir / f".staging-{version}"
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+        staging_dir.mkdir(parents=True)
+
+        model_entries = {}
+        for model_name, model in models.items():
+            serializer = serializer_for_model(model)
+            model_entries[model_name] = {
+                **self._save_model_file(model, model_name, serializer, staging_dir),
+                'metrics': {metric: float(value) for metric, value in results.get(model_name, {}).items()}
+            }
+
+            # A TensorFlow-free copy for serving, e.g. the DNN as a NumPy weight bundle
+            spec = get_model_spec(model_name)
+            if spec is not None and spec.inference_serializer not in (None, serializer.name):
+                model_entries[model_name]['inference'] = self._save_model_file(
+                    model, model_name, get_serializer(spec.inference_serializer), staging_dir
+                )
+
+        preprocessor.save_state(staging_dir / 'preprocessor.json')
+
+        manifest = {
+            'format_version': MANIFEST_FORMAT_VERSION,
+            'version': version,
+            'created_at': created_at.isoformat(),
+            'dataset_hash': dataset_hash,
+            'preprocessor': {
+                'file': 'preprocessor.json',
+                'state_version': preprocessor.get_state()['format_version'],
+                'feature_names': list(preprocessor.get_feature_names()),
+                'scaler_mean': preprocessor.scaler.mean_.tolist(),
+                'scaler_scale': preprocessor.scaler.scale_.tolist()
+            },
+            'models': model_entries
+        }
+        if run_log is not None:
+            with open(staging_dir / RUN_LOG_FILENAME, 'w') as f:
+                json.dump(run_log, f, indent=2)
+            manifest['run_log'] = RUN_LOG_FILENAME
+        if extra:
+            manifest.update(extra)
+
+        # The manifest is written last and marks the version as complete
+        with open(staging_dir / MANIFEST_FILENAME, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        os.replace(staging_dir, self.version_dir(version))
+        return version
+
+    @staticmethod
+    def _save_model_file(model, model_name, serializer, staging_dir):
+        """Write one model file into a staging version and return its manifest entry"""
+        filename = f"{_model_slug(model_name)}{serializer.file_extension}"
+        serializer.save(model, staging_dir / filename)
+        return {
+            'file': filename,
+            'serializer': serializer.name,
+            'sha256': compute_file_hash(staging_dir / filename)
+        }
+
+    def load_version(self, version, lazy=False, model_cache=None, inference=False):
+        """Load the models, preprocessor and manifest of one version
+
+        With lazy=True the models come back as a LazyModels mapping that only
+        deserializes a model when it is first accessed, through model_cache
+        (default: the process-wide src.model_registry cache). Every file's
+        header and recorded checksum are still verified, and one model is
+        deserialized, so a corrupt version fails here rather than on first use.
+
+        With inference=True, models saved with a TensorFlow-free inference copy
+        load from that copy instead; use it for serving, not for training.
+        """
+        version_dir = self.version_dir(version)
+        manifest = self.load_manifest(version)
+
+        model_entries = {
+            model_name: entry['inference'] if inference and 'inference' in entry else entry
+            for model_name, entry in manifest['models'].items()
+        }
+        # Versions written before serializers were recorded are told apart by file extension
+        model_files = {
+            model_name: (version_dir / entry['file'], entry.get('serializer'))
+            for model_name, entry in model_entries.items()
+        }
+
+        if lazy:
+            self.verify_model_files(model_files, {
+                model_name: entry.get('sha256') for model_name, entry in model_entries.items()
+            })
+            models = LazyModels(model_files, model_cache, version=manifest['version'])
+            if models:
+                # Proves the files deserialize and leaves that model warm in the cache;
+                # an inference copy is checked first since it never imports TensorFlow
+                served_from_copy = [
+                    model_name for model_name, entry in manifest['models'].items()
+                    if inference and 'inference' in entry
+                ]
+                models[(served_from_copy or list(models))[0]]
+        else:
+            models = {
+                model_name: load_model_file(filepath, serializer)
+                for model_name, (filepath, serializer) in model_files.items()
+            }
+
+        return models, self.load_preprocessor(version, manifest), manifest
+
+    @staticmethod
+    def verify_model_files(model_files, checksums):
+        """Raise unless every model file exists, has its format's header and matches its recorded checksum"""
+        missing = [str(filepath) for filepath, _ in model_files.values() if not filepath.exists()]
+        if missing:
+            raise FileNotFoundError(f"Missing model files: {', '.join(missing)}")
+
+        for model_name, (filepath, serializer) in model_files.items():
+            resolve_serializer(filepath, serializer).check_header(filepath)
+
+            # Versions written before checksums were recorded only get the header check
+            expected_hash = checksums.get(model_name)
+            if expected_hash and compute_file_hash(filepath) != expected_hash:
+                raise ValueError(f"Checksum mismatch for {filepath}")
+
+    def load_preprocessor(self, version, manifest=None):
+        """Load only the fitted preprocessor of a version, without any model"""
+        from src.data_preprocessor import DataPreprocessor
+
+        manifest = manifest or self.load_manifest(version)
+        preprocessor_file = self.version_dir(version) / manifest['preprocessor']['file']
+
+        if preprocessor_file.suffix == '.pkl':
+            # Versions written before the JSON state artifact existed
+            with open(preprocessor_file, 'rb') as f:
+                return pickle.load(f)
+
+        return DataPreprocessor.load_state(preprocessor_file)
+
+    def load_latest(self, lazy=False, model_cache=None, inference=False):
+        """Load the newest version that loads cleanly, or None if there is none"""
+        for version in reversed(self.list_versions()):
+            try:
+                return self.load_version(version, lazy, model_cache, inference)
+            except Exception:
+                # Skip versions with missing or unreadable files
+                continue
+        return None
+
+    def load_run_log(self, version):
+        """Load the training run log of a version, or None if it has none"""
+        manifest = self.load_manifest(version)
+        if 'run_log' not in manifest:
+            return None
+        with open(self.version_dir(version) / manifest['run_log']) as f:
+            return json.load(f)
+
+    def get_training_costs(self):
+        """Tabulate per-model training cost across versions to spot regressions"""
+        rows = []
+        for version in self.list_versions():
+            run_log = self.load_run_log(version)
+            if run_log is None:
+                continue
+            for model_name, telemetry in run_log['models'].items():
+                rows.append({
+                    'version': version,
+                    'mode': run_log['settings'].get('mode'),
+                    'model': model_name,
+                    'epochs_run': telemetry['epochs_run'],
+                    'total_seconds': telemetry['total_seconds'],
+                    'mean_epoch_seconds': telemetry['mean_epoch_seconds'],
+                    'mean_samples_per_sec': telemetry['mean_samples_per_sec'],
+                    'early_stopping_epoch': telemetry['early_stopping_epoch'],
+                    'peak_rss_mb': telemetry['peak_rss_mb']
+                })
+        return pd.DataFrame(rows)
+
+    def get_results(self, manifest):
+        """Rebuild the train_all_models results dict from a manifest"""
+        return {model_name: entry['metrics'] for model_name, entry in manifest['models'].items()}
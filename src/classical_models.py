@@ -0,0 +1,65 @@
+import pickle
+import numpy as np
+import joblib
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+
+class SklearnModel:
+    """Model handle giving a scikit-learn classifier the predict(X, verbose=0) interface of a Keras model
+
+    Binary classifiers return the positive-class probability as an (n, 1)
+    array like a sigmoid head, so the handle works anywhere a trained network does.
+    """
+
+    # Name of the src.model_registry serializer that stores this handle
+    serializer = 'sklearn'
+
+    def __init__(self, estimator):
+        self.estimator = estimator
+
+    @property
+    def input_shape(self):
+        return (None, self.estimator.n_features_in_)
+
+    @property
+    def model_content(self):
+        """Serialized estimator, used to fingerprint the fitted state"""
+        return pickle.dumps(self.estimator)
+
+    def fit(self, X, y):
+        self.estimator.fit(np.asarray(X), np.asarray(y).reshape(-1))
+        return self
+
+    def predict(self, X, verbose=0, batch_size=None):
+        probabilities = self.estimator.predict_proba(np.asarray(X, dtype=np.float32))
+        return probabilities[:, 1:] if probabilities.shape[1] == 2 else probabilities
+
+    def save(self, filepath):
+        joblib.dump(self.estimator, filepath)
+
+    @classmethod
+    def load(cls, filepath):
+        return cls(joblib.load(filepath))
+
+
+def create_hist_gradient_boosting_model(max_iter=200, learning_rate=0.1, max_leaf_nodes=15):
+    """Create a histogram gradient boosting baseline"""
+    return SklearnModel(HistGradientBoostingClassifier(
+        max_iter=max_iter, learning_rate=learning_rate, max_leaf_nodes=max_leaf_nodes,
+        early_stopping=True, random_state=42
+    ))
+
+
+def create_logistic_regression_model(C=1.0):
+    """Create a regularized logistic regression baseline"""
+    return SklearnModel(LogisticRegression(C=C, class_weight='balanced', max_iter=1000))
+
+
+def create_random_forest_model(n_estimators=200, max_depth=None, min_samples_leaf=2):
+    """Create a random forest baseline"""
+    return SklearnModel(RandomForestClassifier(
+        n_estimators=n_estimators, max_depth=max_depth, min_samples_leaf=min_samples_leaf,
+        class_weight='balanced', n_jobs=-1, random_state=42
+    ))
+
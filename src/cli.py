@@ -0,0 +1,208 @@
+"""Headless training, evaluation, scoring and export, without the Streamlit app.
+
+Run from the repository root, for example:
+
+    python -m src.cli train --parallel
+    python -m src.cli evaluate
+    python -m src.cli score --input patients.csv --output scored.csv --model DNN
+    python -m src.cli export --format tflite --quantization dynamic --output-dir exported
+"""
+import sys
+import argparse
+import logging
+from pathlib import Path
+from src.reporting import LoggingReporter, set_reporter, get_reporter
+from src.artifact_store import ArtifactStore, DEFAULT_ARTIFACT_DIR
+
+DEFAULT_SCORE_CHUNK_SIZE = 100000
+
+
+def _load_version(store, version, lazy=False, inference=False):
+    """Load a named version, or the newest one that loads cleanly"""
+    loaded = (store.load_version(version, lazy, inference=inference) if version
+              else store.load_latest(lazy, inference=inference))
+    if loaded is None:
+        raise ValueError(f"No artifact version found in {store.root_dir}. Run 'train' first.")
+    return loaded
+
+
+def _print_metrics(results):
+    import pandas as pd
+
+    with pd.option_context('display.float_format', '{:.3f}'.format, 'display.width', 120):
+        print(pd.DataFrame(results).T.to_string())
+
+
+def train(args):
+    """Train every model on the Cleveland dataset and publish a new artifact version"""
+    from src.data_preprocessor import DataPreprocessor
+    from src.model_trainer import ModelTrainer
+    from src.distillation import DISTILLED_MODEL_NAME
+
+    preprocessor = DataPreprocessor()
+    X_train, X_test, y_train, y_test = preprocessor.load_and_preprocess_data()
+    if X_train is None:
+        raise ValueError("Could not load the training dataset")
+
+    hyperparameters = None
+    if args.tune:
+        from src.hyperparameter_search import tune_hyperparameters
+
+        # Tune on the training split before SMOTE, so validation rows never leak into fit rows
+        X_tune, _, y_tune, _ = preprocessor.load_original_split()
+        hyperparameters, _ = tune_hyperparameters(X_tune, y_tune)
+
+    trainer = ModelTrainer()
+    models, results = trainer.train_all_models(
+        X_train, y_train, X_test, y_test, parallel=args.parallel,
+        hyperparameters=hyperparameters, jit_compile=args.jit_compile
+    )
+
+    if args.distill:
+        _, results[DISTILLED_MODEL_NAME] = trainer.distill_ensemble(X_train, X_test, y_test)
+
+    version = ArtifactStore(args.artifact_dir).save_version(
+        models, preprocessor, results, run_log=trainer.run_log,
+        extra={'hyperparameters': hyperparameters} if hyperparameters else None
+    )
+
+    _print_metrics(results)
+    print(f"Saved version {version}")
+
+
+def evaluate(args):
+    """Score a saved version on the original test split or on a labeled CSV"""
+    from src.model_trainer import ModelTrainer
+    from src.dataset_schema import read_heart_csv
+
+    models, preprocessor, manifest = _load_version(ArtifactStore(args.artifact_dir), args.version)
+
+    if args.data:
+        X_test, y_test = preprocessor.transform_labeled_data(read_heart_csv(args.data))
+    else:
+        original_split = preprocessor.load_original_split()
+        if original_split is None:
+            raise ValueError("Could not load the original dataset; pass --data")
+        _, X_test, _, y_test = original_split
+
+    trainer = ModelTrainer()
+    results = {model_name: trainer.evaluate_model(model, X_test, y_test) for model_name, model in models.items()}
+
+    print(f"Version {manifest['version']}, {len(y_test)} rows")
+    _print_metrics(results)
+
+
+def score(args):
+    """Predict risk for every row of a CSV, streaming it in chunks to keep memory flat"""
+    import pandas as pd
+    from src.predictor import HeartDiseasePredictor
+    from src.dataset_schema import read_heart_csv
+
+    # Only the chosen model is ever deserialized, from its TensorFlow-free copy when there is one
+    models, preprocessor, manifest = _load_version(ArtifactStore(args.artifact_dir), args.version,
+                                                   lazy=True, inference=True)
+    if args.model not in models:
+        raise ValueError(f"Model {args.model} not in version {manifest['version']}: {list(models)}")
+
+    # Batch scoring never repeats an input, so the per-patient cache would only cost memory
+    predictor = HeartDiseasePredictor({args.model: models[args.model]}, preprocessor,
+                                      model_version=manifest['version'], cache=None)
+
+    n_rows = 0
+    # Gaps are filled with the training medians, so integer columns are read as float
+    chunks = read_heart_csv(args.input, chunksize=args.chunk_size, allow_missing=True, labeled=False)
+    for chunk_index, chunk in enumerate(chunks):
+        predictions = predictor.predict_risk_batch(chunk, args.model)
+        if predictions is None:
+            raise ValueError(f"Scoring failed on chunk {chunk_index}")
+
+        scored = pd.concat([chunk, predictions.drop(columns='risk_color')], axis=1)
+        scored.to_csv(args.output, mode='w' if chunk_index == 0 else 'a', header=chunk_index == 0, index=False)
+        n_rows += len(chunk)
+
+    print(f"Scored {n_rows} rows with {args.model} (version {manifest['version']}) into {args.output}")
+
+
+def export(args):
+    """Export a saved version as TFLite flatbuffers or a NumPy DNN weight bundle"""
+    from src.model_trainer import ModelTrainer
+    from src.numpy_inference import export_dnn_weights
+
+    models, preprocessor, manifest = _load_version(ArtifactStore(args.artifact_dir), args.version)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    prefix = str(output_dir / manifest['version'])
+
+    if args.format == 'numpy':
+        if 'DNN' not in models:
+            raise ValueError("The NumPy bundle is only available for the DNN")
+        print(f"Exported DNN to {export_dnn_weights(models['DNN'], f'{prefix}_dnn.npz')}")
+        return
+
+    calibration_data = None
+    if args.quantization == 'int8':
+        original_split = preprocessor.load_original_split()
+        if original_split is None:
+            raise ValueError("int8 quantization needs the original dataset for calibration")
+        calibration_data = original_split[0]
+
+    trainer = ModelTrainer()
+    trainer.models = models
+    exported = trainer.export_tflite_models(prefix, args.quantization, calibration_data)
+    print(f"Exported {len(exported)} models to {output_dir}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m src.cli', description=__doc__.splitlines()[0])
+    parser.add_argument('--artifact-dir', default=DEFAULT_ARTIFACT_DIR, help="Artifact store directory")
+    parser.add_argument('--quiet', action='store_true', help="Only log warnings and errors")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = commands.add_parser('train', help=train.__doc__)
+    train_parser.add_argument('--parallel', action='store_true', help="Train each model in its own process")
+    train_parser.add_argument('--tune', action='store_true', help="Run the hyperparameter search first")
+    train_parser.add_argument('--no-distill', dest='distill', action='store_false',
+                              help="Skip the Ensemble-Distilled student")
+    train_parser.add_argument('--jit-compile', action='store_true', help="Compile training with XLA")
+    train_parser.set_defaults(handler=train)
+
+    evaluate_parser = commands.add_parser('evaluate', help=evaluate.__doc__)
+    evaluate_parser.add_argument('--version', help="Artifact version (default: latest)")
+    evaluate_parser.add_argument('--data', help="Labeled CSV to evaluate on instead of the original test split")
+    evaluate_parser.set_defaults(handler=evaluate)
+
+    score_parser = commands.add_parser('score', help=score.__doc__)
+    score_parser.add_argument('--input', required=True, help="CSV with the 13 feature columns")
+    score_parser.add_argument('--output', required=True, help="Where to write the scored CSV")
+    score_parser.add_argument('--model', default='DNN', help="Model to score with (default: DNN)")
+    score_parser.add_argument('--version', help="Artifact version (default: latest)")
+    score_parser.add_argument('--chunk-size', type=int, default=DEFAULT_SCORE_CHUNK_SIZE,
+                              help="Rows read and scored at a time")
+    score_parser.set_defaults(handler=score)
+
+    export_parser = commands.add_parser('export', help=export.__doc__)
+    export_parser.add_argument('--format', choices=['tflite', 'numpy'], default='tflite')
+    export_parser.add_argument('--quantization', choices=['dynamic', 'int8'], default=None)
+    export_parser.add_argument('--output-dir', default='exported', help="Directory for the exported files")
+    export_parser.add_argument('--version', help="Artifact version (default: latest)")
+    export_parser.set_defaults(handler=export)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format='%(message)s')
+    set_reporter(LoggingReporter())
+
+    try:
+        args.handler(args)
+    except Exception as e:
+        get_reporter().error(f"{args.command} failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+import numpy as np
+import tensorflow as tf
+
+AUTOTUNE = tf.data.AUTOTUNE
+DEFAULT_SHUFFLE_BUFFER = 10000
+DEFAULT_CYCLE_LENGTH = 4
+# Rows are decoded in blocks so parsing runs as a few vectorized ops instead of one per row
+PARSE_BLOCK_SIZE = 1024
+
+
+def _interleave_files(file_patterns, make_reader, shuffle, seed, cycle_length):
+    """Read several shards at once, in parallel, as one stream of records"""
+    files = tf.data.Dataset.list_files(file_patterns, shuffle=shuffle, seed=seed)
+    return files.interleave(
+        make_reader,
+        cycle_length=cycle_length,
+        num_parallel_calls=AUTOTUNE,
+        deterministic=not shuffle
+    )
+
+
+def _finalize(dataset, batch_size, shuffle, shuffle_buffer, cache, seed):
+    """Cache parsed rows, shuffle them within a bounded buffer, then batch and prefetch"""
+    if cache:
+        # cache=True keeps rows in memory; a path spills them to local disk instead
+        dataset = dataset.cache('' if cache is True else str(cache))
+    if shuffle:
+        dataset = dataset.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+    return dataset.batch(batch_size).prefetch(AUTOTUNE)
+
+
+def _read_csv_header(file_patterns):
+    patterns = [file_patterns] if isinstance(file_patterns, str) else list(file_patterns)
+    paths = sorted(path for pattern in patterns for path in tf.io.gfile.glob(pattern))
+    if not paths:
+        raise FileNotFoundError(f"No files match {file_patterns}")
+
+    with tf.io.gfile.GFile(paths[0]) as f:
+        return [column.strip().lstrip('\ufeff') for column in f.readline().split(',')]
+
+
+def make_csv_dataset(file_patterns, preprocessor, label_name='target', batch_size=32, shuffle=True,
+                     shuffle_buffer=DEFAULT_SHUFFLE_BUFFER, cache=False, seed=42,
+                     cycle_length=DEFAULT_CYCLE_LENGTH):
+    """Stream labeled rows from sharded CSV files as scaled (features, label) batches
+
+    Every shard needs the same header row. Empty fields are filled with the
+    fitted training medians and features are scaled with the fitted scaler, so
+    the batches match what prepare_batch_for_prediction produces.
+    """
+    if preprocessor.label_encoders:
+        raise ValueError("Streaming CSV input supports numeric feature columns only")
+
+    feature_names = preprocessor.get_feature_names()
+    columns = _read_csv_header(file_patterns)
+    missing = [name for name in feature_names + [label_name] if name not in columns]
+    if missing:
+        raise ValueError(f"CSV shards are missing columns: {missing}")
+
+    selected_columns = sorted(columns.index(name) for name in feature_names + [label_name])
+    selected_names = [columns[index] for index in selected_columns]
+    # An empty default makes the label required; features fall back to their medians
+    record_defaults = [
+        tf.constant([], tf.float32) if name == label_name
+        else tf.constant([preprocessor.medians.get(name, 0.0)], tf.float32)
+        for name in selected_names
+    ]
+
+    mean = tf.constant(preprocessor.scaler.mean_, tf.float32)
+    scale = tf.constant(preprocessor.scaler.scale_, tf.float32)
+
+    def parse_block(lines):
+        fields = dict(zip(selected_names, tf.io.decode_csv(
+            lines, record_defaults=record_defaults, select_cols=selected_columns)))
+        features = tf.stack([fields[name] for name in feature_names], axis=1)
+        return (features - mean) / scale, tf.cast(fields[label_name], tf.int32)
+
+    def read_shard(path):
+        lines = tf.data.TextLineDataset(path).skip(1)
+        return lines.filter(lambda line: tf.strings.length(tf.strings.strip(line)) > 0)
+
+    dataset = _interleave_files(file_patterns, read_shard, shuffle, seed, cycle_length)
+    dataset = dataset.batch(PARSE_BLOCK_SIZE).map(parse_block, num_parallel_calls=AUTOTUNE).unbatch()
+    return _finalize(dataset, batch_size, shuffle, shuffle_buffer, cache, seed)
+
+
+def write_tfrecord_shards(blocks, path_prefix, n_shards=4):
+    """Write (features, labels) array blocks round-robin into TFRecord shards
+
+    Features are written as given, so pass rows that are already scaled. Blocks
+    are consumed one at a time, which keeps memory flat for large exports.
+    """
+    paths = [f"{path_prefix}-{shard:05d}-of-{n_shards:05d}.tfrecord" for shard in range(n_shards)]
+    writers = [tf.io.TFRecordWriter(path) for path in paths]
+
+    try:
+        row_index = 0
+        for X_block, y_block in blocks:
+            for row, label in zip(np.asarray(X_block, dtype=np.float32), np.asarray(y_block)):
+                example = tf.train.Example(features=tf.train.Features(feature={
+                    'features': tf.train.Feature(float_list=tf.train.FloatList(value=row)),
+                    'label': tf.train.Feature(int64_list=tf.train.Int64List(value=[int(label)]))
+                }))
+                writers[row_index % n_shards].write(example.SerializeToString())
+                row_index += 1
+    finally:
+        for writer in writers:
+            writer.close()
+
+    return paths
+
+
+def make_tfrecord_dataset(file_patterns, n_features, batch_size=32, shuffle=True,
+                          shuffle_buffer=DEFAULT_SHUFFLE_BUFFER, cache=False, seed=42,
+                          cycle_length=DEFAULT_CYCLE_LENGTH):
+    """Stream scaled (features, label) batches from shards written by write_tfrecord_shards"""
+    feature_spec = {
+        'features': tf.io.FixedLenFeature([n_features], tf.float32),
+        'label': tf.io.FixedLenFeature([], tf.int64)
+    }
+
+    def parse_block(records):
+        parsed = tf.io.parse_example(records, feature_spec)
+        return parsed['features'], tf.cast(parsed['label'], tf.int32)
+
+    dataset = _interleave_files(file_patterns, tf.data.TFRecordDataset, shuffle, seed, cycle_length)
+    dataset = dataset.batch(PARSE_BLOCK_SIZE).map(parse_block, num_parallel_calls=AUTOTUNE).unbatch()
+    return _finalize(dataset, batch_size, shuffle, shuffle_buffer, cache, seed)
+
+
+def count_labels(dataset):
+    """Count rows per class in one streaming pass over a (features, label) dataset"""
+    counts = np.zeros(0, dtype=np.int64)
+    for _, labels in dataset:
+        batch_counts = np.bincount(labels.numpy().reshape(-1))
+        if len(batch_counts) > len(counts):
+            counts = np.pad(counts, (0, len(batch_counts) - len(counts)))
+        counts[:len(batch_counts)] += batch_counts
+    return counts
+
+
+def balanced_class_weights(label_counts):
+    """Same weights as compute_class_weight('balanced'), from label counts alone"""
+    label_counts = np.asarray(label_counts)
+    classes = np.nonzero(label_counts)[0]
+    total = label_counts.sum()
+    return {int(label): total / (len(classes) * label_counts[label]) for label in classes}
@@ -1,11 +1,54 @@
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
+from pandas.api.types import is_numeric_dtype
+from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.datasets import fetch_openml
+from sklearn.cluster import KMeans
 from imblearn.over_sampling import SMOTE
-import streamlit as st
+from src.reporting import get_reporter
+import json
 from pathlib import Path
+from src.artifact_store import compute_file_hash
+from src.dataset_cache import DatasetCache, make_cache_key
+from src.streaming_stats import QuantileSketch, RunningMoments, DEFAULT_SKETCH_CAPACITY
+from src.dataset_schema import read_heart_csv
+
+# Bump when the layout of the saved preprocessor state changes
+PREPROCESSOR_STATE_VERSION = 1
+
+# Preprocessed CV folds per (dataset hash, n_splits, apply_smote, random_state)
+_cv_folds_cache = {}
+CV_FOLD_ARRAYS = ('X_train', 'X_val', 'y_train', 'y_val')
+
+# Streaming mode reads this many CSV rows at a time and keeps this many sample rows for LIME/SHAP stats
+DEFAULT_STREAMING_CHUNK_SIZE = 100000
+DEFAULT_STREAMING_SAMPLE_ROWS = 10000
+
+
+def _text_columns(X):
+    """Columns pandas parsed as text (object or string dtype)"""
+    return [column for column in X.columns if not is_numeric_dtype(X[column])]
+
+
+def _update_reservoir(sample, X, n_seen, size, rng):
+    """Keep a uniform random sample of at most `size` rows over a stream of chunks"""
+    n_fill = max(0, min(size - n_seen, len(X)))
+    if n_fill:
+        sample = X.iloc[:n_fill].copy() if sample is None else pd.concat([sample, X.iloc[:n_fill]])
+
+    rest = X.iloc[n_fill:]
+    if len(rest):
+        # Row i of the stream replaces a random slot with probability size / (i + 1)
+        slots = rng.integers(0, np.arange(n_seen + n_fill, n_seen + len(X)) + 1)
+        accepted = np.flatnonzero(slots < size)
+        for position in range(X.shape[1]):
+            text = not (is_numeric_dtype(sample.dtypes.iloc[position]) and is_numeric_dtype(rest.dtypes.iloc[position]))
+            column = sample.iloc[:, position].to_numpy(dtype=object if text else np.float64, copy=True)
+            column[slots[accepted]] = rest.iloc[accepted, position].to_numpy()
+            sample[sample.columns[position]] = column
+
+    return sample
 
 
 class DataPreprocessor:
@@ -13,30 +56,38 @@ class DataPreprocessor:
         self.scaler = StandardScaler()
         self.label_encoders = {}
         self.feature_names = []
+        self.medians = {}
+        self.training_stats = None
+        self.background_summary = None
+        self.dataset_hash = None
+        self.dataset_cache = DatasetCache()
+
+    def find_dataset_path(self):
+        """Locate dataset.csv in the current directory or 'src/'"""
+        # Use current working directory (Jupyter or production)
+        base_path = Path.cwd()
+
+        if (base_path / 'dataset.csv').exists():
+            return base_path / 'dataset.csv'
+        if (base_path / 'src' / 'dataset.csv').exists():
+            return base_path / 'src' / 'dataset.csv'
+        raise FileNotFoundError(
+            "dataset.csv not found in either current directory or 'src/' folder."
+        )
 
     def load_cleveland_dataset(self):
         """Load the Cleveland Heart Disease dataset from a relative path."""
         try:
-            # Use current working directory (Jupyter or production)
-            base_path = Path.cwd()
-
-            # Try to locate dataset.csv in current dir or 'src/'
-            if (base_path / 'dataset.csv').exists():
-                dataset_path = base_path / 'dataset.csv'
-            elif (base_path / 'src' / 'dataset.csv').exists():
-                dataset_path = base_path / 'src' / 'dataset.csv'
-            else:
-                raise FileNotFoundError(
-                    "dataset.csv not found in either current directory or 'src/' folder."
-                )
+            dataset_path = self.find_dataset_path()
 
-            df = pd.read_csv(dataset_path)
+            df = read_heart_csv(dataset_path)
+            self.dataset_hash = compute_file_hash(dataset_path)
 
             if df.empty:
                 raise ValueError("Dataset is empty.")
 
         except Exception as e:
-            st.error(f"Error loading dataset: {e}")
+            get_reporter().error(f"Error loading dataset: {e}")
             df = pd.DataFrame()  # Empty DataFrame fallback
 
         return df
@@ -47,7 +98,9 @@ class DataPreprocessor:
         y = df['target']
 
         self.feature_names = X.columns.tolist()
-        X = X.fillna(X.median())
+        medians = X.median()
+        self.medians = {feature: float(value) for feature, value in medians.items()}
+        X = X.fillna(medians)
 
         categorical_features = X.select_dtypes(include=['object']).columns
         for feature in categorical_features:
@@ -76,11 +129,172 @@ class DataPreprocessor:
 
         return X_train_scaled
 
-    def load_and_preprocess_data(self, test_size=0.2, apply_smote=True):
-        """Complete data loading and preprocessing pipeline"""
+    def compute_training_stats(self, X_train_scaled):
+        """Summarize the scaled training matrix into the quartile statistics LIME needs
+
+        These are exactly the bins, per-bin moments and bin frequencies LIME's
+        QuartileDiscretizer computes, so an explainer built from them and seeded
+        alike gives the same explanations as one fitted on the full matrix
+        (see tests/test_data_preprocessor.py). Only a few numbers per feature
+        need persisting.
+        """
+        X_train_scaled = np.asarray(X_train_scaled, dtype=np.float64)
+        stats = {key: {} for key in ('bins', 'means', 'stds', 'mins', 'maxs', 'feature_values', 'feature_frequencies')}
+        stats['quantiles'] = {}
+
+        for feature in range(X_train_scaled.shape[1]):
+            column = X_train_scaled[:, feature]
+            bins = np.unique(np.percentile(column, [25, 50, 75]))
+            discretized = np.searchsorted(bins, column)
+
+            means, stds = [], []
+            for bin_index in range(len(bins) + 1):
+                selection = column[discretized == bin_index]
+                means.append(float(np.mean(selection)) if len(selection) else 0.0)
+                stds.append((float(np.std(selection)) if len(selection) else 0.0) + 1e-11)
+
+            values, frequencies = np.unique(discretized, return_counts=True)
+
+            stats['bins'][feature] = bins.tolist()
+            stats['means'][feature] = means
+            stats['stds'][feature] = stds
+            stats['mins'][feature] = [float(column.min())] + bins.tolist()
+            stats['maxs'][feature] = bins.tolist() + [float(column.max())]
+            stats['feature_values'][feature] = values.tolist()
+            stats['feature_frequencies'][feature] = frequencies.tolist()
+            stats['quantiles'][feature] = np.percentile(column, [0, 25, 50, 75, 100]).tolist()
+
+        self.training_stats = stats
+        return stats
+
+    def compute_background_summary(self, X_train_scaled, n_clusters=10):
+        """Summarize the scaled training matrix into weighted k-means centers for SHAP"""
+        X_train_scaled = np.asarray(X_train_scaled, dtype=np.float64)
+        n_clusters = min(n_clusters, len(X_train_scaled))
+
+        kmeans = KMeans(n_clusters=n_clusters, n_init=10, random_state=42).fit(X_train_scaled)
+        weights = np.bincount(kmeans.labels_, minlength=n_clusters) / len(X_train_scaled)
+
+        self.background_summary = {
+            'centers': kmeans.cluster_centers_.tolist(),
+            'weights': weights.tolist()
+        }
+        return self.background_summary
+
+    def get_state(self):
+        """Return the fitted preprocessing state as plain JSON-serializable data"""
+        return {
+            'format_version': PREPROCESSOR_STATE_VERSION,
+            'feature_names': list(self.feature_names),
+            'medians': self.medians,
+            'scaler': {
+                'mean': self.scaler.mean_.tolist(),
+                'scale': self.scaler.scale_.tolist(),
+                'var': self.scaler.var_.tolist(),
+                'n_samples_seen': int(np.max(self.scaler.n_samples_seen_))
+            },
+            'label_encoders': {
+                feature: encoder.classes_.tolist() for feature, encoder in self.label_encoders.items()
+            },
+            'training_stats': self.training_stats,
+            'background_summary': self.background_summary,
+            'dataset_hash': self.dataset_hash
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a fitted preprocessor from get_state() output without touching the dataset"""
+        if state.get('format_version') != PREPROCESSOR_STATE_VERSION:
+            raise ValueError(f"Unsupported preprocessor state version {state.get('format_version')}")
+
+        preprocessor = cls()
+        preprocessor.set_state(state)
+        return preprocessor
+
+    def set_state(self, state):
+        """Overwrite this preprocessor's fitted state with get_state() output"""
+        self.feature_names = list(state['feature_names'])
+        self.medians = dict(state['medians'])
+
+        scaler_state = state['scaler']
+        self.scaler = StandardScaler()
+        self.scaler.mean_ = np.array(scaler_state['mean'])
+        self.scaler.scale_ = np.array(scaler_state['scale'])
+        self.scaler.var_ = np.array(scaler_state['var'])
+        self.scaler.n_samples_seen_ = scaler_state['n_samples_seen']
+        self.scaler.n_features_in_ = len(scaler_state['mean'])
+
+        self.label_encoders = {}
+        for feature, classes in state['label_encoders'].items():
+            encoder = LabelEncoder()
+            encoder.classes_ = np.array(classes)
+            self.label_encoders[feature] = encoder
+
+        self.training_stats = state['training_stats']
+        self.background_summary = state['background_summary']
+        self.dataset_hash = state['dataset_hash']
+
+    def save_state(self, filepath):
+        """Save the fitted preprocessing state as a compact JSON artifact"""
+        with open(filepath, 'w') as f:
+            json.dump(self.get_state(), f)
+
+    @classmethod
+    def load_state(cls, filepath):
+        """Load a fitted preprocessor saved with save_state"""
+        with open(filepath) as f:
+            return cls.from_state(json.load(f))
+
+    def _hash_dataset(self):
+        """Hash the located CSV without parsing it; None if there is no dataset"""
+        try:
+            self.dataset_hash = compute_file_hash(self.find_dataset_path())
+        except FileNotFoundError:
+            return None
+        return self.dataset_hash
+
+    def _cache_key(self, use_cache, pipeline, **params):
+        """Dataset cache key for the hashed CSV and settings, or None when caching is off"""
+        if not use_cache or self.dataset_cache is None or self.dataset_hash is None:
+            return None
+        return make_cache_key(self.dataset_hash, pipeline=pipeline,
+                              state_version=PREPROCESSOR_STATE_VERSION, **params)
+
+    def _load_cached(self, cache_key):
+        if cache_key is None:
+            return None
+        try:
+            return self.dataset_cache.load(cache_key)
+        except Exception as e:
+            get_reporter().warning(f"Ignoring unreadable dataset cache entry {cache_key}: {e}")
+            return None
+
+    def _save_cached(self, cache_key, arrays, metadata=None):
+        if cache_key is None:
+            return
+        try:
+            self.dataset_cache.save(cache_key, arrays, metadata)
+        except Exception as e:
+            get_reporter().warning(f"Could not write dataset cache entry {cache_key}: {e}")
+
+    def load_and_preprocess_data(self, test_size=0.2, apply_smote=True, use_cache=True):
+        """Complete data loading and preprocessing pipeline
+
+        With use_cache=True the final arrays and fitted state are stored in
+        self.dataset_cache, keyed on the CSV's contents and these settings;
+        later runs memory-map them and skip parsing, SMOTE and scaling.
+        """
+        self._hash_dataset()
+        cache_key = self._cache_key(use_cache, 'train_test', test_size=test_size, apply_smote=apply_smote)
+        cached = self._load_cached(cache_key)
+        if cached is not None:
+            arrays, metadata = cached
+            self.set_state(metadata['preprocessor'])
+            return arrays['X_train'], arrays['X_test'], arrays['y_train'], arrays['y_test']
+
         df = self.load_cleveland_dataset()
         if df.empty:
-            st.warning("Dataset is empty or failed to load. Aborting pipeline.")
+            get_reporter().warning("Dataset is empty or failed to load. Aborting pipeline.")
             return None, None, None, None
 
         X, y = self.preprocess_data(df)
@@ -93,13 +307,252 @@ class DataPreprocessor:
             X_train, y_train = self.apply_smote(X_train, y_train)
 
         X_train_scaled, X_test_scaled = self.scale_features(X_train, X_test)
+        self.compute_training_stats(X_train_scaled)
+        self.compute_background_summary(X_train_scaled)
+
+        self._save_cached(cache_key, {
+            'X_train': X_train_scaled, 'X_test': X_test_scaled, 'y_train': y_train, 'y_test': y_test
+        }, {'preprocessor': self.get_state()})
 
         return X_train_scaled, X_test_scaled, y_train, y_test
 
+    def _encode_features(self, df):
+        """Fill and label-encode feature columns with the fitted state, returning unscaled float32"""
+        X = df[self.feature_names].fillna(self.medians)
+
+        for feature, encoder in self.label_encoders.items():
+            X[feature] = encoder.transform(X[feature].astype(str))
+
+        return X.values.astype(np.float32)
+
+    def transform_labeled_data(self, df):
+        """Apply the fitted preprocessing to labeled rows without refitting anything"""
+        X = self._encode_features(df)
+        y = df['target'].values.astype(np.int32)
+
+        return self.scaler.transform(X), y
+
+    def fit_streaming(self, chunks, label_name='target', sample_rows=DEFAULT_STREAMING_SAMPLE_ROWS,
+                      sketch_capacity=DEFAULT_SKETCH_CAPACITY, random_state=42):
+        """Fit medians, label encoders and the scaler in one pass over DataFrame chunks
+
+        chunks is any iterable of DataFrames, such as read_heart_csv(path, chunksize=n).
+        Medians come from a mergeable quantile sketch per numeric column,
+        vocabularies from running category counts, and the scaler from running
+        moments corrected for the median fill, so memory depends on the chunk
+        size and column cardinality, never on the row count. A reservoir sample
+        of sample_rows rows feeds the LIME and SHAP summaries. Unlike
+        load_and_preprocess_data there is no SMOTE; streamed training balances
+        classes with class weights instead.
+        """
+        rng = np.random.default_rng(random_state)
+        numeric_features = categorical_features = sketches = moments = missing = None
+        vocabularies = {}
+        sample = None
+        n_seen = 0
+
+        for chunk in chunks:
+            X = chunk.drop(columns=label_name)
+
+            if numeric_features is None:
+                self.feature_names = X.columns.tolist()
+                categorical_features = _text_columns(X)
+                numeric_features = [feature for feature in self.feature_names if feature not in categorical_features]
+                sketches = {feature: QuantileSketch(sketch_capacity, random_state) for feature in numeric_features}
+                moments = RunningMoments(len(numeric_features))
+                missing = np.zeros(len(numeric_features))
+                vocabularies = {feature: {} for feature in categorical_features}
+            elif X.columns.tolist() != self.feature_names:
+                raise ValueError(f"Chunk columns {X.columns.tolist()} differ from {self.feature_names}")
+
+            # A text column parsed as numbers in one chunk would need a declared dtype
+            chunk_categorical = set(_text_columns(X))
+            if not chunk_categorical.issubset(categorical_features):
+                raise ValueError(f"Columns {sorted(chunk_categorical - set(categorical_features))} "
+                                 f"changed to text mid-stream; declare their dtype when reading the CSV")
+
+            block = X[numeric_features].to_numpy(dtype=np.float64)
+            for position, feature in enumerate(numeric_features):
+                sketches[feature].update(block[:, position])
+            moments.update(block)
+            missing += np.isnan(block).sum(axis=0)
+
+            for feature in categorical_features:
+                for category, count in X[feature].astype(str).value_counts().items():
+                    vocabularies[feature][category] = vocabularies[feature].get(category, 0) + int(count)
+
+            sample = _update_reservoir(sample, X, n_seen, sample_rows, rng)
+            n_seen += len(X)
+
+        if not n_seen:
+            raise ValueError("No rows to fit on")
+
+        self.medians = {feature: sketches[feature].median() for feature in numeric_features}
+        moments.add_constant([self.medians[feature] for feature in numeric_features], missing)
+
+        mean = np.zeros(len(self.feature_names))
+        var = np.zeros(len(self.feature_names))
+        for position, feature in enumerate(numeric_features):
+            index = self.feature_names.index(feature)
+            mean[index], var[index] = moments.mean[position], moments.variance[position]
+
+        self.label_encoders = {}
+        for feature in categorical_features:
+            encoder = LabelEncoder()
+            encoder.classes_ = np.array(sorted(vocabularies[feature]))
+            self.label_encoders[feature] = encoder
+
+            # Codes are positions in the sorted vocabulary, so their moments follow from the counts
+            counts = np.array([vocabularies[feature][category] for category in encoder.classes_], dtype=np.float64)
+            codes = np.arange(len(counts))
+            index = self.feature_names.index(feature)
+            mean[index] = np.sum(codes * counts) / counts.sum()
+            var[index] = np.sum(counts * (codes - mean[index]) ** 2) / counts.sum()
+
+        self.scaler = StandardScaler()
+        self.scaler.mean_ = mean
+        self.scaler.var_ = var
+        self.scaler.scale_ = np.where(var > 0, np.sqrt(var), 1.0)
+        self.scaler.n_samples_seen_ = n_seen
+        self.scaler.n_features_in_ = len(self.feature_names)
+
+        sample_scaled = self.scaler.transform(self._encode_features(sample))
+        self.compute_training_stats(sample_scaled)
+        self.compute_background_summary(sample_scaled)
+
+        return self
+
+    def transform_streaming(self, chunks, label_name='target'):
+        """Yield (scaled float32 features, int32 labels) blocks for DataFrame chunks with the fitted state"""
+        for chunk in chunks:
+            X = self.scaler.transform(self._encode_features(chunk)).astype(np.float32, copy=False)
+            yield X, chunk[label_name].to_numpy().astype(np.int32)
+
+    def preprocess_csv_streaming(self, csv_path, chunksize=DEFAULT_STREAMING_CHUNK_SIZE, label_name='target',
+                                 **fit_params):
+        """Fit on a CSV of any size in one chunked pass and return a generator of scaled blocks
+
+        The CSV is read twice, chunksize rows at a time: once by fit_streaming
+        and once, lazily, by the returned generator. Pass the blocks to
+        src.data_pipeline.write_tfrecord_shards to train on the result with
+        make_tfrecord_dataset.
+        """
+        self.dataset_hash = compute_file_hash(csv_path)
+        self.fit_streaming(read_heart_csv(csv_path, chunksize, allow_missing=True), label_name, **fit_params)
+        return self.transform_streaming(read_heart_csv(csv_path, chunksize, allow_missing=True), label_name)
+
+    def build_cv_folds(self, n_splits=5, apply_smote=True, random_state=42, use_cache=True):
+        """Return stratified (X_train, X_val, y_train, y_val) folds, preprocessed without leakage
+
+        SMOTE and the scaler are fitted on each fold's training part only. Folds
+        are cached per dataset contents and settings, in memory and (with
+        use_cache=True) in self.dataset_cache, so every model, repeat run and
+        new process reuses them. This preprocessor's fitted state is left untouched.
+        """
+        # Folds refit everything, so they are built on a fresh preprocessor that
+        # cannot overwrite this one's medians, encoders, feature names or dataset hash
+        fold_preprocessor = DataPreprocessor()
+        fold_preprocessor.dataset_cache = self.dataset_cache
+        return fold_preprocessor._build_cv_folds(n_splits, apply_smote, random_state, use_cache)
+
+    def _build_cv_folds(self, n_splits, apply_smote, random_state, use_cache):
+        if self._hash_dataset() is None:
+            get_reporter().warning("Dataset is empty or failed to load. Aborting pipeline.")
+            return None
+
+        cache_key = (self.dataset_hash, n_splits, apply_smote, random_state)
+        if cache_key in _cv_folds_cache:
+            return _cv_folds_cache[cache_key]
+
+        disk_key = self._cache_key(use_cache, 'cv_folds', n_splits=n_splits, apply_smote=apply_smote,
+                                   random_state=random_state)
+        cached = self._load_cached(disk_key)
+        if cached is not None:
+            arrays, _ = cached
+            folds = [
+                tuple(arrays[f"fold{fold_index}_{name}"] for name in CV_FOLD_ARRAYS)
+                for fold_index in range(n_splits)
+            ]
+            _cv_folds_cache[cache_key] = folds
+            return folds
+
+        df = self.load_cleveland_dataset()
+        if df.empty:
+            get_reporter().warning("Dataset is empty or failed to load. Aborting pipeline.")
+            return None
+
+        X, y = self.preprocess_data(df)
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+
+        folds = []
+        for train_index, val_index in splitter.split(X, y):
+            X_train, y_train = X[train_index], y[train_index]
+            if apply_smote:
+                X_train, y_train = self.apply_smote(X_train, y_train)
+
+            fold_scaler = StandardScaler()
+            X_train_scaled = fold_scaler.fit_transform(X_train)
+            X_val_scaled = fold_scaler.transform(X[val_index])
+
+            folds.append((X_train_scaled, X_val_scaled, y_train, y[val_index]))
+
+        _cv_folds_cache[cache_key] = folds
+        self._save_cached(disk_key, {
+            f"fold{fold_index}_{name}": array
+            for fold_index, fold in enumerate(folds)
+            for name, array in zip(CV_FOLD_ARRAYS, fold)
+        })
+        return folds
+
+    def load_original_split(self, test_size=0.2):
+        """Reproduce load_and_preprocess_data's train/test split with the already fitted state
+
+        Nothing is refitted and SMOTE is not applied, so a preprocessor loaded
+        from an artifact gets back exactly the test rows its models were scored on.
+        """
+        df = self.load_cleveland_dataset()
+        if df.empty:
+            return None
+
+        X, y = self.transform_labeled_data(df)
+        return train_test_split(X, y, test_size=test_size, random_state=42, stratify=y)
+
+    def _fill_missing_by_position(self, input_array):
+        """Replace NaNs in an N x features array with the fitted training medians, column by column"""
+        missing = np.isnan(input_array)
+        if not missing.any():
+            return input_array
+
+        if len(self.feature_names) != input_array.shape[1] or not all(f in self.medians for f in self.feature_names):
+            raise ValueError("Input has missing values and no fitted median for every column to fill them with")
+
+        medians = np.array([self.medians[feature] for feature in self.feature_names], dtype=input_array.dtype)
+        return np.where(missing, medians, input_array)
+
     def prepare_input_for_prediction(self, input_data):
         """Prepare user input for model prediction"""
-        input_array = np.array(input_data).reshape(1, -1)
-        input_scaled = self.scaler.transform(input_array)
+        input_array = np.array(input_data, dtype=np.float64).reshape(1, -1)
+        input_scaled = self.scaler.transform(self._fill_missing_by_position(input_array))
+        return input_scaled
+
+    def prepare_batch_for_prediction(self, input_data):
+        """Prepare an N x 13 array or DataFrame of patients for model prediction"""
+        if isinstance(input_data, pd.DataFrame):
+            # Columns are matched by name; guessing by position could silently misalign features
+            if not self.feature_names:
+                raise ValueError("Preprocessor has no fitted feature names to select DataFrame columns by")
+            missing = [feature for feature in self.feature_names if feature not in input_data.columns]
+            if missing:
+                raise ValueError(f"Input is missing feature columns: {', '.join(missing)}")
+            # Same median fill and encoding as training, so gaps never reach the scaler as NaN
+            input_data = self._encode_features(input_data)
+
+        input_array = np.asarray(input_data, dtype=np.float32)
+        if input_array.ndim == 1:
+            input_array = input_array.reshape(1, -1)
+
+        # Arrays have no column names, so gaps are filled by position like _encode_features does by name
+        input_scaled = self.scaler.transform(self._fill_missing_by_position(input_array))
         return input_scaled
 
     def get_feature_names(self):
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+import numpy as np
+
+# Bump when the layout of a cache entry or the preprocessing it stores changes
+DATASET_CACHE_FORMAT_VERSION = 2
+
+DEFAULT_DATASET_CACHE_DIR = Path(__file__).resolve().parent.parent / 'dataset_cache'
+METADATA_FILENAME = 'metadata.json'
+
+
+def make_cache_key(dataset_hash, **params):
+    """Fingerprint a source CSV's contents together with the preprocessing parameters applied to it"""
+    payload = json.dumps(
+        {'format_version': DATASET_CACHE_FORMAT_VERSION, 'dataset_hash': dataset_hash, 'params': params},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+
+class DatasetCache:
+    """Directory of preprocessed arrays saved as .npy files, one entry per cache key
+
+    Entries are memory-mapped on load, so a hit costs a few file opens instead
+    of parsing, resampling and scaling. Like artifact versions, an entry is
+    written under a temporary name and renamed into place once complete.
+    """
+
+    def __init__(self, root_dir=DEFAULT_DATASET_CACHE_DIR):
+        self.root_dir = Path(root_dir)
+
+    def entry_dir(self, key):
+        return self.root_dir / key
+
+    def load(self, key):
+        """Return (arrays, metadata) for key with read-only memory-mapped arrays, or None on a miss"""
+        entry_dir = self.entry_dir(key)
+        metadata_path = entry_dir / METADATA_FILENAME
+        if not metadata_path.exists():
+            return None
+
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+
+        arrays = {name: np.load(entry_dir / f"{name}.npy", mmap_mode='r') for name in metadata['arrays']}
+        return arrays, metadata
+
+    def save(self, key, arrays, metadata=None):
+        """Write arrays (name -> ndarray) and JSON metadata as the entry for key"""
+        staging_dir = self.root_dir / f".staging-{key}-{os.getpid()}"
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+        staging_dir.mkdir(parents=True)
+
+        for name, array in arrays.items():
+            np.save(staging_dir / f"{name}.npy", np.ascontiguousarray(array))
+
+        # The metadata is written last and marks the entry as complete
+        with open(staging_dir / METADATA_FILENAME, 'w') as f:
+            json.dump({**(metadata or {}), 'arrays': list(arrays)}, f)
+
+        entry_dir = self.entry_dir(key)
+        try:
+            os.replace(staging_dir, entry_dir)
+        except OSError:
+            # Another process completed the same entry first; both hold identical data
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        return entry_dir
+
+    def clear(self):
+        """Delete every cached entry"""
+        if self.root_dir.exists():
+            shutil.rmtree(self.root_dir)
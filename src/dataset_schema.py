@@ -0,0 +1,87 @@
+import pandas as pd
+
+# Cleveland heart disease columns: compact dtype and the inclusive range of valid values.
+# Categorical codes follow dataset.csv (cp 0-3, restecg 0-2, slope 0-2, ca 0-4, thal 0-3).
+HEART_SCHEMA = {
+    'age': ('float32', 0, 120),
+    'sex': ('int8', 0, 1),
+    'cp': ('int8', 0, 3),
+    'trestbps': ('float32', 0, 300),
+    'chol': ('float32', 0, 1000),
+    'fbs': ('int8', 0, 1),
+    'restecg': ('int8', 0, 2),
+    'thalach': ('float32', 0, 250),
+    'exang': ('int8', 0, 1),
+    'oldpeak': ('float32', -10, 10),
+    'slope': ('int8', 0, 2),
+    'ca': ('int8', 0, 4),
+    'thal': ('int8', 0, 3),
+    'target': ('int8', 0, 1)
+}
+
+
+def schema_dtypes(allow_missing=False):
+    """Column -> dtype map for pd.read_csv
+
+    int8 cannot represent NaN, so allow_missing=True reads integer feature
+    columns as float32 instead; the label stays int8 and must be complete.
+    """
+    return {
+        column: 'float32' if allow_missing and dtype == 'int8' and column != 'target' else dtype
+        for column, (dtype, _, _) in HEART_SCHEMA.items()
+    }
+
+
+def validate_heart_frame(df, labeled=True):
+    """Raise ValueError naming every missing schema column and every column with values outside its valid range
+
+    Unlabeled frames, such as records sent for scoring, may omit the target column.
+    """
+    missing = [column for column in HEART_SCHEMA
+               if column not in df.columns and (labeled or column != 'target')]
+    problems = [f"missing columns {missing}"] if missing else []
+    for column, (_, low, high) in HEART_SCHEMA.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        out_of_range = int(((values < low) | (values > high)).sum())
+        if out_of_range:
+            problems.append(f"{column}: {out_of_range} values outside [{low}, {high}]")
+
+    if problems:
+        raise ValueError("Invalid heart data - " + "; ".join(problems))
+    return df
+
+
+def _validated_chunks(reader, labeled):
+    with reader:
+        for chunk in reader:
+            yield validate_heart_frame(chunk, labeled)
+
+
+def read_heart_csv(filepath_or_buffer, chunksize=None, allow_missing=False, labeled=True, **read_csv_kwargs):
+    """Parse heart data with the C engine straight into the compact schema dtypes and range-check it
+
+    Schema columns are read as int8 or float32 rather than inferred as
+    int64/float64; other columns, such as patient ids, are inferred as usual.
+    A whole-file read retries with float32 integer columns if the file has
+    gaps. Chunked reads cannot retry mid-stream, so pass allow_missing=True
+    when gaps are expected. Pass labeled=False for records without a target
+    column. With chunksize, returns an iterator of validated chunks.
+    """
+    if chunksize is not None:
+        reader = pd.read_csv(filepath_or_buffer, engine='c', dtype=schema_dtypes(allow_missing),
+                             chunksize=chunksize, **read_csv_kwargs)
+        return _validated_chunks(reader, labeled)
+
+    try:
+        df = pd.read_csv(filepath_or_buffer, engine='c', dtype=schema_dtypes(allow_missing), **read_csv_kwargs)
+    except ValueError:
+        if allow_missing:
+            raise
+        # Integer columns with missing values; rewind uploads before the second parse
+        if hasattr(filepath_or_buffer, 'seek'):
+            filepath_or_buffer.seek(0)
+        df = pd.read_csv(filepath_or_buffer, engine='c', dtype=schema_dtypes(allow_missing=True), **read_csv_kwargs)
+
+    return validate_heart_frame(df, labeled)
@@ -0,0 +1,60 @@
+import numpy as np
+from src.ensemble_engine import FusedEnsemble
+
+DISTILLED_MODEL_NAME = 'Ensemble-Distilled'
+# Models trained to imitate the others; they never take part in the ensemble average
+DERIVED_MODEL_NAMES = (DISTILLED_MODEL_NAME,)
+# Registry families the published Ensemble averages over: the four neural
+# networks. Classical baselines are reported alongside but not averaged in.
+ENSEMBLE_MEMBER_FAMILIES = ('network',)
+
+DEFAULT_SYNTHETIC_ROWS = 4000
+DEFAULT_NOISE_SCALE = 0.1
+SOFT_LABEL_BATCH_SIZE = 4096
+
+
+def get_ensemble_member_names(model_names, families=ENSEMBLE_MEMBER_FAMILIES):
+    """Names the ensemble averages over: registered models of the given families, in order"""
+    # The registry imports this module for DISTILLED_MODEL_NAME
+    from src.model_registry import get_model_spec
+
+    return [
+        name for name in model_names
+        if get_model_spec(name) is not None and get_model_spec(name).family in families
+    ]
+
+
+def get_ensemble_members(models, families=ENSEMBLE_MEMBER_FAMILIES):
+    """Return the models the ensemble averages over: registered models of the given families
+
+    Works on model mappings and on per-model outputs alike, and only reads
+    the values of members.
+    """
+    return {name: models[name] for name in get_ensemble_member_names(models, families)}
+
+
+def ensemble_soft_labels(models, X, batch_size=SOFT_LABEL_BATCH_SIZE):
+    """Average positive-class probability of the ensemble members for each row of X"""
+    outputs = FusedEnsemble(get_ensemble_members(models)).predict(X, batch_size=batch_size)
+    # Last column is the positive class for both sigmoid and softmax heads
+    return np.mean([np.asarray(output)[:, -1] for output in outputs.values()], axis=0)
+
+
+def make_transfer_set(X, n_synthetic=DEFAULT_SYNTHETIC_ROWS, noise_scale=DEFAULT_NOISE_SCALE, random_state=42):
+    """Training rows plus perturbed and interpolated synthetic rows for the student to imitate
+
+    Half of the synthetic rows add Gaussian noise (in standardized units) to a
+    training row; the other half interpolate between two random training rows,
+    which probes the teachers between the observed patients.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    rng = np.random.default_rng(random_state)
+    n_noisy = n_synthetic // 2
+    n_mixed = n_synthetic - n_noisy
+
+    noisy = X[rng.integers(len(X), size=n_noisy)] + rng.normal(0.0, noise_scale, (n_noisy, X.shape[1]))
+
+    weights = rng.uniform(0.0, 1.0, (n_mixed, 1))
+    mixed = weights * X[rng.integers(len(X), size=n_mixed)] + (1 - weights) * X[rng.integers(len(X), size=n_mixed)]
+
+    return np.vstack([X, noisy, mixed]).astype(np.float32)
@@ -0,0 +1,119 @@
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+from src.inference_backend import predict_fast, is_keras_model
+
+# Distinct model sets whose fused graphs stay built; an app serves one or two
+DEFAULT_ENGINE_CACHE_SIZE = 4
+
+_fused_ensembles = OrderedDict()
+_fused_ensembles_lock = threading.Lock()
+
+
+class FusedEnsemble:
+    """Run every trained model in one multi-output Keras graph
+
+    Model handles that are not Keras models (for example NumPy or interpreter
+    backends) cannot join the graph and are called directly on the same input.
+
+    Each Keras member is copied into the graph from its weights, one at a
+    time, so the graph does not share layers with the handles it came from.
+    With a lazily loaded, bounded model mapping every member is loaded once,
+    and the cache stays free to evict the handles afterwards.
+    """
+
+    def __init__(self, models, model_names=None):
+        # model_names restricts the graph to some of the models, e.g. the ensemble members
+        self.model_names = list(model_names if model_names is not None else models.keys())
+        self.keras_model_names = []
+        self.other_models = {}
+        self.fused_model = None
+
+        inputs = None
+        outputs = []
+        for model_name in self.model_names:
+            model = models[model_name]
+            if not is_keras_model(model):
+                self.other_models[model_name] = model
+                continue
+
+            # Only reached when Keras models are present, so TensorFlow is already loaded
+            from tensorflow import keras
+
+            if inputs is None:
+                inputs = keras.Input(shape=model.input_shape[1:], name='ensemble_input')
+            outputs.append(self._copy_model(model, model_name)(inputs))
+            self.keras_model_names.append(model_name)
+
+        if outputs:
+            self.fused_model = keras.Model(inputs=inputs, outputs=outputs, name='fused_ensemble')
+
+    @staticmethod
+    def _copy_model(model, model_name):
+        """Rebuild a Keras model with fresh layers holding the same weights
+
+        Separately loaded models often share a default name such as
+        'sequential', so the copy is named after its registry entry instead.
+        """
+        config = {**model.get_config(), 'name': model_name.lower().replace('-', '_')}
+        copy = type(model).from_config(config)
+        copy.set_weights(model.get_weights())
+        return copy
+
+    def predict(self, X, batch_size=None):
+        """Return raw outputs of every model for X from a single forward pass"""
+        outputs = {}
+
+        if self.fused_model is not None:
+            fused_outputs = predict_fast(self.fused_model, X, batch_size=batch_size)
+
+            # A single-output graph may return an array instead of a list
+            if not isinstance(fused_outputs, (list, tuple)):
+                fused_outputs = [fused_outputs]
+
+            outputs.update(zip(self.keras_model_names, fused_outputs))
+
+        for model_name, model in self.other_models.items():
+            outputs[model_name] = predict_fast(model, X, batch_size=batch_size)
+
+        return {model_name: np.asarray(outputs[model_name]) for model_name in self.model_names}
+
+
+def get_fused_ensemble(models, model_names=None):
+    """Get the process-wide fused ensemble for a set of models, building it on first use
+
+    model_names restricts the engine to those models; each selection gets
+    its own cached engine.
+    Copying the members and tracing the graph takes seconds, so engines are
+    shared across predictors (the app builds one per rerun). Lazily loaded
+    models are keyed by file, which never loads them; other handles by
+    identity, checked through weak references so a recycled id never
+    returns a stale engine.
+    """
+    identity = getattr(models, 'identity', None)
+    model_names = list(model_names if model_names is not None else models.keys())
+    key, handle_refs = [], []
+    for model_name in model_names:
+        if identity is not None and isinstance(identity(model_name), str):
+            key.append((model_name, identity(model_name)))
+        else:
+            model = models[model_name]
+            key.append((model_name, id(model)))
+            handle_refs.append((model_name, weakref.ref(model)))
+    key = tuple(key)
+
+    with _fused_ensembles_lock:
+        cached = _fused_ensembles.get(key)
+        if cached is not None and all(ref() is models[model_name] for model_name, ref in cached[1]):
+            _fused_ensembles.move_to_end(key)
+            return cached[0]
+
+    engine = FusedEnsemble(models, model_names)
+
+    with _fused_ensembles_lock:
+        _fused_ensembles[key] = (engine, handle_refs)
+        _fused_ensembles.move_to_end(key)
+        while len(_fused_ensembles) > DEFAULT_ENGINE_CACHE_SIZE:
+            _fused_ensembles.popitem(last=False)
+    return engine
@@ -0,0 +1,279 @@
+import copy
+import hashlib
+import json
+import threading
+import weakref
+import numpy as np
+from scipy.special import comb
+from lime.lime_tabular import LimeTabularExplainer
+from src.inference_backend import is_keras_model
+
+DEFAULT_LIME_SAMPLES = 5000
+LIME_RANDOM_SEED = 42
+DEFAULT_PREDICTION_BATCH_SIZE = 1024
+
+_lime_explainers = {}
+_lime_explainers_lock = threading.Lock()
+
+
+def normalize_training_stats(stats):
+    """Restore integer feature keys after a JSON round trip"""
+    return {
+        key: {int(feature): value for feature, value in per_feature.items()}
+        for key, per_feature in stats.items()
+    }
+
+
+def _stats_fingerprint(stats, feature_names):
+    payload = json.dumps([stats, list(feature_names)], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def reseed_lime_explainer(explainer, seed=LIME_RANDOM_SEED):
+    """Shallow copy of a LIME explainer drawing perturbations from a fresh RandomState
+
+    The explainer, its discretizer and its LimeBase share one RandomState, so
+    a cached explainer would otherwise give each request different samples
+    depending on how many explanations came before it.
+    """
+    explainer = copy.copy(explainer)
+    explainer.random_state = np.random.RandomState(seed)
+    explainer.base = copy.copy(explainer.base)
+    explainer.base.random_state = explainer.random_state
+    if explainer.discretizer is not None:
+        explainer.discretizer = copy.copy(explainer.discretizer)
+        explainer.discretizer.random_state = explainer.random_state
+    return explainer
+
+
+def get_lime_explainer(training_stats, feature_names):
+    """Build a LIME explainer from persisted training statistics, once per process
+
+    Each call returns a freshly seeded copy, so explanations do not depend on
+    request order and match an explainer fitted on the full training matrix
+    with random_state=42.
+    """
+    training_stats = normalize_training_stats(training_stats)
+    cache_key = _stats_fingerprint(training_stats, feature_names)
+
+    with _lime_explainers_lock:
+        if cache_key not in _lime_explainers:
+            n_features = len(feature_names)
+
+            # LIME still wants a data matrix; with stats supplied it only reads its
+            # shape and per-feature extremes, so the quartile summary rows suffice
+            summary_rows = np.array([
+                training_stats['quantiles'][feature] for feature in range(n_features)
+            ]).T
+
+            _lime_explainers[cache_key] = LimeTabularExplainer(
+                summary_rows,
+                feature_names=feature_names,
+                class_names=['Low Risk', 'High Risk'],
+                mode='classification',
+                training_data_stats=training_stats,
+                random_state=LIME_RANDOM_SEED
+            )
+
+        return reseed_lime_explainer(_lime_explainers[cache_key])
+
+
+class AttributionExplanation:
+    """Per-feature attributions exposing the as_list() interface of a LIME explanation"""
+
+    def __init__(self, feature_labels, attributions, method, num_features=10, base_value=None, prediction=None):
+        self.feature_labels = list(feature_labels)
+        self.attributions = np.asarray(attributions, dtype=np.float64)
+        self.method = method
+        self.num_features = num_features
+        self.base_value = base_value
+        self.prediction = prediction
+
+    def as_list(self):
+        """Return (feature, importance) pairs for the strongest attributions"""
+        order = np.argsort(-np.abs(self.attributions))[:self.num_features]
+        return [(self.feature_labels[i], float(self.attributions[i])) for i in order]
+
+
+def format_feature_labels(feature_names, input_raw):
+    """Label attributions with the patient's own values, e.g. 'chol = 233'"""
+    if input_raw is None:
+        return list(feature_names)
+    values = np.asarray(input_raw, dtype=np.float64).reshape(-1)
+    return [f"{name} = {value:g}" for name, value in zip(feature_names, values)]
+
+
+DEFAULT_IG_STEPS = 32
+
+_gradient_explainers = weakref.WeakKeyDictionary()
+
+
+class IntegratedGradientsExplainer:
+    """Integrated gradients for a differentiable Keras model from one batched gradient call
+
+    The baseline defaults to the all-zeros row, which is the training mean in
+    the standardized feature space the models see.
+    """
+
+    def __init__(self, model, steps=DEFAULT_IG_STEPS):
+        import tensorflow as tf
+
+        self._tf = tf
+        # Weak, so the per-model explainer cache never keeps a discarded model alive
+        self._model_ref = weakref.ref(model)
+        self.steps = steps
+        model_ref = self._model_ref
+
+        @tf.function(reduce_retracing=True)
+        def path_gradients(path):
+            with tf.GradientTape() as tape:
+                tape.watch(path)
+                # Last column is the positive class for both sigmoid and softmax heads
+                positive_probability = model_ref()(path, training=False)[:, -1]
+            return positive_probability, tape.gradient(positive_probability, path)
+
+        self._path_gradients = path_gradients
+
+    @property
+    def model(self):
+        model = self._model_ref()
+        if model is None:
+            raise ReferenceError("The model behind this explainer has been garbage-collected")
+        return model
+
+    def attribute(self, input_scaled, baseline=None):
+        """Return attributions, the baseline output and the prediction for one scaled row"""
+        x = np.asarray(input_scaled, dtype=np.float32).reshape(-1)
+        baseline = np.zeros_like(x) if baseline is None else np.asarray(baseline, dtype=np.float32)
+
+        alphas = np.linspace(0.0, 1.0, self.steps + 1, dtype=np.float32)[:, None]
+        path = baseline + alphas * (x - baseline)
+
+        outputs, gradients = self._path_gradients(self._tf.constant(path))
+        outputs, gradients = outputs.numpy(), gradients.numpy()
+
+        # Trapezoidal rule over the straight-line path
+        average_gradients = ((gradients[:-1] + gradients[1:]) / 2.0).mean(axis=0)
+        attributions = (x - baseline) * average_gradients
+
+        return attributions, float(outputs[0]), float(outputs[-1])
+
+    def explain(self, input_scaled, feature_names, input_raw=None, num_features=10):
+        """Explain one scaled row as an AttributionExplanation"""
+        attributions, base_value, prediction = self.attribute(input_scaled)
+        return AttributionExplanation(
+            format_feature_labels(feature_names, input_raw), attributions, 'gradient',
+            num_features=num_features, base_value=base_value, prediction=prediction
+        )
+
+
+def get_gradient_explainer(model, steps=DEFAULT_IG_STEPS):
+    """Get the cached integrated-gradients explainer for a Keras model"""
+    if not is_keras_model(model):
+        raise ValueError("Gradient explanations need a differentiable Keras model")
+
+    explainer = _gradient_explainers.get(model)
+    if explainer is None or explainer.steps != steps:
+        explainer = IntegratedGradientsExplainer(model, steps)
+        _gradient_explainers[model] = explainer
+    return explainer
+
+
+DEFAULT_SHAP_COALITIONS = 2048
+DEFAULT_SHAP_BATCH_SIZE = 4096
+
+
+def _shapley_kernel_weights(coalition_sizes, n_features):
+    """Kernel SHAP weight of a coalition depends only on its size"""
+    sizes = np.asarray(coalition_sizes)
+    return (n_features - 1) / (comb(n_features, sizes) * sizes * (n_features - sizes))
+
+
+def build_coalitions(n_features, max_coalitions=DEFAULT_SHAP_COALITIONS, random_state=42):
+    """Return coalition masks and their regression weights
+
+    All 2^M - 2 proper coalitions are enumerated when that fits the budget, which
+    gives exact Shapley values. Otherwise coalitions are drawn in complementary
+    pairs with sizes sampled in proportion to their total kernel weight.
+    """
+    if 2 ** n_features - 2 <= max_coalitions:
+        codes = np.arange(1, 2 ** n_features - 1)
+        masks = ((codes[:, None] >> np.arange(n_features)) & 1).astype(bool)
+        return masks, _shapley_kernel_weights(masks.sum(axis=1), n_features)
+
+    rng = np.random.default_rng(random_state)
+    sizes = np.arange(1, n_features)
+    size_probabilities = (n_features - 1) / (sizes * (n_features - sizes))
+    size_probabilities /= size_probabilities.sum()
+
+    n_pairs = max_coalitions // 2
+    drawn_sizes = rng.choice(sizes, size=n_pairs, p=size_probabilities)
+    masks = np.zeros((n_pairs, n_features), dtype=bool)
+    for row, size in enumerate(drawn_sizes):
+        masks[row, rng.choice(n_features, size=size, replace=False)] = True
+
+    # Sampling already follows the kernel, so every draw carries equal weight
+    masks = np.vstack([masks, ~masks])
+    return masks, np.ones(len(masks))
+
+
+class KernelShapExplainer:
+    """Kernel SHAP over a k-means summarized background set
+
+    The model is evaluated on every coalition/background pair in one batched
+    call, so the cost is fixed at n_coalitions * n_background rows. The
+    efficiency constraint is enforced exactly: attributions always sum to the
+    prediction minus the expected background prediction.
+    """
+
+    def __init__(self, predict_function, background, background_weights=None,
+                 max_coalitions=DEFAULT_SHAP_COALITIONS):
+        self.predict_function = predict_function
+        self.background = np.asarray(background, dtype=np.float32)
+        n_background, self.n_features = self.background.shape
+
+        if background_weights is None:
+            background_weights = np.full(n_background, 1.0 / n_background)
+        self.background_weights = np.asarray(background_weights, dtype=np.float64)
+        self.background_weights /= self.background_weights.sum()
+
+        self.masks, self.kernel_weights = build_coalitions(self.n_features, max_coalitions)
+
+    def attribute(self, input_scaled):
+        """Return Shapley values, the expected background output and the prediction"""
+        x = np.asarray(input_scaled, dtype=np.float32).reshape(-1)
+        n_background = len(self.background)
+
+        # Row (c, k): features in coalition c from x, the rest from background row k
+        synthetic = np.where(self.masks[:, None, :], x, self.background[None, :, :])
+        synthetic = synthetic.reshape(-1, self.n_features)
+
+        outputs = np.asarray(
+            self.predict_function(np.vstack([synthetic, self.background, x[None, :]])), dtype=np.float64
+        ).reshape(-1)
+        coalition_outputs = outputs[:len(synthetic)].reshape(len(self.masks), n_background)
+        base_value = float(outputs[len(synthetic):-1] @ self.background_weights)
+        prediction = float(outputs[-1])
+
+        coalition_values = coalition_outputs @ self.background_weights
+
+        # Weighted least squares with sum(phi) == prediction - base_value,
+        # solved by eliminating the last feature
+        total = prediction - base_value
+        masks = self.masks.astype(np.float64)
+        target = coalition_values - base_value - masks[:, -1] * total
+        design = masks[:, :-1] - masks[:, [-1]]
+        weighted_design = design * self.kernel_weights[:, None]
+
+        phi_head = np.linalg.lstsq(weighted_design.T @ design, weighted_design.T @ target, rcond=None)[0]
+        attributions = np.append(phi_head, total - phi_head.sum())
+
+        return attributions, base_value, prediction
+
+    def explain(self, input_scaled, feature_names, input_raw=None, num_features=10):
+        """Explain one scaled row as an AttributionExplanation"""
+        attributions, base_value, prediction = self.attribute(input_scaled)
+        return AttributionExplanation(
+            format_feature_labels(feature_names, input_raw), attributions, 'shap',
+            num_features=num_features, base_value=base_value, prediction=prediction
+        )
@@ -0,0 +1,161 @@
+import os
+import tempfile
+import numpy as np
+from sklearn.model_selection import train_test_split
+from imblearn.over_sampling import SMOTE
+from src.reporting import get_reporter
+from src.model_trainer import ModelTrainer, DEFAULT_BATCH_SIZE, spawn_worker_pool
+
+LEARNING_RATES = [3e-4, 1e-3, 3e-3]
+BATCH_SIZES = [16, 32, 64]
+
+# Candidate values per builder argument; learning_rate and batch_size go to compile/fit
+SEARCH_SPACES = {
+    'CNN': {
+        'conv_filters': [16, 32, 64],
+        'dense_units': [64, 128, 256],
+        'dropout_rate': [0.3, 0.5],
+        'learning_rate': LEARNING_RATES,
+        'batch_size': BATCH_SIZES
+    },
+    'LSTM': {
+        'lstm_units': [32, 64, 128],
+        'dense_units': [32, 64, 128],
+        'dropout_rate': [0.2, 0.3, 0.4],
+        'learning_rate': LEARNING_RATES,
+        'batch_size': BATCH_SIZES
+    },
+    'CNN-LSTM': {
+        'conv_filters': [16, 32, 64],
+        'lstm_units': [24, 50, 80],
+        'dense_units': [32, 64, 128],
+        'learning_rate': LEARNING_RATES,
+        'batch_size': BATCH_SIZES
+    },
+    'DNN': {
+        'dense_units': [64, 128, 256, 512],
+        'dropout_rate': [0.2, 0.4, 0.5],
+        'learning_rate': LEARNING_RATES,
+        'batch_size': BATCH_SIZES
+    }
+}
+
+
+def sample_configs(search_space, n_trials, seed=42):
+    """Draw distinct configurations from a search space of candidate lists"""
+    rng = np.random.default_rng(seed)
+    n_trials = min(n_trials, int(np.prod([len(values) for values in search_space.values()])))
+
+    configs, seen = [], set()
+    while len(configs) < n_trials:
+        config = {name: values[rng.integers(len(values))] for name, values in search_space.items()}
+        key = tuple(sorted(config.items()))
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+    return configs
+
+
+def _run_trial_worker(model_name, config, X_train, y_train, X_val, y_val, num_classes,
+                      epochs, initial_epoch, checkpoint_path):
+    """Train one trial up to `epochs` total epochs, resuming from its checkpoint, and return its best val_loss"""
+    from tensorflow import keras
+
+    trainer = ModelTrainer()
+    if initial_epoch:
+        model = keras.models.load_model(checkpoint_path)
+    else:
+        model = trainer.build_model(model_name, X_train.shape[1:], num_classes, config)
+
+    history = trainer.train_model(
+        model, X_train, y_train, X_val, y_val, epochs=epochs,
+        batch_size=config.get('batch_size', DEFAULT_BATCH_SIZE), initial_epoch=initial_epoch
+    )
+    model.save(checkpoint_path)
+
+    return float(min(history.history['val_loss']))
+
+
+def split_for_tuning(X_train, y_train, validation_size=0.2, apply_smote=True, seed=42):
+    """Hold out validation rows from a training split, then oversample only the rest
+
+    X_train must not be oversampled yet: SMOTE interpolates between
+    neighbours, so resampling before the split would leave synthetic copies
+    of validation patients among the rows the trials fit on.
+    """
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=validation_size, random_state=seed, stratify=y_train
+    )
+    if apply_smote:
+        X_fit, y_fit = SMOTE(random_state=seed).fit_resample(X_fit, y_fit)
+    return X_fit, X_val, y_fit, y_val
+
+
+def tune_hyperparameters(X_train, y_train, model_names=None, n_trials=9, min_epochs=3, eta=3,
+                         validation_size=0.2, max_workers=None, intra_op_threads=None, seed=42,
+                         apply_smote=True):
+    """Successive-halving search over each builder's search space
+
+    Every rung trains the surviving trials in parallel worker processes up to
+    the rung's epoch budget, resuming from the previous rung's checkpoint, and
+    keeps the best 1/eta by validation loss, so poor configurations stop after
+    min_epochs. Pass the training split before SMOTE, for example from
+    DataPreprocessor.load_original_split(); validation rows are carved out of
+    it first and only the remainder is oversampled (see split_for_tuning),
+    leaving the test split untouched. Returns the winning config per model
+    and a log of every trial.
+    """
+    X_fit, X_val, y_fit, y_val = split_for_tuning(X_train, y_train, validation_size, apply_smote, seed)
+    model_names = model_names or list(SEARCH_SPACES)
+    num_classes = len(np.unique(y_train))
+
+    max_workers = max_workers or max(1, min(os.cpu_count() or 1, n_trials))
+    intra_op_threads = intra_op_threads or max(1, (os.cpu_count() or 1) // max_workers)
+
+    best_configs = {}
+    trial_log = []
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir, \
+            spawn_worker_pool(max_workers, intra_op_threads) as executor:
+        for model_name in model_names:
+            slug = model_name.lower().replace('-', '_')
+            trials = [
+                {
+                    'model': model_name,
+                    'trial': index,
+                    'config': config,
+                    'epochs': 0,
+                    'val_loss': None,
+                    'checkpoint': os.path.join(checkpoint_dir, f"{slug}_{index}.keras")
+                }
+                for index, config in enumerate(sample_configs(SEARCH_SPACES[model_name], n_trials, seed))
+            ]
+
+            survivors = trials
+            rung_epochs = min_epochs
+            while True:
+                get_reporter().write(f"Tuning {model_name}: {len(survivors)} trials to {rung_epochs} epochs...")
+
+                futures = {
+                    executor.submit(_run_trial_worker, model_name, trial['config'], X_fit, y_fit, X_val, y_val,
+                                    num_classes, rung_epochs, trial['epochs'], trial['checkpoint']): trial
+                    for trial in survivors
+                }
+                for future, trial in futures.items():
+                    trial['val_loss'] = future.result()
+                    trial['epochs'] = rung_epochs
+
+                survivors = sorted(survivors, key=lambda trial: trial['val_loss'])[:max(1, len(survivors) // eta)]
+                # The last survivor needs no further rung to be picked
+                if len(survivors) == 1:
+                    break
+                rung_epochs *= eta
+
+            best_configs[model_name] = survivors[0]['config']
+            trial_log.extend(
+                {key: value for key, value in trial.items() if key != 'checkpoint'} for trial in trials
+            )
+
+            get_reporter().write(f"✅ {model_name} - best val_loss {survivors[0]['val_loss']:.4f} with {survivors[0]['config']}")
+
+    return best_configs, trial_log
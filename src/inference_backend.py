@@ -0,0 +1,126 @@
+import sys
+import time
+import weakref
+import numpy as np
+import pandas as pd
+
+# Batches up to this many rows skip model.predict and its per-call setup
+SMALL_BATCH_THRESHOLD = 10
+
+_compiled_predictors = weakref.WeakKeyDictionary()
+
+
+def is_keras_model(model):
+    """Check for a Keras model without importing TensorFlow for other model handles"""
+    keras_module = sys.modules.get('keras')
+    return keras_module is not None and isinstance(model, keras_module.Model)
+
+
+class CompiledPredictor:
+    """Traced, shape-specialized inference callable around a Keras model
+
+    With jit_compile=True each traced graph is also compiled by XLA, which fuses
+    the many small ops of these models into a few kernels. Only a weak
+    reference to the model is held, so caching a predictor per model never
+    keeps a discarded model alive.
+    """
+
+    def __init__(self, model, small_batch_threshold=SMALL_BATCH_THRESHOLD, jit_compile=False):
+        import tensorflow as tf
+
+        self._tf = tf
+        self._model_ref = weakref.ref(model)
+        self.small_batch_threshold = small_batch_threshold
+        self.jit_compile = jit_compile
+        model_ref = self._model_ref
+        self._traced_call = tf.function(lambda x: model_ref()(x, training=False), jit_compile=jit_compile)
+        self._concrete_functions = {}
+
+    @property
+    def model(self):
+        model = self._model_ref()
+        if model is None:
+            raise ReferenceError("The model behind this predictor has been garbage-collected")
+        return model
+
+    def _get_concrete_function(self, input_shape):
+        """Trace the model once per input shape and reuse the graph afterwards"""
+        if input_shape not in self._concrete_functions:
+            input_spec = self._tf.TensorSpec(input_shape, self._tf.float32)
+            self._concrete_functions[input_shape] = self._traced_call.get_concrete_function(input_spec)
+        return self._concrete_functions[input_shape]
+
+    def warmup(self, batch_sizes=(1,)):
+        """Trace the small-batch graphs ahead of the first request"""
+        feature_shape = tuple(self.model.input_shape[1:])
+        for batch_size in batch_sizes:
+            self.predict(np.zeros((batch_size,) + feature_shape, dtype=np.float32))
+
+    def predict(self, X, verbose=0, batch_size=None):
+        """Predict with the traced graph for small batches and model.predict otherwise"""
+        X = np.asarray(X, dtype=np.float32)
+
+        if len(X) > self.small_batch_threshold:
+            return self.model.predict(X, batch_size=batch_size, verbose=verbose)
+
+        outputs = self._get_concrete_function(X.shape)(self._tf.constant(X))
+
+        # Match model.predict: an array for one output, a list for several
+        if isinstance(outputs, (list, tuple)):
+            return [np.asarray(output) for output in outputs]
+        return np.asarray(outputs)
+
+
+def get_compiled_predictor(model):
+    """Get the cached compiled predictor for a Keras model"""
+    if model not in _compiled_predictors:
+        # Models compiled with jit_compile=True get an XLA inference graph as well
+        _compiled_predictors[model] = CompiledPredictor(model, jit_compile=getattr(model, 'jit_compile', False) is True)
+    return _compiled_predictors[model]
+
+
+def predict_fast(model, X, batch_size=None):
+    """Predict with the lowest-overhead path available for the model"""
+    if is_keras_model(model):
+        return get_compiled_predictor(model).predict(X, batch_size=batch_size)
+    return model.predict(X)
+
+
+def median_latency_ms(predict_function, X, n_calls=50):
+    """Return the median latency of predict_function(X) in milliseconds"""
+    timings = []
+    for _ in range(n_calls):
+        start = time.perf_counter()
+        predict_function(X)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def benchmark_inference_latency(models, n_features, batch_sizes=(1, 10, 256), n_calls=50):
+    """Compare per-call latency of model.predict and the compiled path for each model"""
+    rng = np.random.default_rng(42)
+    rows = []
+
+    for model_name, model in models.items():
+        compiled = CompiledPredictor(model)
+
+        for batch_size in batch_sizes:
+            X = rng.standard_normal((batch_size, n_features)).astype(np.float32)
+
+            # Warm both paths so tracing is not counted as latency
+            model.predict(X, verbose=0)
+            compiled.predict(X)
+
+            keras_ms = median_latency_ms(lambda data: model.predict(data, verbose=0), X, n_calls)
+            compiled_ms = median_latency_ms(compiled.predict, X, n_calls)
+
+            rows.append({
+                'Model': model_name,
+                'Batch Size': batch_size,
+                'Path': 'compiled' if batch_size <= compiled.small_batch_threshold else 'batched',
+                'model.predict (ms)': keras_ms,
+                'Compiled (ms)': compiled_ms,
+                'Speedup': keras_ms / compiled_ms
+            })
+
+    return pd.DataFrame(rows)
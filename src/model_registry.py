@@ -0,0 +1,296 @@
+import os
+import threading
+import importlib
+from pathlib import Path
+from collections.abc import MutableMapping
+from src.distillation import DISTILLED_MODEL_NAME
+
+
+def _load_keras_model(filepath):
+    from tensorflow import keras
+    return keras.models.load_model(filepath)
+
+
+def _load_sklearn_model(filepath):
+    from src.classical_models import SklearnModel
+    return SklearnModel.load(filepath)
+
+
+def _load_numpy_model(filepath):
+    from src.numpy_inference import NumpyDNNPredictor
+    return NumpyDNNPredictor.load(filepath)
+
+
+def _save_model(model, filepath):
+    model.save(filepath)
+
+
+def _save_numpy_model(model, filepath):
+    from src.numpy_inference import export_dnn_weights
+    export_dnn_weights(model, filepath)
+
+
+class ModelSerializer:
+    """How one family of model handles is written to and read from disk
+
+    magic is the byte signature every file of this format starts with, so a
+    truncated or foreign file can be rejected without deserializing it.
+    """
+
+    def __init__(self, name, file_extension, load, save=_save_model, magic=b''):
+        self.name = name
+        self.file_extension = file_extension
+        self.load = load
+        self.save = save
+        self.magic = magic
+
+    def check_header(self, filepath):
+        """Raise ValueError unless filepath starts with this format's signature"""
+        with open(filepath, 'rb') as f:
+            header = f.read(len(self.magic))
+        if header != self.magic:
+            raise ValueError(f"{filepath} is not a valid {self.name} model file")
+
+
+SERIALIZERS = {
+    'keras': ModelSerializer('keras', '.h5', _load_keras_model, magic=b'\x89HDF\r\n\x1a\n'),
+    # joblib.dump without compression writes a pickle stream
+    'sklearn': ModelSerializer('sklearn', '.joblib', _load_sklearn_model, magic=b'\x80'),
+    # .npz bundles are zip archives
+    'numpy': ModelSerializer('numpy', '.npz', _load_numpy_model, _save_numpy_model, magic=b'PK\x03\x04')
+}
+
+
+def get_serializer(name):
+    return SERIALIZERS[name]
+
+
+def serializer_for_model(model):
+    """Serializer a model handle declares, defaulting to Keras"""
+    return SERIALIZERS[getattr(model, 'serializer', 'keras')]
+
+
+def serializer_for_file(filepath):
+    """Serializer that owns a file's extension"""
+    suffix = Path(filepath).suffix
+    for serializer in SERIALIZERS.values():
+        if serializer.file_extension == suffix:
+            return serializer
+    raise ValueError(f"No serializer for {filepath}")
+
+
+def resolve_serializer(filepath, serializer=None):
+    """Serializer by name, or by file extension for files saved before names were recorded"""
+    return get_serializer(serializer) if serializer else serializer_for_file(filepath)
+
+
+def load_model_file(filepath, serializer=None):
+    """Deserialize one saved model, by serializer name or by file extension"""
+    return resolve_serializer(filepath, serializer).load(filepath)
+
+
+class ModelSpec:
+    """Declaration of one model: its builder, serializer and descriptive metadata
+
+    builder names a ModelTrainer method for networks and derived models, and a
+    function in src.classical_models for classical baselines, so declaring a
+    model never imports TensorFlow or scikit-learn. inference_serializer, if
+    set, names a TensorFlow-free format that artifact versions also write the
+    model in for serving.
+    """
+
+    def __init__(self, name, family, builder, serializer='keras', description='', inference_serializer=None):
+        self.name = name
+        self.family = family
+        self.builder = builder
+        self.serializer = serializer
+        self.description = description
+        self.inference_serializer = inference_serializer
+
+    def resolve_builder(self, trainer=None):
+        """Return the callable that builds a fresh, untrained model"""
+        if self.family == 'classical':
+            return getattr(importlib.import_module('src.classical_models'), self.builder)
+        return getattr(trainer, self.builder)
+
+
+MODEL_REGISTRY = {}
+
+
+def register_model(spec):
+    """Add or replace a model declaration"""
+    MODEL_REGISTRY[spec.name] = spec
+    return spec
+
+
+def get_model_spec(model_name):
+    return MODEL_REGISTRY.get(model_name)
+
+
+def list_model_names(family=None):
+    """Registered model names in declaration order, optionally of one family"""
+    return [name for name, spec in MODEL_REGISTRY.items() if family is None or spec.family == family]
+
+
+register_model(ModelSpec('CNN', 'network', 'create_cnn_model', description="Convolutional Neural Network"))
+register_model(ModelSpec('LSTM', 'network', 'create_lstm_model', description="Long Short-Term Memory"))
+register_model(ModelSpec('CNN-LSTM', 'network', 'create_cnn_lstm_model', description="Hybrid model"))
+register_model(ModelSpec('DNN', 'network', 'create_dnn_model', description="Deep Neural Network",
+                         inference_serializer='numpy'))
+register_model(ModelSpec('HistGradientBoosting', 'classical', 'create_hist_gradient_boosting_model', 'sklearn',
+                         description="Histogram gradient boosting baseline"))
+register_model(ModelSpec('LogisticRegression', 'classical', 'create_logistic_regression_model', 'sklearn',
+                         description="Regularized logistic regression baseline"))
+register_model(ModelSpec('RandomForest', 'classical', 'create_random_forest_model', 'sklearn',
+                         description="Random forest baseline"))
+register_model(ModelSpec(DISTILLED_MODEL_NAME, 'derived', 'create_student_model',
+                         description="Small network trained to match the Ensemble at single-model speed"))
+
+
+# Estimated from file sizes; the app's four networks and three baselines take a few MB
+DEFAULT_MODEL_MEMORY_LIMIT_MB = 256
+
+
+class ModelCache:
+    """Thread-safe cache of deserialized models bounded by a memory budget
+
+    Sizes are estimated from the files on disk. When the budget or max_models
+    is exceeded, the least used model (fewest accesses, then least recent) is
+    dropped and will be loaded again on its next access.
+    """
+
+    def __init__(self, memory_limit_mb=None, max_models=None):
+        self.memory_limit_mb = memory_limit_mb
+        self.max_models = max_models
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+        self._entries = {}
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, load, size_bytes=0):
+        """Return the model cached under key, loading and caching it on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._touch(entry)
+                self.hits += 1
+                return entry['model']
+
+        # Loading can take seconds, so other models stay available meanwhile
+        model = load()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {'model': model, 'size_bytes': size_bytes, 'uses': 0, 'last_used': 0}
+                self._entries[key] = entry
+                self.loads += 1
+            self._touch(entry)
+            self._evict(keep=key)
+            return entry['model']
+
+    def _touch(self, entry):
+        self._clock += 1
+        entry['uses'] += 1
+        entry['last_used'] = self._clock
+
+    def _over_budget(self):
+        if self.max_models is not None and len(self._entries) > self.max_models:
+            return True
+        if self.memory_limit_mb is not None:
+            resident = sum(entry['size_bytes'] for entry in self._entries.values())
+            return resident > self.memory_limit_mb * 1024 * 1024
+        return False
+
+    def _evict(self, keep):
+        while len(self._entries) > 1 and self._over_budget():
+            victim = min(
+                (key for key in self._entries if key != keep),
+                key=lambda key: (self._entries[key]['uses'], self._entries[key]['last_used'])
+            )
+            del self._entries[victim]
+            self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return load/hit/eviction counters and resident size"""
+        with self._lock:
+            return {
+                'loads': self.loads,
+                'hits': self.hits,
+                'evictions': self.evictions,
+                'resident_models': len(self._entries),
+                'resident_mb': sum(entry['size_bytes'] for entry in self._entries.values()) / (1024 * 1024),
+                'memory_limit_mb': self.memory_limit_mb
+            }
+
+
+default_model_cache = ModelCache(memory_limit_mb=DEFAULT_MODEL_MEMORY_LIMIT_MB)
+
+
+class LazyModels(MutableMapping):
+    """Mapping of model name to model that deserializes each saved model on first access
+
+    Listing names, membership tests and len() never touch the files, so a page
+    that serves one model only ever loads that one. Loaded models live in a
+    shared ModelCache and may be evicted under its memory budget; models
+    assigned directly (for example after retraining) are held as given.
+    version is the artifact version the files belong to, if known.
+    """
+
+    def __init__(self, model_files, cache=None, version=None):
+        # model_files: model name -> (filepath, serializer name or None)
+        self._files = dict(model_files)
+        self._assigned = {}
+        self.cache = cache or default_model_cache
+        self.version = version
+
+    def __getitem__(self, model_name):
+        if model_name in self._assigned:
+            return self._assigned[model_name]
+
+        filepath, serializer = self._files[model_name]
+        return self.cache.get_or_load(
+            str(filepath), lambda: load_model_file(filepath, serializer), os.path.getsize(filepath)
+        )
+
+    def __setitem__(self, model_name, model):
+        self._assigned[model_name] = model
+
+    def __delitem__(self, model_name):
+        if model_name not in self:
+            raise KeyError(model_name)
+        self._assigned.pop(model_name, None)
+        self._files.pop(model_name, None)
+
+    def __iter__(self):
+        yield from self._files
+        yield from (model_name for model_name in self._assigned if model_name not in self._files)
+
+    def __len__(self):
+        return len(self._files.keys() | self._assigned.keys())
+
+    def __contains__(self, model_name):
+        return model_name in self._files or model_name in self._assigned
+
+    def identity(self, model_name):
+        """Stable identifier of the model behind a name that does not load it"""
+        if model_name in self._assigned:
+            return id(self._assigned[model_name])
+        return str(self._files[model_name][0])
+
+    def loaded_names(self):
+        """Names whose models are currently in memory"""
+        return [
+            model_name for model_name in self
+            if model_name in self._assigned or str(self._files[model_name][0]) in self.cache
+        ]
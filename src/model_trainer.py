@@ -1,91 +1,185 @@
+import os
+import time
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
+import pandas as pd
 import tensorflow as tf
 from tensorflow import keras
 from tensorflow.keras import layers
+from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, roc_auc_score, precision_score, recall_score, f1_score
 from sklearn.utils.class_weight import compute_class_weight
-import streamlit as st
+from src.reporting import get_reporter
+from src.artifact_store import ArtifactStore
+from src.inference_backend import predict_fast, median_latency_ms, CompiledPredictor, is_keras_model
+from src.tflite_backend import convert_to_tflite, TFLiteModel
+from src.data_pipeline import count_labels, balanced_class_weights
+from src.training_telemetry import TrainingTelemetry, new_run_log, finish_run_log, peak_rss_mb
+from src.distillation import (
+    DISTILLED_MODEL_NAME, ensemble_soft_labels, make_transfer_set, DEFAULT_SYNTHETIC_ROWS
+)
+from src.model_registry import (
+    MODEL_REGISTRY, SERIALIZERS, LazyModels, get_serializer, list_model_names, serializer_for_model
+)
+
+# Tuned settings consumed by compile/fit rather than by the model builders
+FIT_HYPERPARAMETERS = ('learning_rate', 'batch_size')
+DEFAULT_BATCH_SIZE = 32
+
+# Streamed test sets are re-batched so evaluation pays the predict overhead rarely
+EVALUATION_BATCH_SIZE = 4096
+
+
+def _configure_worker_threads(intra_op_threads, inter_op_threads):
+    """Pin TensorFlow thread pools in a training worker before any op runs"""
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+
+
+def spawn_worker_pool(max_workers, intra_op_threads=None, inter_op_threads=1):
+    """Process pool for TensorFlow training, tuning and CV tasks
+
+    TensorFlow is not fork-safe, so workers are spawned fresh. Each pins its
+    thread pools, by default to an even share of the CPUs, so concurrent
+    workers do not oversubscribe the cores.
+    """
+    intra_op_threads = intra_op_threads or max(1, (os.cpu_count() or 1) // max_workers)
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_configure_worker_threads,
+        initargs=(intra_op_threads, inter_op_threads)
+    )
+
+
+def _train_model_worker(model_name, X_train, y_train_cat, X_test, y_test_cat, y_test, num_classes, output_dir,
+                        hyperparameters=None, jit_compile=False):
+    """Build, train, evaluate and save one architecture inside a worker process"""
+    trainer = ModelTrainer()
+    hyperparameters = hyperparameters or {}
+
+    model = trainer.build_model(model_name, X_train.shape[1:], num_classes, hyperparameters, jit_compile)
+    telemetry = TrainingTelemetry(len(X_train))
+    history = trainer.train_model(model, X_train, y_train_cat, X_test, y_test_cat,
+                                  batch_size=hyperparameters.get('batch_size', DEFAULT_BATCH_SIZE),
+                                  extra_callbacks=[telemetry])
+    metrics = trainer.evaluate_model(model, X_test, y_test)
+
+    filepath = os.path.join(output_dir, f"{model_name.lower().replace('-', '_')}.keras")
+    model.save(filepath)
+
+    return model_name, filepath, history.history, history.params, history.epoch, metrics, telemetry.summary()
+
+
+def _cross_validate_fold_worker(model_name, fold_index, X_train, y_train, X_val, y_val, num_classes,
+                                hyperparameters=None):
+    """Train and evaluate one architecture on one CV fold inside a worker process"""
+    trainer = ModelTrainer()
+    hyperparameters = hyperparameters or {}
+
+    model = trainer.build_model(model_name, X_train.shape[1:], num_classes, hyperparameters)
+    trainer.train_model(model, X_train, y_train, X_val, y_val,
+                        batch_size=hyperparameters.get('batch_size', DEFAULT_BATCH_SIZE))
+
+    return model_name, fold_index, trainer.evaluate_model(model, X_val, y_val)
 
 
 class ModelTrainer:
     def __init__(self):
         self.models = {}
         self.history = {}
+        self.cv_results = {}
+        self.run_log = None
 
-    def create_cnn_model(self, input_shape, num_classes=2):
+    def create_cnn_model(self, input_shape, num_classes=2, conv_filters=32, dense_units=128, dropout_rate=0.5):
         """Create CNN model for tabular data"""
         output_units = 1 if num_classes == 2 else num_classes
         activation = 'sigmoid' if num_classes == 2 else 'softmax'
         model = keras.Sequential([
             layers.Reshape((input_shape[0], 1), input_shape=input_shape),
-            layers.Conv1D(32, 3, activation='relu'),
-            layers.Conv1D(64, 3, activation='relu'),
+            layers.Conv1D(conv_filters, 3, activation='relu'),
+            layers.Conv1D(conv_filters * 2, 3, activation='relu'),
             layers.MaxPooling1D(2),
-            layers.Conv1D(128, 3, activation='relu'),
+            layers.Conv1D(conv_filters * 4, 3, activation='relu'),
             layers.GlobalMaxPooling1D(),
-            layers.Dense(128, activation='relu'),
-            layers.Dropout(0.5),
-            layers.Dense(64, activation='relu'),
+            layers.Dense(dense_units, activation='relu'),
+            layers.Dropout(dropout_rate),
+            layers.Dense(dense_units // 2, activation='relu'),
             layers.Dropout(0.3),
             layers.Dense(output_units, activation=activation)
         ])
         return model
 
-    def create_lstm_model(self, input_shape, num_classes=2):
+    def create_lstm_model(self, input_shape, num_classes=2, lstm_units=64, dense_units=64, dropout_rate=0.3):
         """Create LSTM model for tabular data"""
         output_units = 1 if num_classes == 2 else num_classes
         activation = 'sigmoid' if num_classes == 2 else 'softmax'
         model = keras.Sequential([
             layers.Reshape((input_shape[0], 1), input_shape=input_shape),
-            layers.LSTM(64, return_sequences=True),
-            layers.Dropout(0.3),
-            layers.LSTM(32),
-            layers.Dropout(0.3),
-            layers.Dense(64, activation='relu'),
+            layers.LSTM(lstm_units, return_sequences=True),
+            layers.Dropout(dropout_rate),
+            layers.LSTM(lstm_units // 2),
+            layers.Dropout(dropout_rate),
+            layers.Dense(dense_units, activation='relu'),
             layers.Dropout(0.5),
             layers.Dense(output_units, activation=activation)
         ])
         return model
 
-    def create_cnn_lstm_model(self, input_shape, num_classes=2):
+    def create_cnn_lstm_model(self, input_shape, num_classes=2, conv_filters=32, lstm_units=50, dense_units=64):
         """Create CNN-LSTM hybrid model"""
         output_units = 1 if num_classes == 2 else num_classes
         activation = 'sigmoid' if num_classes == 2 else 'softmax'
         model = keras.Sequential([
             layers.Reshape((input_shape[0], 1), input_shape=input_shape),
-            layers.Conv1D(32, 3, activation='relu'),
-            layers.Conv1D(64, 3, activation='relu'),
+            layers.Conv1D(conv_filters, 3, activation='relu'),
+            layers.Conv1D(conv_filters * 2, 3, activation='relu'),
             layers.MaxPooling1D(2),
-            layers.LSTM(50, return_sequences=True),
-            layers.LSTM(25),
-            layers.Dense(64, activation='relu'),
+            layers.LSTM(lstm_units, return_sequences=True),
+            layers.LSTM(lstm_units // 2),
+            layers.Dense(dense_units, activation='relu'),
             layers.Dropout(0.5),
             layers.Dense(output_units, activation=activation)
         ])
         return model
 
-    def create_dnn_model(self, input_shape, num_classes=2):
+    def create_dnn_model(self, input_shape, num_classes=2, dense_units=256, dropout_rate=0.4):
         """Create Deep Neural Network model"""
         output_units = 1 if num_classes == 2 else num_classes
         activation = 'sigmoid' if num_classes == 2 else 'softmax'
         model = keras.Sequential([
-            layers.Dense(256, activation='relu', input_shape=input_shape),
+            layers.Dense(dense_units, activation='relu', input_shape=input_shape),
             layers.BatchNormalization(),
-            layers.Dropout(0.4),
-            layers.Dense(128, activation='relu'),
+            layers.Dropout(dropout_rate),
+            layers.Dense(dense_units // 2, activation='relu'),
             layers.BatchNormalization(),
             layers.Dropout(0.3),
-            layers.Dense(64, activation='relu'),
+            layers.Dense(dense_units // 4, activation='relu'),
             layers.BatchNormalization(),
             layers.Dropout(0.2),
-            layers.Dense(32, activation='relu'),
+            layers.Dense(dense_units // 8, activation='relu'),
             layers.Dropout(0.1),
             layers.Dense(output_units, activation=activation)
         ])
         return model
 
-    def compile_model(self, model, num_classes=2):
-        """Compile model with appropriate loss and metrics"""
+    def create_student_model(self, input_shape, hidden_units=32):
+        """Create the compact dense student used to distill the ensemble"""
+        model = keras.Sequential([
+            layers.Dense(hidden_units, activation='relu', input_shape=input_shape),
+            layers.Dense(hidden_units // 2, activation='relu'),
+            layers.Dense(1, activation='sigmoid')
+        ])
+        return model
+
+    def compile_model(self, model, num_classes=2, learning_rate=None, jit_compile=False):
+        """Compile model with appropriate loss and metrics
+
+        jit_compile=True compiles the train and predict steps with XLA; otherwise
+        Keras decides, which on CPU-only machines means no XLA.
+        """
         if num_classes == 2:
             loss = 'binary_crossentropy'
             metrics = ['accuracy']
@@ -94,21 +188,47 @@ class ModelTrainer:
             metrics = ['accuracy']
 
         model.compile(
-            optimizer='adam',
+            optimizer=keras.optimizers.Adam(learning_rate) if learning_rate else 'adam',
             loss=loss,
-            metrics=metrics
+            metrics=metrics,
+            jit_compile=True if jit_compile else 'auto'
         )
         return model
 
-    def train_model(self, model, X_train, y_train, X_test, y_test, epochs=50, batch_size=32):
-        """Train a single model"""
+    def build_model(self, model_name, input_shape, num_classes=2, hyperparameters=None, jit_compile=False):
+        """Build and compile one architecture, applying any tuned hyperparameters"""
+        hyperparameters = dict(hyperparameters or {})
+        learning_rate = hyperparameters.pop('learning_rate', None)
+        for fit_parameter in FIT_HYPERPARAMETERS:
+            hyperparameters.pop(fit_parameter, None)
+
+        model = self.get_model_builders()[model_name](input_shape, num_classes, **hyperparameters)
+        return self.compile_model(model, num_classes, learning_rate=learning_rate, jit_compile=jit_compile)
+
+    def train_model(self, model, X_train, y_train, X_test, y_test, epochs=50, batch_size=32, class_weight=None,
+                    initial_epoch=0, extra_callbacks=None):
+        """Train a single model
+
+        X_train and X_test may also be tf.data datasets of (features, label)
+        batches, in which case y_train and y_test are ignored and the data is
+        streamed instead of held in memory. initial_epoch resumes a model that
+        has already been trained for that many epochs. extra_callbacks, such as
+        a TrainingTelemetry, run alongside the standard ones.
+        """
+        streaming = isinstance(X_train, tf.data.Dataset)
+
         # Calculate class weights for imbalanced data
-        class_weights = compute_class_weight(
-            'balanced',
-            classes=np.unique(y_train),
-            y=y_train
-        )
-        class_weight_dict = dict(enumerate(class_weights))
+        if class_weight is not None:
+            class_weight_dict = class_weight
+        elif streaming:
+            class_weight_dict = balanced_class_weights(count_labels(X_train))
+        else:
+            class_weights = compute_class_weight(
+                'balanced',
+                classes=np.unique(y_train),
+                y=y_train
+            )
+            class_weight_dict = dict(enumerate(class_weights))
 
         # Callbacks
         callbacks = [
@@ -123,14 +243,21 @@ class ModelTrainer:
                 patience=5,
                 min_lr=1e-6
             )
-        ]
+        ] + list(extra_callbacks or [])
+
+        # Datasets carry their own labels and batching
+        if streaming:
+            fit_data = {'x': X_train}
+        else:
+            fit_data = {'x': X_train, 'y': y_train, 'batch_size': batch_size}
+        validation_data = X_test if isinstance(X_test, tf.data.Dataset) else (X_test, y_test)
 
         # Train model
         history = model.fit(
-            X_train, y_train,
+            **fit_data,
             epochs=epochs,
-            batch_size=batch_size,
-            validation_data=(X_test, y_test),
+            initial_epoch=initial_epoch,
+            validation_data=validation_data,
             class_weight=class_weight_dict,
             callbacks=callbacks,
             verbose=0
@@ -141,7 +268,15 @@ class ModelTrainer:
     def evaluate_model(self, model, X_test, y_test):
         """Evaluate model and return metrics"""
         # Predictions
-        y_pred_proba = model.predict(X_test, verbose=0)
+        if isinstance(X_test, tf.data.Dataset):
+            batches = [
+                (predict_fast(model, features.numpy()), labels.numpy())
+                for features, labels in X_test.unbatch().batch(EVALUATION_BATCH_SIZE)
+            ]
+            y_pred_proba = np.concatenate([predictions for predictions, _ in batches])
+            y_test = np.concatenate([labels for _, labels in batches])
+        else:
+            y_pred_proba = predict_fast(model, X_test)
 
         if len(y_pred_proba.shape) > 1 and y_pred_proba.shape[1] > 1:
             y_pred = np.argmax(y_pred_proba, axis=1)
@@ -166,39 +301,134 @@ class ModelTrainer:
             'f1_score': f1
         }
 
-    def train_all_models(self, X_train, y_train, X_test, y_test):
-        """Train all models and return results"""
-        input_shape = X_train.shape[1:]
-        num_classes = len(np.unique(y_train))
+    def get_model_builders(self):
+        """Map the registered network names to their builder methods"""
+        return {
+            model_name: MODEL_REGISTRY[model_name].resolve_builder(self) for model_name in list_model_names('network')
+        }
+
+    def get_classical_builders(self):
+        """Map the registered classical baseline names to their builders"""
+        return {
+            model_name: MODEL_REGISTRY[model_name].resolve_builder() for model_name in list_model_names('classical')
+        }
+
+    def train_classical_model(self, model_name, X_train, y_train, hyperparameters=None):
+        """Fit one classical baseline and return it with a run-log entry shaped like TrainingTelemetry's"""
+        model = self.get_classical_builders()[model_name](**(hyperparameters or {}))
+
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        seconds = time.perf_counter() - start
+
+        summary = {
+            'epochs_run': None,
+            'total_seconds': seconds,
+            'mean_epoch_seconds': None,
+            'mean_samples_per_sec': len(X_train) / seconds if seconds else None,
+            'early_stopping_epoch': None,
+            'learning_rate_changes': [],
+            'peak_rss_mb': peak_rss_mb(),
+            'epochs': []
+        }
+        return model, summary
+
+    def _train_classical_models(self, X_train, y_train, X_test, y_test, hyperparameters, results):
+        """Fit every classical baseline in-process; they train in milliseconds, so no pool is needed"""
+        for model_name in self.get_classical_builders():
+            get_reporter().write(f"Training {model_name}...")
+
+            model, summary = self.train_classical_model(model_name, X_train, y_train, hyperparameters.get(model_name))
+            self.run_log['models'][model_name] = summary
+
+            metrics = self.evaluate_model(model, X_test, y_test)
+
+            self.models[model_name] = model
+            results[model_name] = metrics
+
+            get_reporter().write(
+                f"✅ {model_name} - Accuracy: {metrics['accuracy']:.3f}, AUC-ROC: {metrics['auc_roc']:.3f}")
+
+        return results
+
+    def train_all_models(self, X_train, y_train, X_test, y_test, parallel=False, max_workers=None,
+                         intra_op_threads=None, inter_op_threads=1, hyperparameters=None, jit_compile=False,
+                         include_classical=True):
+        """Train all models and return results
+
+        With parallel=True each architecture trains in its own spawned process,
+        with TensorFlow's thread pools pinned so workers do not oversubscribe cores.
+        X_train and X_test may be tf.data datasets (see src.data_pipeline) to
+        train on data larger than memory; y_train and y_test are then ignored.
+        hyperparameters maps model names to configs such as those returned by
+        src.hyperparameter_search.tune_hyperparameters. jit_compile=True trains
+        and serves every model through XLA; see benchmark_jit_compile.
+        include_classical also fits the gradient boosting, logistic regression
+        and random forest baselines of src.classical_models next to the networks.
+        """
+        hyperparameters = hyperparameters or {}
+        streaming = isinstance(X_train, tf.data.Dataset)
+        class_weight = None
+
+        if include_classical and streaming:
+            get_reporter().warning("Classical baselines need in-memory arrays; skipping them for streamed data")
+            include_classical = False
+
+        # Per-epoch timing, throughput and memory, saved with the artifact version
+        self.run_log = new_run_log(
+            mode='full', parallel=parallel, jit_compile=jit_compile, streaming=streaming,
+            tuned=bool(hyperparameters), training_rows=None if streaming else int(len(X_train))
+        )
+
+        if streaming:
+            if parallel:
+                raise ValueError("Parallel training needs in-memory arrays, not tf.data datasets")
+            input_shape = tuple(X_train.element_spec[0].shape[1:])
+            # One counting pass serves every model's class weights
+            label_counts = count_labels(X_train)
+            num_classes = int(np.count_nonzero(label_counts))
+            class_weight = balanced_class_weights(label_counts)
+        else:
+            input_shape = X_train.shape[1:]
+            num_classes = len(np.unique(y_train))
 
         # Convert to categorical if binary
-        if num_classes == 2:
+        if num_classes == 2 or streaming:
             y_train_cat = y_train
             y_test_cat = y_test
         else:
             y_train_cat = keras.utils.to_categorical(y_train, num_classes)
             y_test_cat = keras.utils.to_categorical(y_test, num_classes)
 
-        models_to_train = {
-            'CNN': self.create_cnn_model,
-            'LSTM': self.create_lstm_model,
-            'CNN-LSTM': self.create_cnn_lstm_model,
-            'DNN': self.create_dnn_model
-        }
+        models_to_train = self.get_model_builders()
+
+        if parallel:
+            results = self._train_models_parallel(
+                list(models_to_train), X_train, y_train_cat, X_test, y_test_cat, y_test, num_classes,
+                max_workers, intra_op_threads, inter_op_threads, hyperparameters, jit_compile
+            )
+            if include_classical:
+                self._train_classical_models(X_train, y_train, X_test, y_test, hyperparameters, results)
+            finish_run_log(self.run_log)
+            return self.models, results
 
         results = {}
 
-        for model_name, model_func in models_to_train.items():
-            st.write(f"Training {model_name}...")
+        for model_name in models_to_train:
+            get_reporter().write(f"Training {model_name}...")
+            model_hyperparameters = hyperparameters.get(model_name, {})
 
             # Create and compile model
-            model = model_func(input_shape, num_classes)
-            model = self.compile_model(model, num_classes)
+            model = self.build_model(model_name, input_shape, num_classes, model_hyperparameters, jit_compile)
 
             # Train model
+            telemetry = TrainingTelemetry(None if streaming else len(X_train))
             history = self.train_model(
-                model, X_train, y_train_cat, X_test, y_test_cat
+                model, X_train, y_train_cat, X_test, y_test_cat, class_weight=class_weight,
+                batch_size=model_hyperparameters.get('batch_size', DEFAULT_BATCH_SIZE),
+                extra_callbacks=[telemetry]
             )
+            self.run_log['models'][model_name] = telemetry.summary()
 
             # Evaluate model
             metrics = self.evaluate_model(model, X_test, y_test)
@@ -208,11 +438,304 @@ class ModelTrainer:
             self.history[model_name] = history
             results[model_name] = metrics
 
-            st.write(
+            get_reporter().write(
                 f"✅ {model_name} - Accuracy: {metrics['accuracy']:.3f}, AUC-ROC: {metrics['auc_roc']:.3f}")
 
+        if include_classical:
+            self._train_classical_models(X_train, y_train, X_test, y_test, hyperparameters, results)
+
+        finish_run_log(self.run_log)
         return self.models, results
 
+    def distill_ensemble(self, X_train, X_test, y_test, n_synthetic=DEFAULT_SYNTHETIC_ROWS, epochs=100,
+                         batch_size=256):
+        """Train a small student on the ensemble's soft probabilities and register it
+
+        The transfer set is the training rows plus synthetic perturbations of
+        them, labeled by the averaged probabilities of the trained models. The
+        student is stored as the "Ensemble-Distilled" model and evaluated on
+        the test split next to the ensemble it imitates.
+        """
+        get_reporter().write(f"Distilling the ensemble into {DISTILLED_MODEL_NAME}...")
+
+        X_transfer = make_transfer_set(X_train, n_synthetic)
+        soft_labels = ensemble_soft_labels(self.models, X_transfer)
+
+        student = self.compile_model(self.create_student_model(X_train.shape[1:]))
+        telemetry = TrainingTelemetry(int(len(X_transfer) * 0.9))
+        student.fit(
+            X_transfer, soft_labels,
+            epochs=epochs,
+            batch_size=batch_size,
+            validation_split=0.1,
+            callbacks=[
+                keras.callbacks.EarlyStopping(monitor='val_loss', patience=10, restore_best_weights=True),
+                telemetry
+            ],
+            verbose=0
+        )
+        if self.run_log is not None:
+            self.run_log['models'][DISTILLED_MODEL_NAME] = telemetry.summary()
+
+        metrics = self.evaluate_model(student, X_test, y_test)
+        ensemble_auc = roc_auc_score(y_test, ensemble_soft_labels(self.models, X_test))
+        self.models[DISTILLED_MODEL_NAME] = student
+
+        get_reporter().write(f"✅ {DISTILLED_MODEL_NAME} - Accuracy: {metrics['accuracy']:.3f}, "
+                             f"AUC-ROC: {metrics['auc_roc']:.3f} (ensemble AUC-ROC: {ensemble_auc:.3f})")
+
+        return student, metrics
+
+    def cross_validate_models(self, folds, model_names=None, parallel=True, max_workers=None,
+                              intra_op_threads=None, inter_op_threads=1, hyperparameters=None):
+        """Cross-validate each architecture over preprocessed folds
+
+        folds comes from DataPreprocessor.build_cv_folds. Every (model, fold)
+        pair is an independent task, spread over spawned worker processes when
+        parallel=True. Returns per-model mean and std dicts in evaluate_model's
+        format; per-fold metrics are kept in self.cv_results.
+        """
+        model_names = model_names or list(self.get_model_builders())
+        hyperparameters = hyperparameters or {}
+        num_classes = len(np.unique(folds[0][2]))
+
+        tasks = [
+            (model_name, fold_index, X_train, y_train, X_val, y_val, num_classes, hyperparameters.get(model_name))
+            for model_name in model_names
+            for fold_index, (X_train, X_val, y_train, y_val) in enumerate(folds)
+        ]
+
+        fold_metrics = {model_name: [None] * len(folds) for model_name in model_names}
+
+        if parallel:
+            max_workers = max_workers or max(1, min(os.cpu_count() or 1, len(tasks)))
+            intra_op_threads = intra_op_threads or max(1, (os.cpu_count() or 1) // max_workers)
+
+            get_reporter().write(f"Cross-validating {len(model_names)} models over {len(folds)} folds "
+                                 f"({max_workers} workers, {intra_op_threads} threads each)...")
+
+            with spawn_worker_pool(max_workers, intra_op_threads, inter_op_threads) as executor:
+                futures = [executor.submit(_cross_validate_fold_worker, *task) for task in tasks]
+                for future in as_completed(futures):
+                    model_name, fold_index, metrics = future.result()
+                    fold_metrics[model_name][fold_index] = metrics
+        else:
+            for task in tasks:
+                get_reporter().write(f"Cross-validating {task[0]} on fold {task[1] + 1}/{len(folds)}...")
+                model_name, fold_index, metrics = _cross_validate_fold_worker(*task)
+                fold_metrics[model_name][fold_index] = metrics
+
+        self.cv_results = fold_metrics
+
+        means, stds = {}, {}
+        for model_name, per_fold in fold_metrics.items():
+            means[model_name] = {metric: float(np.mean([m[metric] for m in per_fold])) for metric in per_fold[0]}
+            stds[model_name] = {metric: float(np.std([m[metric] for m in per_fold])) for metric in per_fold[0]}
+
+            get_reporter().write(f"✅ {model_name} - Accuracy: {means[model_name]['accuracy']:.3f} ± "
+                                 f"{stds[model_name]['accuracy']:.3f}, AUC-ROC: {means[model_name]['auc_roc']:.3f} ± "
+                                 f"{stds[model_name]['auc_roc']:.3f}")
+
+        return means, stds
+
+    def fine_tune_models(self, new_data, artifact_store=None, replay_size=200, epochs=5,
+                         learning_rate=1e-4, auc_tolerance=0.005, validation_size=0.2):
+        """Warm-start the latest artifact version on new labeled rows and publish it if AUC holds
+
+        Each model continues from its published weights on the new rows plus a replay
+        sample of the original training split, with the fitted preprocessing kept fixed.
+        Validation is the original test split plus a held-out part of the new rows.
+        A model whose validation AUC drops by more than auc_tolerance keeps its
+        previous weights, and a new version is only published if some model changed.
+        A distilled student is never fine-tuned itself; before publishing, it is
+        re-distilled from the fine-tuned members so it keeps imitating the ensemble.
+        """
+        artifact_store = artifact_store or ArtifactStore()
+        loaded = artifact_store.load_latest()
+        if loaded is None:
+            raise ValueError("No trained artifact version to fine-tune. Train the models first.")
+        models, preprocessor, manifest = loaded
+
+        X_new, y_new = preprocessor.transform_labeled_data(new_data)
+        stratify_new = y_new if np.bincount(y_new).min() >= 2 else None
+        X_new_train, X_new_val, y_new_train, y_new_val = train_test_split(
+            X_new, y_new, test_size=validation_size, random_state=42, stratify=stratify_new
+        )
+
+        # The split load_and_preprocess_data used, so replay rows never leak into validation
+        original_split = preprocessor.load_original_split()
+        if original_split is None:
+            raise ValueError("The original dataset is needed for replay and validation.")
+        X_old_train, X_old_val, y_old_train, y_old_val = original_split
+
+        rng = np.random.default_rng(42)
+        replay_index = rng.choice(len(X_old_train), size=min(replay_size, len(X_old_train)), replace=False)
+
+        X_tune = np.vstack([X_new_train, X_old_train[replay_index]])
+        y_tune = np.concatenate([y_new_train, y_old_train[replay_index]])
+        X_val = np.vstack([X_old_val, X_new_val])
+        y_val = np.concatenate([y_old_val, y_new_val])
+
+        results = {}
+        fine_tune_report = {}
+        self.run_log = new_run_log(
+            mode='fine_tune', parent_version=manifest['version'], epochs=epochs, learning_rate=learning_rate,
+            training_rows=int(len(X_tune))
+        )
+
+        for model_name, model in models.items():
+            # A distilled student is re-distilled from the fine-tuned members below,
+            # since training it on hard labels would stop it imitating the ensemble
+            spec = MODEL_REGISTRY.get(model_name)
+            if spec is not None and spec.family == 'derived':
+                self.models[model_name] = model
+                continue
+
+            baseline_metrics = self.evaluate_model(model, X_val, y_val)
+
+            # Tree and linear baselines cannot continue from their fitted state, so they are kept as published
+            if not is_keras_model(model):
+                self.models[model_name] = model
+                results[model_name] = baseline_metrics
+                fine_tune_report[model_name] = {
+                    'baseline_auc_roc': float(baseline_metrics['auc_roc']),
+                    'fine_tuned_auc_roc': None,
+                    'epochs': 0,
+                    'accepted': False
+                }
+                get_reporter().write(f"⏭️ kept {model_name} unchanged - AUC-ROC: {baseline_metrics['auc_roc']:.3f}")
+                continue
+
+            get_reporter().write(f"Fine-tuning {model_name}...")
+            previous_weights = model.get_weights()
+
+            num_classes = max(2, model.output_shape[-1])
+            model = self.compile_model(model, num_classes, learning_rate=learning_rate)
+            telemetry = TrainingTelemetry(len(X_tune))
+            history = self.train_model(model, X_tune, y_tune, X_val, y_val, epochs=epochs,
+                                       extra_callbacks=[telemetry])
+            self.run_log['models'][model_name] = telemetry.summary()
+            metrics = self.evaluate_model(model, X_val, y_val)
+
+            accepted = metrics['auc_roc'] >= baseline_metrics['auc_roc'] - auc_tolerance
+            if not accepted:
+                model.set_weights(previous_weights)
+
+            self.models[model_name] = model
+            self.history[model_name] = history
+            results[model_name] = metrics if accepted else baseline_metrics
+            fine_tune_report[model_name] = {
+                'baseline_auc_roc': float(baseline_metrics['auc_roc']),
+                'fine_tuned_auc_roc': float(metrics['auc_roc']),
+                'epochs': len(history.epoch),
+                'accepted': bool(accepted)
+            }
+
+            status = "✅ kept" if accepted else "↩️ reverted"
+            get_reporter().write(f"{status} {model_name} - AUC-ROC: {baseline_metrics['auc_roc']:.3f} → {metrics['auc_roc']:.3f}")
+
+        version = None
+        if any(entry['accepted'] for entry in fine_tune_report.values()):
+            if DISTILLED_MODEL_NAME in models:
+                _, results[DISTILLED_MODEL_NAME] = self.distill_ensemble(
+                    np.vstack([X_old_train, X_new_train]), X_val, y_val
+                )
+                fine_tune_report[DISTILLED_MODEL_NAME] = {'redistilled': True}
+
+            finish_run_log(self.run_log)
+            version = artifact_store.save_version(self.models, preprocessor, results, run_log=self.run_log, extra={
+                'fine_tune': {
+                    'parent_version': manifest['version'],
+                    'new_rows': int(len(X_new)),
+                    'replay_rows': int(len(replay_index)),
+                    'models': fine_tune_report
+                }
+            })
+        else:
+            finish_run_log(self.run_log)
+
+        return self.models, results, version
+
+    def _train_models_parallel(self, model_names, X_train, y_train_cat, X_test, y_test_cat, y_test, num_classes,
+                               max_workers=None, intra_op_threads=None, inter_op_threads=1, hyperparameters=None,
+                               jit_compile=False):
+        """Fan model training out to a process pool, storing models and histories and returning metrics"""
+        max_workers = max_workers or len(model_names)
+        intra_op_threads = intra_op_threads or max(1, (os.cpu_count() or 1) // max_workers)
+
+        get_reporter().write(f"Training {', '.join(model_names)} in parallel "
+                             f"({max_workers} workers, {intra_op_threads} threads each)...")
+
+        results = {}
+
+        with tempfile.TemporaryDirectory() as output_dir, \
+                spawn_worker_pool(max_workers, intra_op_threads, inter_op_threads) as executor:
+            futures = [
+                executor.submit(_train_model_worker, model_name, X_train, y_train_cat,
+                                X_test, y_test_cat, y_test, num_classes, output_dir,
+                                (hyperparameters or {}).get(model_name), jit_compile)
+                for model_name in model_names
+            ]
+
+            trained = {}
+            for future in as_completed(futures):
+                (model_name, filepath, history_values, history_params, history_epochs, metrics,
+                 telemetry_summary) = future.result()
+
+                model = keras.models.load_model(filepath)
+
+                # Rebuild the History object the sequential path would have produced
+                history = keras.callbacks.History()
+                history.history = history_values
+                history.params = history_params
+                history.epoch = history_epochs
+                history.set_model(model)
+
+                trained[model_name] = (model, history, metrics, telemetry_summary)
+                get_reporter().write(
+                    f"✅ {model_name} - Accuracy: {metrics['accuracy']:.3f}, AUC-ROC: {metrics['auc_roc']:.3f}")
+
+        # Store everything in model_names order, as the sequential path does, so the UI,
+        # the fused graph and the manifest list models the same way whichever finished first
+        for model_name in model_names:
+            model, history, metrics, telemetry_summary = trained[model_name]
+            self.models[model_name] = model
+            self.history[model_name] = history
+            results[model_name] = metrics
+            # Peak memory here is the worker's own, not the parent's
+            self.run_log['models'][model_name] = telemetry_summary
+
+        return results
+
+    def benchmark_jit_compile(self, X_train, y_train, model_names=None, epochs=3, batch_size=DEFAULT_BATCH_SIZE,
+                              n_calls=50):
+        """Measure training steps/sec and single-row predict latency with and without XLA"""
+        num_classes = len(np.unique(y_train))
+        steps_per_epoch = int(np.ceil(len(X_train) / batch_size))
+        rows = []
+
+        for model_name in model_names or self.get_model_builders():
+            for jit_compile in (False, True):
+                model = self.build_model(model_name, X_train.shape[1:], num_classes, jit_compile=jit_compile)
+
+                # The first epoch pays for tracing and XLA compilation, so it is not timed
+                model.fit(X_train, y_train, epochs=1, batch_size=batch_size, verbose=0)
+                start = time.perf_counter()
+                model.fit(X_train, y_train, epochs=epochs, batch_size=batch_size, verbose=0)
+                elapsed = time.perf_counter() - start
+
+                predictor = CompiledPredictor(model, jit_compile=jit_compile)
+                predictor.warmup()
+
+                rows.append({
+                    'Model': model_name,
+                    'XLA': jit_compile,
+                    'Train steps/sec': epochs * steps_per_epoch / elapsed,
+                    'Predict latency (ms)': median_latency_ms(predictor.predict, X_train[:1], n_calls)
+                })
+
+        return pd.DataFrame(rows)
+
     def get_best_model(self, results):
         """Get the best performing model based on AUC-ROC"""
         best_model_name = max(
@@ -222,21 +745,102 @@ class ModelTrainer:
     def save_models(self, filepath_prefix):
         """Save all trained models"""
         for model_name, model in self.models.items():
-            filepath = f"{filepath_prefix}_{model_name.lower().replace('-', '_')}.h5"
-            model.save(filepath)
-            st.write(f"Model {model_name} saved to {filepath}")
+            serializer = serializer_for_model(model)
+            serializers = [serializer]
+
+            # Models declaring a TensorFlow-free inference format also ship in it, as in artifact versions
+            spec = MODEL_REGISTRY.get(model_name)
+            if spec is not None and spec.inference_serializer not in (None, serializer.name):
+                serializers.append(get_serializer(spec.inference_serializer))
+
+            for serializer in serializers:
+                filepath = f"{filepath_prefix}_{model_name.lower().replace('-', '_')}{serializer.file_extension}"
+                serializer.save(model, filepath)
+                get_reporter().write(f"Model {model_name} saved to {filepath}")
+
+    def load_models(self, filepath_prefix, model_names=None, model_cache=None):
+        """Find models saved by save_models and return them as a lazily loading mapping
+
+        Every registered model with a file under filepath_prefix is included;
+        each is only deserialized when first accessed. model_names restricts
+        the lookup and warns about any that are missing.
+        """
+        model_files = {}
+
+        for model_name in model_names or list(MODEL_REGISTRY):
+            serializer = MODEL_REGISTRY[model_name].serializer if model_name in MODEL_REGISTRY else 'keras'
+            filepath = f"{filepath_prefix}_{model_name.lower().replace('-', '_')}{SERIALIZERS[serializer].file_extension}"
+            if os.path.exists(filepath):
+                model_files[model_name] = (filepath, serializer)
+            elif model_names:
+                get_reporter().warning(f"Could not load model {model_name} from {filepath}")
+
+        self.models = LazyModels(model_files, model_cache)
+        get_reporter().write(f"Found {len(model_files)} saved models under {filepath_prefix}")
+
+        return self.models
 
-    def load_models(self, filepath_prefix):
-        """Load saved models"""
-        model_names = ['CNN', 'LSTM', 'CNN-LSTM', 'DNN']
+    def export_tflite_models(self, filepath_prefix, quantization=None, calibration_data=None):
+        """Export all trained models as TFLite flatbuffers, optionally quantized"""
+        exported = {}
 
-        for model_name in model_names:
-            filepath = f"{filepath_prefix}_{model_name.lower().replace('-', '_')}.h5"
+        for model_name, model in self.models.items():
+            # Classical baselines are not TensorFlow graphs and keep their own format
+            if not is_keras_model(model):
+                continue
+
+            filepath = f"{filepath_prefix}_{model_name.lower().replace('-', '_')}.tflite"
+            flatbuffer, applied_quantization = convert_to_tflite(model, quantization, calibration_data)
+
+            with open(filepath, 'wb') as f:
+                f.write(flatbuffer)
+
+            exported[model_name] = filepath
+            get_reporter().write(f"Model {model_name} exported to {filepath} (quantization: {applied_quantization or 'none'})")
+
+        return exported
+
+    def load_tflite_models(self, filepath_prefix, model_names=None):
+        """Load TFLite flatbuffers as interpreter-backed model handles"""
+        tflite_models = {}
+
+        for model_name in model_names or list_model_names('network'):
+            filepath = f"{filepath_prefix}_{model_name.lower().replace('-', '_')}.tflite"
             try:
-                self.models[model_name] = keras.models.load_model(filepath)
-                st.write(f"Model {model_name} loaded from {filepath}")
-            except:
-                st.warning(
-                    f"Could not load model {model_name} from {filepath}")
+                tflite_models[model_name] = TFLiteModel.load(filepath)
+            except Exception:
+                get_reporter().warning(f"Could not load TFLite model {model_name} from {filepath}")
 
-        return self.models
+        return tflite_models
+
+    def evaluate_tflite_models(self, X_test, y_test, quantization='dynamic', calibration_data=None):
+        """Evaluate each model next to its TFLite conversion with accuracy, latency and size changes"""
+        results = {}
+        single_row = X_test[:1]
+
+        for model_name, model in self.models.items():
+            if not is_keras_model(model):
+                continue
+
+            flatbuffer, applied_quantization = convert_to_tflite(model, quantization, calibration_data)
+            tflite_model = TFLiteModel(flatbuffer)
+
+            metrics = self.evaluate_model(model, X_test, y_test)
+            tflite_metrics = self.evaluate_model(tflite_model, X_test, y_test)
+
+            keras_size = sum(np.asarray(weight).nbytes for weight in model.weights)
+
+            results[model_name] = {
+                **metrics,
+                'tflite_quantization': applied_quantization or 'none',
+                'tflite_accuracy': tflite_metrics['accuracy'],
+                'tflite_auc_roc': tflite_metrics['auc_roc'],
+                'accuracy_change': tflite_metrics['accuracy'] - metrics['accuracy'],
+                'auc_roc_change': tflite_metrics['auc_roc'] - metrics['auc_roc'],
+                'keras_latency_ms': median_latency_ms(lambda X: predict_fast(model, X), single_row),
+                'tflite_latency_ms': median_latency_ms(tflite_model.predict, single_row),
+                'keras_size_kb': keras_size / 1024,
+                'tflite_size_kb': len(flatbuffer) / 1024
+            }
+
+        return results
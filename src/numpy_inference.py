@@ -0,0 +1,131 @@
+import numpy as np
+
+# Bump when the layout of the exported weight bundle changes
+BUNDLE_FORMAT_VERSION = 1
+
+
+def _softmax(x):
+    exp_x = np.exp(x - x.max(axis=1, keepdims=True))
+    return exp_x / exp_x.sum(axis=1, keepdims=True)
+
+
+_ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0.0),
+    # tanh form of the logistic function does not overflow for large logits
+    'sigmoid': lambda x: 0.5 * (1.0 + np.tanh(0.5 * x)),
+    'softmax': _softmax
+}
+
+
+def fold_dnn_layers(model):
+    """Reduce a Dense/BatchNormalization/Dropout stack to (weights, bias, activation) triples
+
+    Batch normalization sits after the ReLU in create_dnn_model, so each one is
+    folded forward into the next Dense layer. Dropout is the identity at inference.
+    """
+    dense_layers = []
+    pending_scale = None
+    pending_shift = None
+
+    for layer in model.layers:
+        layer_type = layer.__class__.__name__
+
+        if layer_type == 'Dense':
+            weights, bias = [np.asarray(w, dtype=np.float64) for w in layer.get_weights()]
+
+            if pending_scale is not None:
+                # (h * scale + shift) @ W + b == h @ (scale[:, None] * W) + (shift @ W + b)
+                bias = pending_shift @ weights + bias
+                weights = pending_scale[:, None] * weights
+                pending_scale = pending_shift = None
+
+            dense_layers.append((weights, bias, layer.activation.__name__))
+
+        elif layer_type == 'BatchNormalization':
+            gamma, beta, moving_mean, moving_variance = [
+                np.asarray(w, dtype=np.float64) for w in layer.get_weights()
+            ]
+            scale = gamma / np.sqrt(moving_variance + layer.epsilon)
+            shift = beta - moving_mean * scale
+
+            if pending_scale is not None:
+                # Two consecutive normalizations compose into one affine map
+                shift = pending_shift * scale + shift
+                scale = pending_scale * scale
+            pending_scale, pending_shift = scale, shift
+
+        elif layer_type in ('Dropout', 'InputLayer'):
+            continue
+
+        else:
+            raise ValueError(f"Layer type {layer_type} is not supported by the NumPy engine")
+
+    if pending_scale is not None:
+        raise ValueError("A trailing BatchNormalization layer has no Dense layer to fold into")
+
+    for _, _, activation in dense_layers:
+        if activation not in _ACTIVATIONS:
+            raise ValueError(f"Activation {activation} is not supported by the NumPy engine")
+
+    return dense_layers
+
+
+def export_dnn_weights(model, filepath):
+    """Export a trained DNN, or a NumpyDNNPredictor, to a compact NumPy weight bundle (.npz)"""
+    dense_layers = model.dense_layers if isinstance(model, NumpyDNNPredictor) else fold_dnn_layers(model)
+
+    arrays = {'format_version': np.array(BUNDLE_FORMAT_VERSION)}
+    for i, (weights, bias, activation) in enumerate(dense_layers):
+        arrays[f'weights_{i}'] = weights.astype(np.float32)
+        arrays[f'bias_{i}'] = bias.astype(np.float32)
+        arrays[f'activation_{i}'] = np.array(activation)
+
+    np.savez_compressed(filepath, **arrays)
+    return filepath
+
+
+class NumpyDNNPredictor:
+    """TensorFlow-free DNN inference from an exported weight bundle"""
+
+    serializer = 'numpy'
+
+    def __init__(self, dense_layers):
+        self.dense_layers = [
+            (np.asarray(weights, dtype=np.float32), np.asarray(bias, dtype=np.float32), activation)
+            for weights, bias, activation in dense_layers
+        ]
+        self.input_shape = (None, self.dense_layers[0][0].shape[0])
+
+    @classmethod
+    def from_keras_model(cls, model):
+        """Build the predictor directly from a trained Keras DNN"""
+        return cls(fold_dnn_layers(model))
+
+    @classmethod
+    def load(cls, filepath):
+        """Load a weight bundle written by export_dnn_weights"""
+        with np.load(filepath) as bundle:
+            format_version = int(bundle['format_version'])
+            if format_version != BUNDLE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported weight bundle version {format_version}")
+
+            dense_layers = []
+            i = 0
+            while f'weights_{i}' in bundle:
+                dense_layers.append((bundle[f'weights_{i}'], bundle[f'bias_{i}'], str(bundle[f'activation_{i}'])))
+                i += 1
+
+        return cls(dense_layers)
+
+    def save(self, filepath):
+        export_dnn_weights(self, filepath)
+
+    def predict(self, X, verbose=0):
+        """Predict class probabilities, matching the output shape of model.predict"""
+        outputs = np.asarray(X, dtype=np.float32)
+
+        for weights, bias, activation in self.dense_layers:
+            outputs = _ACTIVATIONS[activation](outputs @ weights + bias)
+
+        return outputs
@@ -0,0 +1,112 @@
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+def canonicalize_input(input_data):
+    """Turn a single patient's feature values into a hashable, type-independent tuple"""
+    values = np.asarray(input_data, dtype=np.float64).reshape(-1)
+    # 1, 1.0 and np.int64(1) should all hit the same entry
+    return tuple(round(float(value), 6) for value in values)
+
+
+def compute_model_version(models, preprocessor=None):
+    """Fingerprint model weights and scaler state so retrained artifacts never share cache entries"""
+    digest = hashlib.sha1()
+
+    for model_name in sorted(models.keys()):
+        model = models[model_name]
+        digest.update(model_name.encode())
+
+        if hasattr(model, 'get_weights'):
+            for weight in model.get_weights():
+                digest.update(np.ascontiguousarray(weight).tobytes())
+        elif hasattr(model, 'model_content'):
+            digest.update(bytes(model.model_content))
+        elif hasattr(model, 'dense_layers'):
+            for weights, bias, activation in model.dense_layers:
+                digest.update(weights.tobytes())
+                digest.update(bias.tobytes())
+                digest.update(activation.encode())
+        else:
+            digest.update(str(id(model)).encode())
+
+    scaler = getattr(preprocessor, 'scaler', None)
+    for attribute in ('mean_', 'scale_'):
+        if hasattr(scaler, attribute):
+            digest.update(np.asarray(getattr(scaler, attribute)).tobytes())
+
+    return digest.hexdigest()[:16]
+
+
+class PredictionCache:
+    """Thread-safe, size-bounded LRU cache of prediction results with hit/miss counters"""
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return a copy of the cached value for key, or None on a miss"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = self._entries[key]
+
+        # Callers get their own copy so they cannot mutate the cached result
+        return copy.deepcopy(value)
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = copy.deepcopy(value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        value = compute()
+        # Failed predictions come back as None or empty and are not cached
+        if value:
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+# Shared by every predictor in the process so entries survive Streamlit reruns
+default_prediction_cache = PredictionCache()
@@ -2,19 +2,30 @@ import numpy as np
 import pandas as pd
 import lime
 from lime.lime_tabular import LimeTabularExplainer
-import streamlit as st
+from src.reporting import get_reporter
 from sklearn.base import BaseEstimator, ClassifierMixin
+from src.ensemble_engine import get_fused_ensemble
+from src.distillation import get_ensemble_members, get_ensemble_member_names
+from src.inference_backend import predict_fast, is_keras_model
+from src.prediction_cache import canonicalize_input, compute_model_version, default_prediction_cache
+from src.explainers import (
+    get_lime_explainer, reseed_lime_explainer, get_gradient_explainer, KernelShapExplainer,
+    DEFAULT_LIME_SAMPLES, DEFAULT_PREDICTION_BATCH_SIZE, DEFAULT_SHAP_BATCH_SIZE
+)
+
+EXPLANATION_METHODS = ('lime', 'gradient', 'shap')
 
 class KerasClassifierWrapper(BaseEstimator, ClassifierMixin):
     """Wrapper for Keras models to work with LIME"""
     
-    def __init__(self, model):
+    def __init__(self, model, batch_size=DEFAULT_PREDICTION_BATCH_SIZE):
         self.model = model
+        self.batch_size = batch_size
         self.classes_ = np.array([0, 1])
     
     def predict_proba(self, X):
         """Predict class probabilities"""
-        predictions = self.model.predict(X, verbose=0)
+        predictions = predict_fast(self.model, X, batch_size=self.batch_size)
         
         # Debug: log shapes
         # print(f"Predictions shape: {predictions.shape}")
@@ -44,18 +55,54 @@ class KerasClassifierWrapper(BaseEstimator, ClassifierMixin):
         proba = self.predict_proba(X)
         return np.argmax(proba, axis=1)
 
+def get_positive_class_probabilities(predictions):
+    """Convert raw model output for N rows into positive-class probabilities and classes"""
+    predictions = np.asarray(predictions)
+
+    if predictions.ndim == 2 and predictions.shape[1] > 1:
+        # Multi-class or binary with softmax output
+        probabilities = predictions[:, 1].astype(np.float64)
+        classes = np.argmax(predictions, axis=1)
+    else:
+        # Binary classification with sigmoid output, shape (n,) or (n, 1)
+        probabilities = predictions.reshape(-1).astype(np.float64)
+        classes = (probabilities > 0.5).astype(int)
+
+    return probabilities, classes
+
+def assign_risk_levels(probabilities):
+    """Assign Low/Medium/High risk levels and colors to an array of probabilities"""
+    probabilities = np.asarray(probabilities)
+    conditions = [probabilities < 0.3, probabilities < 0.7]
+
+    risk_levels = np.select(conditions, ["Low", "Medium"], default="High")
+    risk_colors = np.select(conditions, ["green", "orange"], default="red")
+
+    return risk_levels, risk_colors
+
 class HeartDiseasePredictor:
-    def __init__(self, models, preprocessor):
+    def __init__(self, models, preprocessor, model_version=None, cache=default_prediction_cache):
         self.models = models
         self.preprocessor = preprocessor
+        # Artifact-backed models carry their version; hashing weights would load every model
+        self.model_version = model_version or getattr(models, 'version', None) or compute_model_version(models, preprocessor)
+        self.cache = cache
         self.lime_explainer = None
         self._initialize_lime_explainer()
     
     def _initialize_lime_explainer(self):
         """Initialize LIME explainer with training data"""
         try:
-            # Create sample training data for LIME
-            # In production, you would use actual training data
+            training_stats = getattr(self.preprocessor, 'training_stats', None)
+            if training_stats:
+                # Built once per process from the persisted training statistics
+                self.lime_explainer = get_lime_explainer(
+                    training_stats, self.preprocessor.get_feature_names()
+                )
+                return
+            
+            # Preprocessors fitted before training statistics were recorded
+            # fall back to synthetic standard-normal samples
             np.random.seed(42)
             n_features = len(self.preprocessor.get_feature_names())
             sample_data = np.random.randn(100, n_features)
@@ -69,11 +116,30 @@ class HeartDiseasePredictor:
                 mode='classification'
             )
         except Exception as e:
-            st.warning(f"Could not initialize LIME explainer: {e}")
+            get_reporter().warning(f"Could not initialize LIME explainer: {e}")
             self.lime_explainer = None
     
+    def _cached_call(self, method_name, input_data, compute, *args):
+        """Serve a single-patient result from the prediction cache, computing it on a miss"""
+        if self.cache is None:
+            return compute()
+        
+        try:
+            cache_key = (self.model_version, method_name, args, canonicalize_input(input_data))
+        except (TypeError, ValueError):
+            # Inputs that cannot be canonicalized bypass the cache
+            return compute()
+        
+        return self.cache.get_or_compute(cache_key, compute)
+    
     def predict_risk(self, input_data, model_name='DNN'):
         """Predict heart disease risk for given input"""
+        return self._cached_call(
+            'predict_risk', input_data, lambda: self._predict_risk(input_data, model_name), model_name
+        )
+    
+    def _predict_risk(self, input_data, model_name):
+        """Predict heart disease risk for given input without consulting the cache"""
         try:
             # Prepare input
             input_processed = self.preprocessor.prepare_input_for_prediction(input_data)
@@ -85,7 +151,7 @@ class HeartDiseasePredictor:
             model = self.models[model_name]
             
             # Make prediction
-            prediction_proba = model.predict(input_processed, verbose=0)
+            prediction_proba = predict_fast(model, input_processed)
             
             # Handle different shapes of prediction output robustly
             if np.isscalar(prediction_proba):
@@ -131,56 +197,128 @@ class HeartDiseasePredictor:
                 risk_class = int(risk_probability > 0.5)
             
             # Determine risk level
-            if risk_probability < 0.3:
-                risk_level = "Low"
-                risk_color = "green"
-            elif risk_probability < 0.7:
-                risk_level = "Medium"
-                risk_color = "orange"
-            else:
-                risk_level = "High"
-                risk_color = "red"
+            risk_levels, risk_colors = assign_risk_levels([risk_probability])
             
             return {
                 'risk_class': risk_class,
                 'risk_probability': risk_probability,
-                'risk_level': risk_level,
-                'risk_color': risk_color,
+                'risk_level': str(risk_levels[0]),
+                'risk_color': str(risk_colors[0]),
                 'model_used': model_name
             }
             
         except Exception as e:
-            st.error(f"Error in prediction: {str(e)}")
+            get_reporter().error(f"Error in prediction: {str(e)}")
             return None
     
-    def explain_prediction(self, input_data, model_name='DNN', num_features=10):
-        """Generate LIME explanation for the prediction"""
+    def predict_risk_batch(self, input_data, model_name='DNN'):
+        """Predict heart disease risk for many patients with a single forward pass"""
         try:
-            if self.lime_explainer is None:
-                return None
+            # Prepare all rows with one scaler transform
+            input_processed = self.preprocessor.prepare_batch_for_prediction(input_data)
+            
+            # Get model
+            if model_name not in self.models:
+                raise ValueError(f"Model {model_name} not found")
+            
+            model = self.models[model_name]
+            
+            # Make predictions for the whole batch
+            prediction_proba = predict_fast(model, input_processed)
+            risk_probabilities, risk_classes = get_positive_class_probabilities(prediction_proba)
+            risk_levels, risk_colors = assign_risk_levels(risk_probabilities)
+            
+            index = input_data.index if isinstance(input_data, pd.DataFrame) else None
+            
+            return pd.DataFrame({
+                'risk_class': risk_classes,
+                'risk_probability': risk_probabilities,
+                'risk_level': risk_levels,
+                'risk_color': risk_colors,
+                'model_used': model_name
+            }, index=index)
+            
+        except Exception as e:
+            get_reporter().error(f"Error in batch prediction: {str(e)}")
+            return None
+    
+    def explain_prediction(self, input_data, model_name='DNN', num_features=10,
+                           num_samples=DEFAULT_LIME_SAMPLES, batch_size=DEFAULT_PREDICTION_BATCH_SIZE,
+                           method='lime'):
+        """Generate an explanation for the prediction with LIME, integrated gradients or Kernel SHAP"""
+        try:
+            if method not in EXPLANATION_METHODS:
+                raise ValueError(f"Unknown explanation method {method}")
             
             # Prepare input
             input_processed = self.preprocessor.prepare_input_for_prediction(input_data)
             
+            # Tree and linear baselines have no gradients, so they get Kernel SHAP instead
+            if method == 'gradient' and model_name in self.models and not is_keras_model(self.models[model_name]):
+                method = 'shap'
+            
+            if method == 'shap':
+                # Works for any model handle, including the ensemble average
+                explainer = self._get_shap_explainer(model_name)
+                return explainer.explain(
+                    input_processed[0], self.preprocessor.get_feature_names(),
+                    input_raw=input_data, num_features=num_features
+                )
+            
             # Get model
             model = self.models[model_name]
-            wrapped_model = KerasClassifierWrapper(model)
             
-            # Generate explanation
-            explanation = self.lime_explainer.explain_instance(
+            if method == 'gradient':
+                explainer = get_gradient_explainer(model)
+                return explainer.explain(
+                    input_processed[0], self.preprocessor.get_feature_names(),
+                    input_raw=input_data, num_features=num_features
+                )
+            
+            if self.lime_explainer is None:
+                return None
+            
+            wrapped_model = KerasClassifierWrapper(model, batch_size=batch_size)
+            
+            # Generate explanation from a freshly seeded copy so results don't depend on earlier calls
+            explanation = reseed_lime_explainer(self.lime_explainer).explain_instance(
                 input_processed[0],
                 wrapped_model.predict_proba,
-                num_features=num_features
+                num_features=num_features,
+                num_samples=num_samples
             )
             
             return explanation
             
         except Exception as e:
-            st.warning(f"Could not generate explanation: {str(e)}")
+            get_reporter().warning(f"Could not generate explanation: {str(e)}")
             return None
     
+    def _positive_probability_function(self, model_name, batch_size=DEFAULT_SHAP_BATCH_SIZE):
+        """Map scaled rows to positive-class probabilities for a model or the ensemble"""
+        if model_name == 'Ensemble':
+            def predict_ensemble(X):
+                outputs = self._get_ensemble_engine(members_only=True).predict(X, batch_size=batch_size)
+                return np.mean([get_positive_class_probabilities(output)[0] for output in outputs.values()], axis=0)
+            return predict_ensemble
+        
+        model = self.models[model_name]
+        return lambda X: get_positive_class_probabilities(predict_fast(model, X, batch_size=batch_size))[0]
+    
+    def _get_shap_explainer(self, model_name):
+        """Build a Kernel SHAP explainer over the persisted k-means background"""
+        background_summary = getattr(self.preprocessor, 'background_summary', None)
+        if not background_summary:
+            raise ValueError("No SHAP background set; retrain the models to compute one")
+        
+        return KernelShapExplainer(
+            self._positive_probability_function(model_name),
+            background_summary['centers'],
+            background_summary['weights']
+        )
+    
     def get_feature_importance(self, explanation):
-        """Extract feature importance from LIME explanation"""
+        """Extract feature importance from a LIME or attribution explanation"""
         if explanation is None:
             return None
         
@@ -195,26 +333,58 @@ class HeartDiseasePredictor:
             return importance_df
             
         except Exception as e:
-            st.warning(f"Could not extract feature importance: {str(e)}")
+            get_reporter().warning(f"Could not extract feature importance: {str(e)}")
             return None
     
+    def _get_ensemble_engine(self, members_only=False):
+        """Fused ensemble graph over all models, or only the ensemble members, shared process-wide"""
+        # Kernel SHAP on the Ensemble runs tens of thousands of rows, so it skips non-members
+        model_names = get_ensemble_member_names(self.models) if members_only else None
+        return get_fused_ensemble(self.models, model_names)
+    
     def predict_all_models(self, input_data):
-        """Get predictions from all available models"""
+        """Get predictions from all available models with a single fused forward pass"""
+        return self._cached_call(
+            'predict_all_models', input_data, lambda: self._predict_all_models(input_data)
+        )
+    
+    def _predict_all_models(self, input_data):
+        """Get predictions from all available models without consulting the cache"""
         predictions = {}
         
-        for model_name in self.models.keys():
-            try:
-                pred = self.predict_risk(input_data, model_name)
-                if pred:
-                    predictions[model_name] = pred
-            except Exception as e:
-                st.warning(f"Error predicting with {model_name}: {str(e)}")
+        try:
+            # Preprocess once and run every model in one dispatch
+            input_processed = self.preprocessor.prepare_input_for_prediction(input_data)
+            outputs = self._get_ensemble_engine().predict(input_processed)
+            
+            for model_name, output in outputs.items():
+                risk_probabilities, risk_classes = get_positive_class_probabilities(output)
+                risk_levels, risk_colors = assign_risk_levels(risk_probabilities)
+                
+                predictions[model_name] = {
+                    'risk_class': int(risk_classes[0]),
+                    'risk_probability': float(risk_probabilities[0]),
+                    'risk_level': str(risk_levels[0]),
+                    'risk_color': str(risk_colors[0]),
+                    'model_used': model_name
+                }
+        except Exception as e:
+            get_reporter().warning(f"Fused ensemble unavailable, predicting model by model: {str(e)}")
+            
+            for model_name in self.models.keys():
+                try:
+                    pred = self.predict_risk(input_data, model_name)
+                    if pred:
+                        predictions[model_name] = pred
+                except Exception as e:
+                    get_reporter().warning(f"Error predicting with {model_name}: {str(e)}")
         
         return predictions
     
-    def get_model_comparison(self, input_data):
-        """Compare predictions across all models"""
-        predictions = self.predict_all_models(input_data)
+    def get_model_comparison(self, input_data, predictions=None):
+        """Compare predictions across all models, reusing predictions when already computed"""
+        if predictions is None:
+            predictions = self.predict_all_models(input_data)
         
         if not predictions:
             return None
@@ -234,30 +404,28 @@ class HeartDiseasePredictor:
     
     def get_ensemble_prediction(self, input_data):
         """Get ensemble prediction by averaging all models"""
+        return self._cached_call(
+            'get_ensemble_prediction', input_data, lambda: self._get_ensemble_prediction(input_data)
+        )
+    
+    def _get_ensemble_prediction(self, input_data):
+        """Get ensemble prediction by averaging all models without consulting the cache"""
         predictions = self.predict_all_models(input_data)
         
         if not predictions:
             return None
         
-        # Average probabilities
-        avg_probability = np.mean([pred['risk_probability'] for pred in predictions.values()])
+        # Average probabilities; a distilled student only imitates the average
+        avg_probability = np.mean([pred['risk_probability'] for pred in get_ensemble_members(predictions).values()])
         
         # Determine ensemble risk level
-        if avg_probability < 0.3:
-            risk_level = "Low"
-            risk_color = "green"
-        elif avg_probability < 0.7:
-            risk_level = "Medium"
-            risk_color = "orange"
-        else:
-            risk_level = "High"
-            risk_color = "red"
+        risk_levels, risk_colors = assign_risk_levels([avg_probability])
         
         return {
             'risk_class': int(avg_probability > 0.5),
             'risk_probability': avg_probability,
-            'risk_level': risk_level,
-            'risk_color': risk_color,
+            'risk_level': str(risk_levels[0]),
+            'risk_color': str(risk_colors[0]),
             'model_used': 'Ensemble',
             'individual_predictions': predictions
         }
@@ -4,7 +4,7 @@ from datetime import datetime
 import io
 import base64
 from fpdf import FPDF
-import streamlit as st
+from src.reporting import get_reporter
 
 class ReportGenerator:
     def __init__(self):
@@ -89,7 +89,7 @@ class ReportGenerator:
             return pdf_output
             
         except Exception as e:
-            st.error(f"Error generating PDF report: {str(e)}")
+            get_reporter().error(f"Error generating PDF report: {str(e)}")
             return None
     
     def create_csv_report(self, report_data):
@@ -156,7 +156,7 @@ class ReportGenerator:
             return csv_buffer
             
         except Exception as e:
-            st.error(f"Error generating CSV report: {str(e)}")
+            get_reporter().error(f"Error generating CSV report: {str(e)}")
             return None
     
     def _generate_recommendations(self, risk_level):
@@ -210,11 +210,14 @@ class ReportGenerator:
             return href
             
         except Exception as e:
-            st.error(f"Error creating download link: {str(e)}")
+            get_reporter().error(f"Error creating download link: {str(e)}")
             return None
     
     def display_report_summary(self, report_data):
         """Display report summary in Streamlit"""
+        # Only this UI helper needs Streamlit, so batch report generation never loads it
+        import streamlit as st
+        
         st.subheader("📋 Report Summary")
         
         col1, col2 = st.columns(2)
@@ -0,0 +1,76 @@
+import sys
+import logging
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger('heart_tracker')
+
+_reporter = None
+
+
+class Reporter(ABC):
+    """Destination for progress messages and problems raised by library code"""
+
+    @abstractmethod
+    def write(self, message):
+        pass
+
+    @abstractmethod
+    def warning(self, message):
+        pass
+
+    @abstractmethod
+    def error(self, message):
+        pass
+
+
+class StreamlitReporter(Reporter):
+    """Show messages in the running Streamlit page"""
+
+    def __init__(self):
+        import streamlit as st
+
+        self._st = st
+
+    def write(self, message):
+        self._st.write(message)
+
+    def warning(self, message):
+        self._st.warning(message)
+
+    def error(self, message):
+        self._st.error(message)
+
+
+class LoggingReporter(Reporter):
+    """Send messages to the standard logging module, for scripts and batch jobs"""
+
+    def __init__(self, log=logger):
+        self.log = log
+
+    def write(self, message):
+        self.log.info(message)
+
+    def warning(self, message):
+        self.log.warning(message)
+
+    def error(self, message):
+        self.log.error(message)
+
+
+def set_reporter(reporter):
+    """Route all library messages to reporter from now on"""
+    global _reporter
+    _reporter = reporter
+
+
+def get_reporter():
+    """Return the configured reporter
+
+    Without an explicit choice, messages go to Streamlit when it is already
+    loaded (the app and its pages) and to logging otherwise, so headless
+    callers never import Streamlit.
+    """
+    global _reporter
+    if _reporter is None:
+        _reporter = StreamlitReporter() if 'streamlit' in sys.modules else LoggingReporter()
+    return _reporter
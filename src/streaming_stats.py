@@ -0,0 +1,118 @@
+import numpy as np
+
+DEFAULT_SKETCH_CAPACITY = 2048
+
+
+class QuantileSketch:
+    """Mergeable KLL-style quantile sketch of one numeric stream in bounded memory
+
+    Values enter level 0; a level holding more than `capacity` values is
+    sorted and every other value is promoted to the next level, where each
+    value stands for twice as many originals. Memory stays at about
+    capacity * log2(n / capacity) floats, and rank error shrinks as capacity
+    grows. Until the first compaction the sketch is exact, so small datasets
+    get the same median as pandas. Sketches built over separate chunks or
+    shards combine with merge().
+    """
+
+    def __init__(self, capacity=DEFAULT_SKETCH_CAPACITY, seed=0):
+        self.capacity = capacity
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """Add a block of values, ignoring NaNs"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch of the same quantity into this one"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, values in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self.capacity:
+                values = np.sort(values)
+                # An odd value out stays behind at its current weight
+                leftover, values = values[len(values) - len(values) % 2:], values[:len(values) - len(values) % 2]
+                promoted = values[self._rng.integers(2)::2]
+
+                self.levels[level] = leftover
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantile(self, q):
+        """Approximate q-quantile of everything seen, or NaN if nothing was"""
+        if self.count == 0:
+            return float('nan')
+        if len(self.levels) == 1:
+            return float(np.quantile(self.levels[0], q))
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_values), 2.0 ** level)
+                                  for level, level_values in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        cumulative = np.cumsum(weights[order])
+
+        index = min(np.searchsorted(cumulative, q * cumulative[-1]), len(values) - 1)
+        return float(values[order][index])
+
+    def median(self):
+        return self.quantile(0.5)
+
+
+class RunningMoments:
+    """Per-column count, mean and sum of squared deviations, mergeable across blocks
+
+    Uses Chan et al.'s pairwise update, which stays accurate over tens of
+    millions of rows where naive sums of squares lose precision. NaNs are
+    skipped per column.
+    """
+
+    def __init__(self, n_columns):
+        self.count = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+
+    def update(self, block):
+        block = np.asarray(block, dtype=np.float64)
+        count = np.sum(~np.isnan(block), axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, np.nansum(block, axis=0) / np.maximum(count, 1), 0.0)
+        m2 = np.nansum((block - mean) ** 2, axis=0)
+        return self._combine(count, mean, m2)
+
+    def add_constant(self, column_values, column_counts):
+        """Account for column_counts extra copies of column_values, e.g. fills for missing entries"""
+        column_counts = np.asarray(column_counts, dtype=np.float64)
+        return self._combine(column_counts, np.nan_to_num(np.asarray(column_values, dtype=np.float64)),
+                             np.zeros_like(column_counts))
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.mean = np.where(total > 0, self.mean + delta * count / np.maximum(total, 1), 0.0)
+            self.m2 = self.m2 + m2 + np.where(total > 0, delta ** 2 * self.count * count / np.maximum(total, 1), 0.0)
+        self.count = total
+        return self
+
+    @property
+    def variance(self):
+        """Population variance, as StandardScaler uses"""
+        return np.where(self.count > 0, self.m2 / np.maximum(self.count, 1), 0.0)
@@ -0,0 +1,124 @@
+import numpy as np
+
+QUANTIZATION_MODES = (None, 'dynamic', 'int8')
+
+# Recurrent layers only convert with a static batch dimension
+RECURRENT_LAYER_TYPES = ('LSTM', 'GRU', 'SimpleRNN')
+RECURRENT_BATCH_SIZE = 16
+
+# Rows of preprocessed training data used to calibrate int8 ranges
+CALIBRATION_ROWS = 200
+
+
+def _has_recurrent_layers(model):
+    """Check whether a Keras model contains recurrent layers"""
+    return any(layer.__class__.__name__ in RECURRENT_LAYER_TYPES for layer in model.layers)
+
+
+def convert_to_tflite(model, quantization=None, calibration_data=None):
+    """Convert a Keras model to a TFLite flatbuffer
+
+    Returns the flatbuffer bytes and the quantization mode actually applied.
+    The TFLite converter crashes while calibrating LSTM layers for int8, so
+    recurrent models fall back to dynamic-range quantization in that case.
+    """
+    import tensorflow as tf
+    from tensorflow import keras
+
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode {quantization}, expected one of {QUANTIZATION_MODES}")
+
+    recurrent = _has_recurrent_layers(model)
+    if recurrent and quantization == 'int8':
+        quantization = 'dynamic'
+
+    source_model = model
+    calibration_batch_size = 1
+    if recurrent:
+        inputs = keras.Input(batch_shape=(RECURRENT_BATCH_SIZE,) + tuple(model.input_shape[1:]))
+        source_model = keras.Model(inputs=inputs, outputs=model(inputs))
+        calibration_batch_size = RECURRENT_BATCH_SIZE
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(source_model)
+
+    if quantization is not None:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if quantization == 'int8':
+        if calibration_data is None:
+            raise ValueError("int8 quantization requires calibration_data")
+
+        calibration_data = np.asarray(calibration_data, dtype=np.float32)[:CALIBRATION_ROWS]
+
+        def representative_dataset():
+            for start in range(0, len(calibration_data) - calibration_batch_size + 1, calibration_batch_size):
+                yield [calibration_data[start:start + calibration_batch_size]]
+
+        converter.representative_dataset = representative_dataset
+
+    return converter.convert(), quantization
+
+
+class TFLiteModel:
+    """Interpreter-backed model handle with the predict() interface of a Keras model"""
+
+    def __init__(self, model_content):
+        # Prefer the standalone runtimes so serving does not need TensorFlow
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            try:
+                from tflite_runtime.interpreter import Interpreter
+            except ImportError:
+                import tensorflow as tf
+                Interpreter = tf.lite.Interpreter
+
+        self.model_content = model_content
+        self.interpreter = Interpreter(model_content=model_content)
+        self.interpreter.allocate_tensors()
+
+        input_details = self.interpreter.get_input_details()[0]
+        self._input_index = input_details['index']
+        self._output_index = self.interpreter.get_output_details()[0]['index']
+        self.input_shape = (None,) + tuple(input_details['shape'][1:])
+
+        # A static batch dimension means inputs are padded and run in chunks
+        batch_dimension = input_details['shape_signature'][0]
+        self.fixed_batch_size = None if batch_dimension == -1 else int(input_details['shape'][0])
+        self._current_batch_size = int(input_details['shape'][0])
+
+    @classmethod
+    def load(cls, filepath):
+        """Load a TFLite flatbuffer from disk"""
+        with open(filepath, 'rb') as f:
+            return cls(f.read())
+
+    def save(self, filepath):
+        """Write the TFLite flatbuffer to disk"""
+        with open(filepath, 'wb') as f:
+            f.write(self.model_content)
+
+    def _invoke(self, X):
+        """Run the interpreter on one batch matching the input tensor shape"""
+        self.interpreter.set_tensor(self._input_index, X)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output_index).copy()
+
+    def predict(self, X, verbose=0):
+        """Predict class probabilities, matching the output shape of model.predict"""
+        X = np.asarray(X, dtype=np.float32)
+
+        if self.fixed_batch_size is None:
+            if len(X) != self._current_batch_size:
+                self.interpreter.resize_tensor_input(self._input_index, list(X.shape))
+                self.interpreter.allocate_tensors()
+                self._current_batch_size = len(X)
+            return self._invoke(X)
+
+        batch_size = self.fixed_batch_size
+        n_rows = len(X)
+        padded_rows = -n_rows % batch_size
+        X = np.concatenate([X, np.zeros((padded_rows,) + X.shape[1:], dtype=np.float32)])
+
+        outputs = [self._invoke(X[start:start + batch_size]) for start in range(0, len(X), batch_size)]
+        return np.concatenate(outputs)[:n_rows]
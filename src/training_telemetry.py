@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+import platform
+from datetime import datetime, timezone
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Bump when the layout of the run log changes
+RUN_LOG_FORMAT_VERSION = 1
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _current_learning_rate(model):
+    try:
+        return float(np.asarray(model.optimizer.learning_rate))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class TrainingTelemetry(keras.callbacks.Callback):
+    """Record wall time, throughput, learning rate and memory for every epoch of one fit
+
+    samples_per_epoch is optional; without it (e.g. for streamed datasets)
+    throughput is reported in steps per second only.
+    """
+
+    def __init__(self, samples_per_epoch=None):
+        super().__init__()
+        self.samples_per_epoch = samples_per_epoch
+        self.epochs = []
+        self.learning_rate_changes = []
+        self.early_stopping_epoch = None
+        self.total_seconds = None
+
+    def on_train_begin(self, logs=None):
+        self._train_start = time.perf_counter()
+        self._learning_rate = _current_learning_rate(self.model)
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch_start = time.perf_counter()
+        self._epoch_steps = 0
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._epoch_steps += 1
+
+    def on_epoch_end(self, epoch, logs=None):
+        seconds = time.perf_counter() - self._epoch_start
+        learning_rate = _current_learning_rate(self.model)
+
+        self.epochs.append({
+            'epoch': epoch,
+            'seconds': seconds,
+            'steps_per_sec': self._epoch_steps / seconds if seconds else None,
+            'samples_per_sec': self.samples_per_epoch / seconds if self.samples_per_epoch and seconds else None,
+            'learning_rate': learning_rate,
+            'peak_rss_mb': peak_rss_mb(),
+            **{metric: float(value) for metric, value in (logs or {}).items() if np.isscalar(value)}
+        })
+
+        # ReduceLROnPlateau lowers the rate at the end of the epoch it reacts to
+        if learning_rate is not None and self._learning_rate is not None and learning_rate != self._learning_rate:
+            self.learning_rate_changes.append({'epoch': epoch, 'from': self._learning_rate, 'to': learning_rate})
+        self._learning_rate = learning_rate
+
+    def on_train_end(self, logs=None):
+        self.total_seconds = time.perf_counter() - self._train_start
+        if self.model.stop_training and self.epochs:
+            self.early_stopping_epoch = self.epochs[-1]['epoch']
+
+    def summary(self):
+        """Return the recorded run as JSON-serializable data"""
+        epoch_seconds = [entry['seconds'] for entry in self.epochs]
+        samples_per_sec = [entry['samples_per_sec'] for entry in self.epochs if entry['samples_per_sec']]
+
+        return {
+            'epochs_run': len(self.epochs),
+            'total_seconds': self.total_seconds,
+            'mean_epoch_seconds': float(np.mean(epoch_seconds)) if epoch_seconds else None,
+            'mean_samples_per_sec': float(np.mean(samples_per_sec)) if samples_per_sec else None,
+            'early_stopping_epoch': self.early_stopping_epoch,
+            'learning_rate_changes': self.learning_rate_changes,
+            'peak_rss_mb': max((entry['peak_rss_mb'] or 0 for entry in self.epochs), default=None),
+            'epochs': self.epochs
+        }
+
+
+def new_run_log(**settings):
+    """Start a run log with the environment details that affect training cost"""
+    return {
+        'format_version': RUN_LOG_FORMAT_VERSION,
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'finished_at': None,
+        'python_version': platform.python_version(),
+        'tensorflow_version': tf.__version__,
+        'cpu_count': os.cpu_count(),
+        'settings': settings,
+        'models': {}
+    }
+
+
+def finish_run_log(run_log):
+    """Stamp the end of the run and the process-wide peak memory"""
+    run_log['finished_at'] = datetime.now(timezone.utc).isoformat()
+    run_log['peak_rss_mb'] = peak_rss_mb()
+    return run_log
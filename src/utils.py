@@ -4,6 +4,8 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from src.artifact_store import ArtifactStore
+from src.model_registry import default_model_cache
 
 
 def initialize_session_state():
@@ -23,6 +25,9 @@ def initialize_session_state():
     if 'prediction_history' not in st.session_state:
         st.session_state.prediction_history = []
 
+    if 'model_version' not in st.session_state:
+        st.session_state.model_version = None
+
     if 'user_profile' not in st.session_state:
         st.session_state.user_profile = {
             'name': 'Guest User',
@@ -33,6 +38,35 @@ def initialize_session_state():
         }
 
 
+@st.cache_resource(show_spinner="Loading the latest trained models...")
+def load_latest_artifacts():
+    """Load the newest good artifact version once per process"""
+    # Each model is deserialized the first time a page asks for it, into a cache
+    # bounded by DEFAULT_MODEL_MEMORY_LIMIT_MB that evicts rarely used models.
+    # The DNN is served from its NumPy weight bundle, without TensorFlow.
+    return ArtifactStore().load_latest(lazy=True, model_cache=default_model_cache, inference=True)
+
+
+def load_models_into_session():
+    """Populate session state from the artifact store when no models are loaded yet"""
+    # Pages can be opened directly, before app.py has initialized anything
+    initialize_session_state()
+
+    if st.session_state.get('models'):
+        return True
+
+    loaded = load_latest_artifacts()
+    if loaded is None:
+        return False
+
+    models, preprocessor, manifest = loaded
+    st.session_state.models = models
+    st.session_state.preprocessor = preprocessor
+    st.session_state.model_results = ArtifactStore().get_results(manifest)
+    st.session_state.model_version = manifest['version']
+    return True
+
+
 def load_custom_css():
     """Load custom CSS styling"""
     st.markdown("""
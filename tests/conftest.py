@@ -0,0 +1,20 @@
+import pytest
+
+
+@pytest.fixture
+def make_small_model():
+    """Builder for a seeded 13-feature binary classifier, small enough to build per test"""
+    keras = pytest.importorskip('tensorflow').keras
+
+    def build():
+        keras.utils.set_random_seed(0)
+        inputs = keras.Input(shape=(13,))
+        outputs = keras.layers.Dense(1, activation='sigmoid')(keras.layers.Dense(4, activation='relu')(inputs))
+        return keras.Model(inputs, outputs)
+
+    return build
+
+
+@pytest.fixture
+def small_model(make_small_model):
+    return make_small_model()
@@ -0,0 +1,65 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+import numpy as np
+import pytest
+
+keras = pytest.importorskip('tensorflow').keras
+
+from src.artifact_store import ArtifactStore
+from src.data_preprocessor import DataPreprocessor
+from src.model_trainer import ModelTrainer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope='module')
+def dnn_version(tmp_path_factory):
+    preprocessor = DataPreprocessor()
+    X_train, _, _, _ = preprocessor.load_and_preprocess_data(use_cache=False)
+    keras.utils.set_random_seed(0)
+    dnn = ModelTrainer().create_dnn_model((X_train.shape[1],))
+
+    store = ArtifactStore(tmp_path_factory.mktemp('artifacts'))
+    version = store.save_version({'DNN': dnn}, preprocessor, {'DNN': {'auc': 0.5}})
+    return store, version, dnn, X_train
+
+
+def test_dnn_is_saved_with_a_matching_numpy_bundle(dnn_version):
+    store, version, dnn, X_train = dnn_version
+    entry = store.load_manifest(version)['models']['DNN']
+    assert entry['inference']['serializer'] == 'numpy'
+
+    served, _, _ = store.load_version(version, lazy=True, inference=True)
+    np.testing.assert_allclose(served['DNN'].predict(X_train[:20]), dnn.predict(X_train[:20], verbose=0),
+                               atol=1e-5)
+
+
+def test_dnn_prediction_path_does_not_import_tensorflow(dnn_version):
+    store, _, _, _ = dnn_version
+    script = textwrap.dedent(f"""
+        import sys
+        from src.artifact_store import ArtifactStore
+        from src.predictor import HeartDiseasePredictor
+
+        models, preprocessor, manifest = ArtifactStore({str(store.root_dir)!r}).load_latest(lazy=True, inference=True)
+        prediction = HeartDiseasePredictor(models, preprocessor).predict_risk(
+            [55, 1, 2, 130, 250, 0, 1, 150, 0, 1.0, 1, 0, 2], 'DNN')
+        assert prediction is not None
+        assert 'tensorflow' not in sys.modules, 'tensorflow was imported'
+    """)
+
+    result = subprocess.run([sys.executable, '-c', script], cwd=REPO_ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_versions_saved_within_one_second_load_in_save_order(tmp_path):
+    preprocessor = DataPreprocessor()
+    preprocessor.load_and_preprocess_data(use_cache=False)
+    store = ArtifactStore(tmp_path)
+
+    saved = [store.save_version({}, preprocessor, {}) for _ in range(5)]
+
+    assert store.list_versions() == saved
+    assert store.load_latest()[2]['version'] == saved[-1]
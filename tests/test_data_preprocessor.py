@@ -0,0 +1,96 @@
+import json
+import numpy as np
+import pytest
+from lime.lime_tabular import LimeTabularExplainer
+
+from src.data_preprocessor import DataPreprocessor
+from src.dataset_cache import DatasetCache
+from src.explainers import get_lime_explainer
+
+WEIGHTS = np.array([1.0, -2.0, 0.5, 0.3, -1.0])
+
+
+def _predict_proba(X):
+    positive = 1 / (1 + np.exp(-(X @ WEIGHTS)))
+    return np.column_stack([1 - positive, positive])
+
+
+def _training_matrix():
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((300, 5))
+    X[:, 1] = rng.integers(0, 2, 300)
+    X[:, 2] = rng.integers(0, 4, 300)
+    return X
+
+
+def test_training_stats_reproduce_full_matrix_lime_explanations():
+    X = _training_matrix()
+    feature_names = [f"f{i}" for i in range(X.shape[1])]
+    # Round trip through JSON like persisted artifacts
+    stats = json.loads(json.dumps(DataPreprocessor().compute_training_stats(X)))
+
+    for row in X[:3]:
+        full = LimeTabularExplainer(X, feature_names=feature_names, class_names=['Low Risk', 'High Risk'],
+                                    mode='classification', random_state=42)
+        expected = full.explain_instance(row, _predict_proba, num_features=5, num_samples=500).as_list()
+
+        # Repeated calls must not drift as the cached explainer is reused
+        for _ in range(2):
+            explainer = get_lime_explainer(stats, feature_names)
+            actual = explainer.explain_instance(row, _predict_proba, num_features=5, num_samples=500).as_list()
+            assert actual == expected
+
+
+def _fitted_preprocessor():
+    preprocessor = DataPreprocessor()
+    df = preprocessor.load_cleveland_dataset()
+    X, _ = preprocessor.preprocess_data(df)
+    preprocessor.scale_features(X)
+    return preprocessor, df.drop(columns='target')
+
+
+def test_batch_preparation_fills_gaps_with_training_medians():
+    preprocessor, features = _fitted_preprocessor()
+    rows = features.head(3).astype('float32')
+    filled = rows.copy()
+    rows.loc[rows.index[0], 'chol'] = np.nan
+    filled.loc[filled.index[0], 'chol'] = preprocessor.medians['chol']
+
+    prepared = preprocessor.prepare_batch_for_prediction(rows)
+
+    assert not np.isnan(prepared).any()
+    np.testing.assert_allclose(prepared, preprocessor.prepare_batch_for_prediction(filled))
+
+
+def test_build_cv_folds_leaves_fitted_state_unchanged(tmp_path):
+    preprocessor, _ = _fitted_preprocessor()
+    preprocessor.medians = {feature: 0.0 for feature in preprocessor.medians}
+    preprocessor.dataset_hash = 'fitted-elsewhere'
+    state = preprocessor.get_state()
+
+    preprocessor.dataset_cache = DatasetCache(tmp_path)
+    folds = preprocessor.build_cv_folds(n_splits=3)
+
+    assert len(folds) == 3
+    assert preprocessor.get_state() == state
+
+
+def test_batch_preparation_rejects_frames_missing_feature_columns():
+    preprocessor, features = _fitted_preprocessor()
+
+    with pytest.raises(ValueError, match='chol, thal'):
+        preprocessor.prepare_batch_for_prediction(features.drop(columns=['chol', 'thal']))
+
+
+def test_array_inputs_fill_gaps_with_training_medians_by_position():
+    preprocessor, features = _fitted_preprocessor()
+    rows = features.head(3).to_numpy(dtype=np.float32)
+    filled = rows.copy()
+    chol = preprocessor.feature_names.index('chol')
+    rows[0, chol] = np.nan
+    filled[0, chol] = preprocessor.medians['chol']
+
+    np.testing.assert_allclose(preprocessor.prepare_batch_for_prediction(rows),
+                               preprocessor.prepare_batch_for_prediction(filled))
+    np.testing.assert_allclose(preprocessor.prepare_input_for_prediction(rows[0]),
+                               preprocessor.prepare_input_for_prediction(filled[0]), rtol=1e-6)
@@ -0,0 +1,69 @@
+import json
+import shutil
+from pathlib import Path
+import numpy as np
+import pytest
+
+from src.data_preprocessor import DataPreprocessor
+from src.dataset_cache import DatasetCache, make_cache_key
+
+DATASET_PATH = Path(__file__).resolve().parent.parent / 'src' / 'dataset.csv'
+
+
+def _preprocessor(cache_dir):
+    preprocessor = DataPreprocessor()
+    preprocessor.dataset_cache = DatasetCache(cache_dir)
+    return preprocessor
+
+
+@pytest.fixture
+def dataset_dir(tmp_path, monkeypatch):
+    shutil.copy(DATASET_PATH, tmp_path / 'dataset.csv')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_entries_round_trip_as_read_only_memmaps(tmp_path):
+    cache = DatasetCache(tmp_path)
+    arrays = {'X': np.arange(12, dtype=np.float32).reshape(4, 3), 'y': np.array([0, 1, 1, 0], dtype=np.int32)}
+    key = make_cache_key('abc', test_size=0.2)
+
+    cache.save(key, arrays, {'preprocessor': {'medians': {'age': 54.0}}})
+    loaded, metadata = cache.load(key)
+
+    assert metadata == {'preprocessor': {'medians': {'age': 54.0}}, 'arrays': ['X', 'y']}
+    for name, array in arrays.items():
+        assert isinstance(loaded[name], np.memmap)
+        assert not loaded[name].flags.writeable
+        assert loaded[name].dtype == array.dtype
+        np.testing.assert_array_equal(loaded[name], array)
+    assert cache.load(make_cache_key('abc', test_size=0.3)) is None
+
+
+def test_cached_split_matches_the_computed_one(dataset_dir, tmp_path):
+    computed = _preprocessor(tmp_path / 'cache')
+    computed_arrays = computed.load_and_preprocess_data()
+
+    cached = _preprocessor(tmp_path / 'cache')
+    cached_arrays = cached.load_and_preprocess_data()
+
+    for computed_array, cached_array in zip(computed_arrays, cached_arrays):
+        assert isinstance(cached_array, np.memmap)
+        np.testing.assert_array_equal(cached_array, computed_array)
+    # JSON turns the integer feature keys in training_stats into strings, as saved artifacts do
+    assert cached.get_state() == json.loads(json.dumps(computed.get_state()))
+
+
+def test_changed_csv_misses_the_cache(dataset_dir, tmp_path):
+    _preprocessor(tmp_path / 'cache').load_and_preprocess_data()
+
+    csv_path = dataset_dir / 'dataset.csv'
+    lines = csv_path.read_text(encoding='utf-8-sig').splitlines()
+    lines[1] = lines[1].replace('233', '234', 1)
+    csv_path.write_text('\n'.join(lines) + '\n')
+
+    changed = _preprocessor(tmp_path / 'cache')
+    X_train, _, _, _ = changed.load_and_preprocess_data()
+
+    assert not isinstance(X_train, np.memmap)
+    assert len(list((tmp_path / 'cache').iterdir())) == 2
@@ -0,0 +1,62 @@
+import io
+import pandas as pd
+import pytest
+
+from src.dataset_schema import HEART_SCHEMA, read_heart_csv, validate_heart_frame
+
+ROWS = [
+    [63, 1, 3, 145, 233, 1, 0, 150, 0, 2.3, 0, 0, 1, 1],
+    [37, 1, 2, 130, 250, 0, 1, 187, 0, 3.5, 0, 0, 2, 1],
+    [41, 0, 1, 130, 204, 0, 0, 172, 0, 1.4, 2, 0, 2, 0],
+]
+
+
+def _csv(rows=ROWS, columns=list(HEART_SCHEMA)):
+    frame = pd.DataFrame(rows, columns=list(HEART_SCHEMA))
+    return io.StringIO(frame[columns].to_csv(index=False))
+
+
+def test_reads_compact_dtypes():
+    df = read_heart_csv(_csv())
+
+    assert {column: str(df[column].dtype) for column in HEART_SCHEMA} == \
+        {column: dtype for column, (dtype, _, _) in HEART_SCHEMA.items()}
+
+
+def test_chunked_reads_keep_compact_dtypes():
+    chunks = list(read_heart_csv(_csv(), chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert all(str(chunk['ca'].dtype) == 'int8' and str(chunk['age'].dtype) == 'float32' for chunk in chunks)
+
+
+def test_out_of_range_value_raises():
+    rows = [row[:] for row in ROWS]
+    rows[1][2] = 7
+
+    with pytest.raises(ValueError, match=r"cp: 1 values outside \[0, 3\]"):
+        read_heart_csv(_csv(rows))
+
+
+def test_non_numeric_value_raises():
+    csv = _csv().getvalue().replace('\n63,1,3,', '\n63,male,3,')
+
+    with pytest.raises(ValueError):
+        read_heart_csv(io.StringIO(csv))
+
+
+def test_missing_column_raises():
+    columns = [column for column in HEART_SCHEMA if column != 'thal']
+
+    with pytest.raises(ValueError, match="missing columns \\['thal'\\]"):
+        read_heart_csv(_csv(columns=columns))
+
+
+def test_unlabeled_frames_may_omit_the_target():
+    features = [column for column in HEART_SCHEMA if column != 'target']
+
+    df = read_heart_csv(_csv(columns=features), labeled=False)
+
+    assert list(df.columns) == features
+    with pytest.raises(ValueError, match="missing columns"):
+        validate_heart_frame(df)
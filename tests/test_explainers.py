@@ -0,0 +1,72 @@
+import gc
+import weakref
+from math import factorial
+import numpy as np
+import pytest
+
+pytest.importorskip('tensorflow')
+
+from src.explainers import get_gradient_explainer, KernelShapExplainer, _gradient_explainers
+
+
+def test_integrated_gradients_satisfy_completeness(small_model):
+    x = np.random.default_rng(0).standard_normal(13).astype(np.float32)
+
+    attributions, base_value, prediction = get_gradient_explainer(small_model, steps=256).attribute(x)
+
+    assert attributions.sum() == pytest.approx(prediction - base_value, abs=1e-3)
+
+
+def _predict_function(model):
+    return lambda X: model.predict(X, batch_size=4096, verbose=0)
+
+
+def test_kernel_shap_values_add_up_to_the_model_output(small_model):
+    rng = np.random.default_rng(0)
+    background = rng.standard_normal((8, 13)).astype(np.float32)
+    x = rng.standard_normal(13).astype(np.float32)
+
+    attributions, base_value, prediction = KernelShapExplainer(_predict_function(small_model), background).attribute(x)
+
+    model_output = float(small_model.predict(x[None, :], verbose=0)[0, 0])
+    assert prediction == pytest.approx(model_output, abs=1e-6)
+    assert base_value == pytest.approx(float(small_model.predict(background, verbose=0).mean()), abs=1e-6)
+    assert attributions.sum() + base_value == pytest.approx(model_output, abs=1e-6)
+
+
+def test_kernel_shap_is_exact_when_every_coalition_fits(small_model):
+    rng = np.random.default_rng(1)
+    background = rng.standard_normal((4, 13)).astype(np.float32)
+    x = rng.standard_normal(13).astype(np.float32)
+    n_features = len(x)
+
+    attributions, _, _ = KernelShapExplainer(_predict_function(small_model), background,
+                                             max_coalitions=2 ** n_features).attribute(x)
+
+    # Brute-force Shapley values from the value of every coalition, including the empty and full ones
+    codes = np.arange(2 ** n_features)
+    masks = ((codes[:, None] >> np.arange(n_features)) & 1).astype(bool)
+    synthetic = np.where(masks[:, None, :], x, background[None, :, :]).reshape(-1, n_features)
+    values = small_model.predict(synthetic, batch_size=4096, verbose=0).reshape(len(codes), -1).mean(axis=1)
+
+    sizes = masks.sum(axis=1)
+    expected = np.zeros(n_features)
+    for feature in range(n_features):
+        without = ~masks[:, feature]
+        weights = np.array([factorial(size) * factorial(n_features - size - 1) for size in sizes[without]])
+        gains = values[codes[without] | (1 << feature)] - values[without]
+        expected[feature] = weights @ gains / factorial(n_features)
+
+    np.testing.assert_allclose(attributions, expected, atol=1e-5)
+
+
+def test_gradient_explainer_does_not_keep_model_alive(make_small_model):
+    model = make_small_model()
+    get_gradient_explainer(model).attribute(np.zeros(13, dtype=np.float32))
+    assert model in _gradient_explainers
+
+    model_ref = weakref.ref(model)
+    del model
+    gc.collect()
+
+    assert model_ref() is None
@@ -0,0 +1,18 @@
+import numpy as np
+
+from src.hyperparameter_search import split_for_tuning
+
+
+def test_validation_rows_are_held_out_before_oversampling():
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((200, 13)).astype(np.float32)
+    y = (rng.random(200) < 0.3).astype(np.int32)
+
+    X_fit, X_val, y_fit, y_val = split_for_tuning(X, y, validation_size=0.2)
+
+    original_rows = {row.tobytes() for row in X}
+    fit_rows = {row.tobytes() for row in X_fit}
+    assert len(X_val) == 40
+    assert all(row.tobytes() in original_rows for row in X_val)
+    assert not any(row.tobytes() in fit_rows for row in X_val)
+    assert np.bincount(y_fit)[0] == np.bincount(y_fit)[1]
@@ -0,0 +1,25 @@
+import gc
+import weakref
+import numpy as np
+import pytest
+
+pytest.importorskip('tensorflow')
+
+from src.inference_backend import predict_fast, _compiled_predictors
+
+
+def test_compiled_predictor_matches_keras(small_model):
+    X = np.random.default_rng(0).standard_normal((3, 13)).astype(np.float32)
+    np.testing.assert_allclose(predict_fast(small_model, X), small_model.predict(X, verbose=0), rtol=1e-5, atol=1e-6)
+
+
+def test_compiled_predictor_does_not_keep_model_alive(make_small_model):
+    model = make_small_model()
+    predict_fast(model, np.zeros((1, 13), dtype=np.float32))
+    assert model in _compiled_predictors
+
+    model_ref = weakref.ref(model)
+    del model
+    gc.collect()
+
+    assert model_ref() is None
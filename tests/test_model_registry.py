@@ -0,0 +1,95 @@
+import gc
+import weakref
+import numpy as np
+import pytest
+
+keras = pytest.importorskip('tensorflow').keras
+
+from src.artifact_store import ArtifactStore
+from src.distillation import get_ensemble_members, get_ensemble_member_names
+from src.ensemble_engine import FusedEnsemble, get_fused_ensemble
+from src.model_registry import LazyModels, ModelCache
+
+
+@pytest.fixture
+def save_small_models(tmp_path, make_small_model):
+    def save(names):
+        model_files = {}
+        for name in names:
+            model = make_small_model()
+            filepath = tmp_path / f"{name.lower()}.h5"
+            model.save(filepath)
+            model_files[name] = (filepath, 'keras')
+        return model_files
+
+    return save
+
+
+def test_fused_ensemble_loads_each_lazy_model_once(save_small_models):
+    cache = ModelCache(max_models=1)
+    models = LazyModels(save_small_models(['CNN', 'LSTM', 'DNN']), cache)
+    X = np.random.default_rng(0).standard_normal((2, 13)).astype(np.float32)
+
+    engine = FusedEnsemble(models)
+    for _ in range(2):
+        outputs = engine.predict(X)
+
+    assert cache.stats()['loads'] == 3
+    assert cache.stats()['resident_models'] == 1
+    for name, output in outputs.items():
+        np.testing.assert_allclose(output, models[name].predict(X, verbose=0), rtol=1e-5)
+
+
+def test_fused_ensemble_is_shared_until_a_model_changes(save_small_models):
+    model_files = save_small_models(['CNN', 'DNN'])
+    models = LazyModels(model_files, ModelCache())
+
+    engine = get_fused_ensemble(models)
+    assert get_fused_ensemble(models) is engine
+    assert get_fused_ensemble(LazyModels(model_files, ModelCache())) is engine
+
+    models['DNN'] = keras.models.clone_model(models['DNN'])
+    assert get_fused_ensemble(models) is not engine
+
+
+def test_evicted_model_is_garbage_collected(save_small_models):
+    cache = ModelCache(max_models=1)
+    models = LazyModels(save_small_models(['CNN', 'DNN']), cache)
+    engine = FusedEnsemble(models)
+
+    model_ref = weakref.ref(models['CNN'])
+    models['DNN']
+    gc.collect()
+
+    assert model_ref() is None
+    assert engine.fused_model is not None
+
+
+def test_verify_model_files_rejects_corrupt_files(save_small_models):
+    model_files = save_small_models(['DNN'])
+    filepath = model_files['DNN'][0]
+    checksums = {'DNN': '0' * 64}
+
+    with pytest.raises(ValueError, match='Checksum'):
+        ArtifactStore.verify_model_files(model_files, checksums)
+
+    filepath.write_bytes(b'not an hdf5 file')
+    with pytest.raises(ValueError, match='not a valid keras'):
+        ArtifactStore.verify_model_files(model_files, checksums)
+
+
+def test_ensemble_members_are_the_four_networks():
+    names = ['CNN', 'LSTM', 'CNN-LSTM', 'DNN', 'HistGradientBoosting', 'LogisticRegression',
+             'RandomForest', 'Ensemble-Distilled', 'Unregistered']
+
+    assert list(get_ensemble_members(dict.fromkeys(names))) == ['CNN', 'LSTM', 'CNN-LSTM', 'DNN']
+
+
+def test_member_engine_only_loads_the_listed_models(save_small_models):
+    cache = ModelCache()
+    models = LazyModels(save_small_models(['CNN', 'DNN', 'Ensemble-Distilled']), cache)
+
+    engine = get_fused_ensemble(models, get_ensemble_member_names(models))
+
+    assert engine.model_names == ['CNN', 'DNN']
+    assert models.loaded_names() == ['CNN', 'DNN']
@@ -0,0 +1,50 @@
+import numpy as np
+
+from src.prediction_cache import PredictionCache, canonicalize_input
+
+
+def test_least_recently_used_entry_is_evicted_past_capacity():
+    cache = PredictionCache(max_size=3)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, {'value': key})
+
+    assert cache.get('a') == {'value': 'a'}
+    cache.put('d', {'value': 'd'})
+
+    assert cache.get('b') is None
+    assert [cache.get(key)['value'] for key in ('a', 'c', 'd')] == ['a', 'c', 'd']
+    assert cache.stats() == {'hits': 4, 'misses': 1, 'size': 3, 'max_size': 3, 'hit_rate': 0.8}
+
+
+def test_get_or_compute_counts_and_skips_failed_results():
+    cache = PredictionCache(max_size=2)
+    calls = []
+
+    def compute(result):
+        calls.append(result)
+        return result
+
+    assert cache.get_or_compute('ok', lambda: compute({'risk': 0.2})) == {'risk': 0.2}
+    assert cache.get_or_compute('ok', lambda: compute({'risk': 0.9})) == {'risk': 0.2}
+    assert cache.get_or_compute('failed', lambda: compute(None)) is None
+    assert cache.get_or_compute('failed', lambda: compute(None)) is None
+
+    assert len(calls) == 3
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 3
+    assert cache.stats()['size'] == 1
+
+
+def test_cached_values_are_copies():
+    cache = PredictionCache()
+    value = {'probabilities': [0.1, 0.9]}
+    cache.put('key', value)
+
+    value['probabilities'].append(1.0)
+    cache.get('key')['probabilities'].append(1.0)
+
+    assert cache.get('key') == {'probabilities': [0.1, 0.9]}
+
+
+def test_equivalent_inputs_share_a_key():
+    assert canonicalize_input([1, 2.0, np.int64(3)]) == canonicalize_input(np.array([[1.0, 2.0, 3.0]]))
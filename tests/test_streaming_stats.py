@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from src.streaming_stats import QuantileSketch, RunningMoments
+
+
+def _chunks(values, size):
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def _with_gaps(shape, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(3.0, 0.5, size=shape)
+    values[rng.random(shape) < 0.1] = np.nan
+    return values
+
+
+def test_sketch_median_matches_pandas_before_compaction():
+    values = _with_gaps(1001)
+
+    sketch = QuantileSketch(capacity=2048)
+    for chunk in _chunks(values, 97):
+        sketch.update(chunk)
+
+    assert sketch.count == np.count_nonzero(~np.isnan(values))
+    assert sketch.median() == pd.Series(values).median()
+
+
+def test_sketch_median_rank_error_stays_small_after_compaction():
+    values = _with_gaps(200_000)
+    sketches = [QuantileSketch(capacity=256, seed=shard).update(chunk)
+                for shard, chunk in enumerate(_chunks(values, 30_000))]
+
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+
+    observed = values[~np.isnan(values)]
+    assert merged.count == len(observed)
+    assert abs(np.mean(observed <= merged.median()) - 0.5) < 0.02
+
+
+def test_running_moments_match_standard_scaler():
+    block = _with_gaps((5000, 4))
+
+    moments = RunningMoments(block.shape[1])
+    for chunk in _chunks(block, 333):
+        moments.update(chunk)
+
+    scaler = StandardScaler().fit(block)
+    np.testing.assert_allclose(moments.mean, scaler.mean_, rtol=1e-10)
+    np.testing.assert_allclose(np.sqrt(moments.variance), scaler.scale_, rtol=1e-10)
+
+
+def test_running_moments_account_for_median_fills():
+    block = _with_gaps((2000, 3), seed=1)
+    medians = pd.DataFrame(block).median().to_numpy()
+
+    moments = RunningMoments(block.shape[1])
+    for chunk in _chunks(block, 250):
+        moments.update(chunk)
+    moments.add_constant(medians, np.isnan(block).sum(axis=0))
+
+    scaler = StandardScaler().fit(np.where(np.isnan(block), medians, block))
+    np.testing.assert_allclose(moments.mean, scaler.mean_, rtol=1e-10)
+    np.testing.assert_allclose(np.sqrt(moments.variance), scaler.scale_, rtol=1e-10)